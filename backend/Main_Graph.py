@@ -1,278 +1,152 @@
-import matplotlib.pyplot as plt
-import math
-import networkx as nx
-from difflib import get_close_matches
+import base64
+import re
+import threading
+from pathlib import Path
+from floor_graph import FloorGraph, FLOOR_PLANS_DIR, WALK
+from route_table import RouteTable
+from map_renderer import MapRenderer, encode_png, stack_images
+from metrics import timed
+from phrase_matcher import PhraseMatcher, ALIAS
+from location_index import LocationIndex, DESCRIPTOR, FEATURE, NEARBY
+from fuzzy_index import FuzzyIndex
+from stacks_locator import StacksLocator, find_call_number
+
+# Words that introduce the start and the destination in a directions query
+FROM_WORDS = re.compile(r"\b(?:from|at|in|near)\b")
+TO_WORDS = re.compile(r"\b(?:to|find|reach)\b")
+
+# Evidence a phrase in a lost user's description adds to each place it belongs to
+LOST_USER_WEIGHTS = {DESCRIPTOR: 0.3, FEATURE: 0.4, NEARBY: 0.2}
+
+# Trigram similarity a misspelled room name needs before it is trusted
+ROOM_MATCH_CUTOFF = 0.55
+# Looser floor for "did you mean" suggestions
+ROOM_SUGGESTION_CUTOFF = 0.4
 
 class ReceptionistSystem:
-    def __init__(self):
-        # Room aliases for common terms and variations
-        self.room_aliases = {
-            "1south": "southCollaborativeStudyArea",
-            "1 south": "southCollaborativeStudyArea",
-            "one south": "southCollaborativeStudyArea",
-            "information commons": "johnPMcGowanInformationCommons",
-            "info commons": "johnPMcGowanInformationCommons",
-            "project room 1134": "icProjectRoom1134",
-            "vocal booth": "vocalBooth",
-            "book nook": "bookNookLeisureReading",
-            "leisure reading": "bookNookLeisureReading",
-            "project room a": "projectRoomA",
-            "project room b": "projectRoomB",
-            "level 2": "toLevel2",
-            "cafe": "toCafeBergson",
-            "cafe bergson": "toCafeBergson",
-            "lower level": "toLowerLevel",
-            "admin": "administration",
-            "periodicals": "periodicalsNewspapersReadingRoom",
-            "newspapers": "periodicalsNewspapersReadingRoom",
-            "reference": "referenceCollection",
-            "circulation": "circulation",
-            "borrowing": "circulation",
-            "help desk": "circulation",
-            "front desk": "circulation",
-            "main desk": "circulation",
-            "computers": "johnPMcGowanInformationCommons",
-            "study rooms": "southCollaborativeStudyArea",
-            "group study": "southCollaborativeStudyArea",
-            "quiet reading": "bookNookLeisureReading",
-            "stairs up": "toLevel2",
-            "stairs down": "toLowerLevel",
-            "staff offices": "administration",
-            "recording booth": "vocalBooth"
-        }
+    def __init__(self, map_background=None, floor_plans_dir=FLOOR_PLANS_DIR):
+        """
+        Args:
+            map_background: Floor plan image drawn under its floor's graph, or a
+                directory holding every floor's image; None draws schematics only
+            floor_plans_dir: Directory with building.json and the per-floor files
+        """
+        # Floors, stairs and elevators come from data files; see floor_plans/building.json
+        self.floor_graph, self.building, floors = FloorGraph.load(floor_plans_dir)
+        self.floors = {floor["id"]: floor for floor in floors}
+        self.entrance = self.building["entrance"]
 
-        # Area descriptors for lost users
-        self.area_descriptors = {
-            "large open space with computers": ["johnPMcGowanInformationCommons"],
-            "quiet study area with tables": ["southCollaborativeStudyArea", "periodicalsNewspapersReadingRoom"],
-            "near stairs": ["toLevel2", "toLowerLevel", "toCafeBergson"],
-            "near entrance": ["mainEntrance", "southEntrance"],
-            "near bookshelves": ["referenceCollection", "bookNookLeisureReading"],
-            "small rooms": ["projectRoomA", "projectRoomB", "icProjectRoom1134", "vocalBooth"],
-            "service desk": ["circulation", "administration"],
-            "glass walls": ["projectRoomA", "projectRoomB", "icProjectRoom1134"],
-            "main hallway": ["mainEntrance", "circulation", "toCafeBergson"],
-            "computers and printers": ["johnPMcGowanInformationCommons"],
-            "study tables": ["southCollaborativeStudyArea", "periodicalsNewspapersReadingRoom"],
-            "help desk area": ["circulation"],
-            "comfortable seating": ["bookNookLeisureReading"],
-            "staff area": ["personnel", "administration"],
-            "meeting rooms": ["projectRoomA", "projectRoomB"],
-            "recording space": ["vocalBooth"]
-        }
+        # Room aliases, area descriptors for lost users, and location features and details
+        self.room_aliases = {}
+        self.area_descriptors = {}
+        self.location_features = {}
+        for floor in floors:
+            for alias, room_id in floor.get("aliases", {}).items():
+                if alias in self.room_aliases:
+                    raise ValueError(f"Alias '{alias}' is defined on more than one floor")
+                self.room_aliases[alias] = room_id
+            for descriptor, locations in floor.get("descriptors", {}).items():
+                self.area_descriptors.setdefault(descriptor, []).extend(locations)
+            self.location_features.update(floor.get("features", {}))
 
-        # Location features and details
-        self.location_features = {
-            "mainEntrance": {
-                "features": ["automatic doors", "security gates", "welcome desk", "building directory"],
-                "nearby": ["information commons", "level 2 stairs"],
-                "identifiers": ["main doors", "security gates", "entrance mat"]
-            },
-            "johnPMcGowanInformationCommons": {
-                "features": ["computer workstations", "large open space", "help desk", "printers"],
-                "nearby": ["main entrance", "project rooms", "vocal booth"],
-                "identifiers": ["rows of computers", "printing station", "help desk"]
-            },
-            "southCollaborativeStudyArea": {
-                "features": ["group study tables", "whiteboard walls", "1South sign", "collaborative space"],
-                "nearby": ["project rooms", "main hallway"],
-                "identifiers": ["1South sign", "study tables", "whiteboards"]
-            },
-            "projectRoomA": {
-                "features": ["glass walls", "conference table", "wall-mounted display", "whiteboard"],
-                "nearby": ["1South study area", "project room B"],
-                "identifiers": ["room number", "glass-walled room", "meeting space"]
-            },
-            "projectRoomB": {
-                "features": ["glass walls", "conference table", "wall-mounted display", "whiteboard"],
-                "nearby": ["1South study area", "project room A"],
-                "identifiers": ["room number", "glass-walled room", "meeting space"]
-            },
-            "icProjectRoom1134": {
-                "features": ["glass walls", "technology setup", "presentation screen"],
-                "nearby": ["information commons", "vocal booth"],
-                "identifiers": ["room 1134", "IC project room", "glass walls"]
-            },
-            "vocalBooth": {
-                "features": ["soundproof walls", "recording equipment", "microphone"],
-                "nearby": ["information commons", "project room 1134"],
-                "identifiers": ["recording booth", "soundproof room"]
-            },
-            "circulation": {
-                "features": ["service desk", "self-checkout machines", "hold shelf"],
-                "nearby": ["main hallway", "café entrance", "1South entrance"],
-                "identifiers": ["main desk", "checkout stations", "help desk"]
-            },
-            "toCafeBergson": {
-                "features": ["staircase", "café signage", "seating area"],
-                "nearby": ["circulation desk", "periodicals"],
-                "identifiers": ["café sign", "upward stairs", "coffee shop entrance"]
-            },
-            "toLowerLevel": {
-                "features": ["staircase", "level signage", "directory"],
-                "nearby": ["book nook", "personnel offices"],
-                "identifiers": ["downward stairs", "lower level sign"]
-            },
-            "bookNookLeisureReading": {
-                "features": ["comfortable seating", "magazine displays", "quiet area"],
-                "nearby": ["lower level stairs", "reference collection"],
-                "identifiers": ["casual seating", "reading nook"]
-            },
-            "administration": {
-                "features": ["staff offices", "administrative suite", "meeting room"],
-                "nearby": ["personnel office", "lower level entrance"],
-                "identifiers": ["admin suite", "staff area"]
-            },
-            "periodicalsNewspapersReadingRoom": {
-                "features": ["newspaper racks", "magazine displays", "study tables", "current periodicals"],
-                "nearby": ["reference collection", "café entrance"],
-                "identifiers": ["newspaper racks", "magazine shelves"]
-            },
-            "referenceCollection": {
-                "features": ["reference books", "study carrels", "quiet area"],
-                "nearby": ["periodicals room", "book nook"],
-                "identifiers": ["reference shelves", "study carrels"]
-            },
-            "personnel": {
-                "features": ["staff offices", "workroom"],
-                "nearby": ["administration", "lower level entrance"],
-                "identifiers": ["staff offices", "personnel sign"]
-            },
-            "toLevel2": {
-                "features": ["staircase", "level signage", "directory"],
-                "nearby": ["main entrance", "information commons"],
-                "identifiers": ["upward stairs", "level 2 sign"]
-            },
-            "southEntrance": {
-                "features": ["entrance doors", "1South signage", "study area entrance"],
-                "nearby": ["circulation desk", "collaborative study area"],
-                "identifiers": ["1South entrance", "study area doors"]
-            }
-        }
+        # Every alias compiled into one automaton, so a query is scanned once
+        # however many places the floors define
+        self.phrase_matcher = PhraseMatcher(
+            (alias, ALIAS, room_id) for alias, room_id in self.room_aliases.items()
+        )
 
-        # Define the main hallway y-coordinate as reference
-        HALLWAY_Y = 400
-        
-        # Floor plan configuration
-        self.floor_plan = {
-            "nodes": {
-                # West end
-                "mainEntrance": {"x": 100, "y": HALLWAY_Y, "label": "Main Entrance", "color": "lightgray"},
-                "toLevel2": {"x": 120, "y": HALLWAY_Y - 50, "label": "To Level 2", "color": "lightgray"},
-                
-                # Information Commons area
-                "johnPMcGowanInformationCommons": {"x": 250, "y": HALLWAY_Y + 100, "label": "Information Commons", "color": "lightgray"},
-                "icProjectRoom1134": {"x": 200, "y": HALLWAY_Y + 150, "label": "IC Project Room 1134", "color": "lightgray"},
-                "vocalBooth": {"x": 300, "y": HALLWAY_Y + 150, "label": "Vocal Booth", "color": "lightgray"},
-                
-                # Central area
-                "circulation": {"x": 400, "y": HALLWAY_Y + 20, "label": "Circulation (Borrowing)", "color": "lightgray"},
-                
-                # 1South area
-                "southEntrance": {"x": 350, "y": HALLWAY_Y - 20, "label": "1South Entrance", "color": "lightgray"},
-                "southCollaborativeStudyArea": {"x": 350, "y": HALLWAY_Y - 150, "label": "1 South Collaborative Study Area", "color": "lightgray"},
-                "projectRoomB": {"x": 250, "y": HALLWAY_Y - 200, "label": "Project Room B", "color": "lightgray"},
-                "projectRoomA": {"x": 450, "y": HALLWAY_Y - 200, "label": "Project Room A", "color": "lightgray"},
-                
-                # East central area
-                "toCafeBergson": {"x": 500, "y": HALLWAY_Y + 30, "label": "To Café Bergson", "color": "lightgray"},
-                "toLowerLevel": {"x": 500, "y": HALLWAY_Y - 30, "label": "To Lower Level", "color": "lightgray"},
-                "bookNookLeisureReading": {"x": 500, "y": HALLWAY_Y - 100, "label": "Book Nook/Leisure Reading", "color": "lightgray"},
-                
-                # North tower
-                "personnel": {"x": 500, "y": HALLWAY_Y + 100, "label": "Personnel", "color": "lightgray"},
-                "administration": {"x": 500, "y": HALLWAY_Y + 150, "label": "Administration", "color": "lightgray"},
-                
-                # East end
-                "periodicalsNewspapersReadingRoom": {"x": 700, "y": HALLWAY_Y + 50, "label": "Periodicals & Newspapers", "color": "lightgray"},
-                "referenceCollection": {"x": 700, "y": HALLWAY_Y - 50, "label": "Reference Collection", "color": "lightgray"}
-            },
-            "edges": [
-                # Main entrance connections
-                {"from": "mainEntrance", "to": "toLevel2", "weight": 50},
-                {"from": "mainEntrance", "to": "johnPMcGowanInformationCommons", "weight": 150},
-                
-                # Information Commons connections
-                {"from": "johnPMcGowanInformationCommons", "to": "icProjectRoom1134", "weight": 100},
-                {"from": "johnPMcGowanInformationCommons", "to": "vocalBooth", "weight": 100},
-                
-                # Main hallway connections
-                {"from": "mainEntrance", "to": "circulation", "weight": 300},
-                {"from": "circulation", "to": "toCafeBergson", "weight": 100},
-                
-                # 1South connections
-                {"from": "circulation", "to": "southEntrance", "weight": 50},
-                {"from": "southEntrance", "to": "southCollaborativeStudyArea", "weight": 150},
-                {"from": "southCollaborativeStudyArea", "to": "projectRoomB", "weight": 100},
-                {"from": "southCollaborativeStudyArea", "to": "projectRoomA", "weight": 100},
-                
-                # East central connections
-                {"from": "circulation", "to": "toLowerLevel", "weight": 100},
-                {"from": "toLowerLevel", "to": "bookNookLeisureReading", "weight": 100},
-                
-                # North tower connections
-                {"from": "toLowerLevel", "to": "personnel", "weight": 100},
-                {"from": "personnel", "to": "administration", "weight": 50},
-                
-                # East end connections
-                {"from": "toCafeBergson", "to": "periodicalsNewspapersReadingRoom", "weight": 200},
-                {"from": "periodicalsNewspapersReadingRoom", "to": "referenceCollection", "weight": 100}
-            ]
-        }
-        
-        # Initialize NetworkX graph for pathfinding
-        self.nx_graph = nx.Graph()
-        for edge in self.floor_plan["edges"]:
-            self.nx_graph.add_edge(edge["from"], edge["to"], weight=edge["weight"])
+        # Descriptor, feature and nearby phrases keyed by their words, for
+        # scoring where a lost user is
+        evidence = [
+            (descriptor, locations, LOST_USER_WEIGHTS[DESCRIPTOR])
+            for descriptor, locations in self.area_descriptors.items()
+        ]
+        for location, details in self.location_features.items():
+            evidence += [(feature, [location], LOST_USER_WEIGHTS[FEATURE]) for feature in details["features"]]
+            evidence += [(nearby, [location], LOST_USER_WEIGHTS[NEARBY]) for nearby in details["nearby"]]
+        self.location_index = LocationIndex(evidence)
+
+        # Floor plan configuration for the whole building; nodes know their floor
+        self.floor_plan = {"nodes": {}, "edges": []}
+        for floor in floors:
+            for node_id, node in floor["nodes"].items():
+                self.floor_plan["nodes"][node_id] = {**node, "floor": floor["id"]}
+            self.floor_plan["edges"].extend(floor["edges"])
+        # Stairs and elevators exactly as the routing graph links them
+        self.floor_plan["edges"].extend(self.floor_graph.connector_edges)
+
+        # Labels and aliases for typo-tolerant lookups of names no alias contains
+        self.room_index = FuzzyIndex(
+            [(node["label"], room_id) for room_id, node in self.floor_plan["nodes"].items()]
+            + [(alias, room_id) for alias, room_id in self.room_aliases.items()]
+        )
+
+        # Call-number ranges of the shelves, if the building lists them; see floor_plans/stacks.json
+        self.stacks = None
+        if "stacks" in self.building:
+            self.stacks = StacksLocator.load(Path(floor_plans_dir) / self.building["stacks"])
+            unknown = sorted({shelf.node for shelf in self.stacks.shelves} - self.floor_plan["nodes"].keys())
+            if unknown:
+                raise ValueError(f"Stack ranges name unknown nodes: {unknown}")
+
+        # Routes are searched with A* on first use and cached
+        self.route_table = RouteTable(self.floor_graph, self.get_step_directions)
+
+        # Static parts of each floor's map are rasterized once, the entrance floor
+        # up front and the others the first time a route reaches them
+        self.map_background = map_background
+        self.map_renderers = {}
+        self._renderer_lock = threading.Lock()
+        self.map_renderer = self.get_map_renderer(self.floor_plan["nodes"][self.entrance]["floor"])
+
+    def get_map_renderer(self, floor_id):
+        """MapRenderer for one floor, created on first use"""
+        renderer = self.map_renderers.get(floor_id)
+        if renderer is None:
+            with self._renderer_lock:
+                renderer = self.map_renderers.get(floor_id)
+                if renderer is None:
+                    floor = self.floors[floor_id]
+                    renderer = MapRenderer(
+                        floor,
+                        background=self._floor_background(floor, self.map_background),
+                        title=f"{self.building['name']} {floor['name']}"
+                    )
+                    self.map_renderers[floor_id] = renderer
+        return renderer
+
+    @staticmethod
+    def _floor_background(floor, map_background):
+        if not map_background or not floor.get("image"):
+            return None
+        path = Path(map_background)
+        if path.is_dir():
+            return path / floor["image"]
+        return path if path.name == floor["image"] else None
 
     def find_user_location(self, description: str, additional_details: str = None) -> dict:
         """Attempt to determine user's location based on their description."""
         description = description.lower()
-        potential_locations = {}
         
         # First pass: Check for exact room numbers or names
-        for alias, room_id in self.room_aliases.items():
-            if alias in description:
-                return {
-                    "locations": [{
-                        "id": room_id,
-                        "name": self.floor_plan["nodes"][room_id]["label"],
-                        "confidence": 1.0
-                    }],
-                    "needs_clarification": False
-                }
-        
-        # Second pass: Parse area descriptors
-        for descriptor, locations in self.area_descriptors.items():
-            if descriptor in description:
-                for location in locations:
-                    if location not in potential_locations:
-                        potential_locations[location] = 0.0
-                    potential_locations[location] += 0.3
-        
-        # Third pass: Check for specific features
-        for location, details in self.location_features.items():
-            for feature in details["features"]:
-                if feature in description:
-                    if location not in potential_locations:
-                        potential_locations[location] = 0.0
-                    potential_locations[location] += 0.4
-            
-            for nearby in details["nearby"]:
-                if nearby in description:
-                    if location not in potential_locations:
-                        potential_locations[location] = 0.0
-                    potential_locations[location] += 0.2
+        names = self.phrase_matcher.find(description, ALIAS)
+        if names:
+            room_id = names[0].values(ALIAS)[0]
+            return {
+                "locations": [{
+                    "id": room_id,
+                    "name": self.floor_plan["nodes"][room_id]["label"],
+                    "confidence": 1.0
+                }],
+                "needs_clarification": False
+            }
         
-        # Sort and format results
-        sorted_locations = sorted(
-            [(k, v) for k, v in potential_locations.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        # Second pass: area descriptors, specific features and what is nearby,
+        # summed per place; each phrase counts once however often it appears
+        sorted_locations = self.location_index.rank(description, limit=3)
         
         results = []
-        for location_id, confidence in sorted_locations[:3]:
+        for location_id, confidence in sorted_locations:
             results.append({
                 "id": location_id,
                 "name": self.floor_plan["nodes"][location_id]["label"],
@@ -315,7 +189,8 @@ class ReceptionistSystem:
             "possible_locations": location_results["locations"],
             "needs_clarification": location_results["needs_clarification"],
             "clarifying_questions": [],
-            "directions": []
+            "directions": [],
+            "map_image": None
         }
         
         # If we need more information
@@ -335,77 +210,61 @@ class ReceptionistSystem:
                 )
                 
                 # Highlight the path on the map
-                self.highlight_room(dest_location)
-                path = nx.shortest_path(self.nx_graph, start_location, dest_location)
-                self.visualize_map(path)
+                path = self.route_table.path(start_location, dest_location)
+                response["map_image"] = self.visualize_map(path, dest_location)
         # If we're confident about location but no destination specified
         elif location_results["locations"]:
             start_location = location_results["locations"][0]["id"]
             response["directions"] = self.get_directions(
                 start_location, 
-                "mainEntrance"  # Default to main entrance only if no destination specified
+                self.entrance  # Default to main entrance only if no destination specified
             )
             
             # Highlight the path on the map
-            self.highlight_room("mainEntrance")
-            path = nx.shortest_path(self.nx_graph, start_location, "mainEntrance")
-            self.visualize_map(path)
+            path = self.route_table.path(start_location, self.entrance)
+            response["map_image"] = self.visualize_map(path, self.entrance)
         
         return response
 
-    def visualize_map(self, highlight_path=None):
-        """Visualize the floor plan with optional path highlighting."""
-        plt.figure(figsize=(15, 10))
-        
-        # Plot edges first
-        for edge in self.floor_plan["edges"]:
-            start = self.floor_plan["nodes"][edge["from"]]
-            end = self.floor_plan["nodes"][edge["to"]]
-            plt.plot([start["x"], end["x"]], [start["y"], end["y"]], 
-                    'k-', linewidth=1, alpha=0.5)
-
-        # Plot main hallway as a reference line
-        plt.axhline(y=400, color='gray', linestyle='--', alpha=0.3)
-
-        # Plot nodes
-        for node_id, node in self.floor_plan["nodes"].items():
-            plt.plot(node["x"], node["y"], 'o', 
-                    color=node["color"], markersize=12)
-            # Adjust label positions based on node location relative to hallway
-            if node["y"] > 400:  # Above hallway
-                va = 'bottom'
-            else:  # Below hallway
-                va = 'top'
-            plt.text(node["x"] + 5, node["y"], node["label"], 
-                    fontsize=8, ha='left', va=va)
-
-        # Highlight path if specified
-        if highlight_path:
-            for i in range(len(highlight_path) - 1):
-                start = self.floor_plan["nodes"][highlight_path[i]]
-                end = self.floor_plan["nodes"][highlight_path[i + 1]]
-                plt.plot([start["x"], end["x"]], [start["y"], end["y"]], 
-                        'r-', linewidth=2)
-
-        plt.title("Library Floor Plan Navigation")
-        plt.xlabel("West → East")
-        plt.ylabel("South → North")
-        plt.grid(True)
-        
-        # Set fixed aspect ratio and adjust limits
-        plt.axis('equal')
-        plt.xlim(50, 800)
-        plt.ylim(150, 650)
-        
-        # Add compass direction
-        plt.text(750, 600, 'N↑', fontsize=12, ha='center')
-        
-        plt.show()
+    def visualize_map(self, highlight_path=None, destination=None):
+        """
+        Render the floor plan with optional path and destination highlighting.
+
+        A route across floors shows each floor it passes through, top to bottom
+        in the order they are visited. Nothing shared is modified, so
+        concurrent requests can render safely.
+
+        Returns:
+            str: Base64 encoded PNG
+        """
+        with timed("map_render"):
+            nodes = self.floor_plan["nodes"]
+            if not highlight_path:
+                floor = nodes[destination]["floor"] if destination in nodes else None
+                renderer = self.get_map_renderer(floor) if floor else self.map_renderer
+                return renderer.render_base64(highlight_path, destination)
+
+            segments = []
+            for node_id in highlight_path:
+                floor = nodes[node_id]["floor"]
+                if segments and segments[-1][0] == floor:
+                    segments[-1][1].append(node_id)
+                else:
+                    segments.append((floor, [node_id]))
+            images = [
+                self.get_map_renderer(floor).render_image(segment, destination if segment[-1] == destination else None)
+                for floor, segment in segments
+            ]
+            return base64.b64encode(encode_png(stack_images(images))).decode('utf-8')
 
     def find_closest_room_match(self, query):
         """Find the closest matching room from the query using room aliases."""
         if not query:
             return None
+
+        # Node ids, as passed on by navigate
+        if query in self.floor_plan["nodes"]:
+            return query
             
         query = query.lower().strip()
         
@@ -413,153 +272,187 @@ class ReceptionistSystem:
         if query in self.room_aliases:
             return self.room_aliases[query]
         
-        # Look for substring matches
-        longest_match = ""
-        matched_room = None
-        for alias, room_id in self.room_aliases.items():
-            if alias in query and len(alias) > len(longest_match):
-                longest_match = alias
-                matched_room = room_id
-                
-        if matched_room:
-            return matched_room
+        # Look for the longest alias mentioned in the query
+        mentions = self.phrase_matcher.find(query, ALIAS)
+        if mentions:
+            longest = max(mentions, key=lambda match: match.end - match.start)
+            return longest.values(ALIAS)[0]
         
         # Try fuzzy matching as a last resort
-        room_labels = {node["label"].lower(): room_id 
-                    for room_id, node in self.floor_plan["nodes"].items()}
-        matches = get_close_matches(query, room_labels.keys(), n=1, cutoff=0.6)
-        
-        if matches:
-            return room_labels[matches[0]]
+        candidates = self.room_index.search(query, limit=1, cutoff=ROOM_MATCH_CUTOFF)
+        if candidates:
+            return candidates[0].value
         return None
 
-    def get_directions(self, start, goal):
-        """Generate step-by-step directions between two locations."""
-        try:
-            path = nx.shortest_path(self.nx_graph, start, goal, weight="weight")
-            
-            directions = []
-            for i in range(len(path) - 1):
-                current_node = self.floor_plan["nodes"][path[i]]
-                next_node = self.floor_plan["nodes"][path[i + 1]]
-                
-                # Calculate relative position (left/right/ahead)
-                dx = next_node["x"] - current_node["x"]
-                dy = next_node["y"] - current_node["y"]
-                
-                # Get current and next location names
-                current_name = current_node["label"]
-                next_name = next_node["label"]
-                
-                # Generate direction based on relative positions
-                if abs(dx) > abs(dy):  # Primarily east-west movement
-                    if dx > 0:
-                        if dy > 20:  # Slightly north
-                            directions.append(f"From {current_name}, head east and slightly to your right to reach {next_name}")
-                        elif dy < -20:  # Slightly south
-                            directions.append(f"From {current_name}, head east and slightly to your left to reach {next_name}")
-                        else:
-                            directions.append(f"From {current_name}, continue straight east along the hallway to reach {next_name}")
-                    else:
-                        if dy > 20:  # Slightly north
-                            directions.append(f"From {current_name}, head west and slightly to your right to reach {next_name}")
-                        elif dy < -20:  # Slightly south
-                            directions.append(f"From {current_name}, head west and slightly to your left to reach {next_name}")
-                        else:
-                            directions.append(f"From {current_name}, continue straight west along the hallway to reach {next_name}")
-                else:  # Primarily north-south movement
-                    if dy > 0:
-                        if dx > 20:  # Slightly east
-                            directions.append(f"From {current_name}, turn right and head north to reach {next_name}")
-                        elif dx < -20:  # Slightly west
-                            directions.append(f"From {current_name}, turn left and head north to reach {next_name}")
-                        else:
-                            directions.append(f"From {current_name}, head straight north to reach {next_name}")
-                    else:
-                        if dx > 20:  # Slightly east
-                            directions.append(f"From {current_name}, turn right and head south to reach {next_name}")
-                        elif dx < -20:  # Slightly west
-                            directions.append(f"From {current_name}, turn left and head south to reach {next_name}")
-                        else:
-                            directions.append(f"From {current_name}, head straight south to reach {next_name}")
-
-                # Add additional context for specific locations
-                if next_name == "1 South Collaborative Study Area":
-                    directions.append("Look for the large '1South' sign above the entrance")
-                elif "Project Room" in next_name:
-                    if "A" in next_name:
-                        directions.append("Project Room A is located in the southeast corner of 1South")
-                    else:
-                        directions.append("Project Room B is located in the southwest corner of 1South")
-                elif next_name == "To Café Bergson":
-                    directions.append("Look for the staircase on your right leading up")
-                elif next_name == "To Lower Level":
-                    directions.append("Look for the staircase on your left leading down")
-                elif "Information Commons" in next_name:
-                    directions.append("Look for the large open area with computer workstations")
-                elif "Circulation" in next_name:
-                    directions.append("Look for the main service desk with self-checkout stations")
+    def find_room_candidates(self, query, limit=5, cutoff=0.0):
+        """
+        Rooms whose label or alias is spelled most like the query, best first.
 
+        Returns:
+            list: Dictionaries with the room "id", its "name" and the matched
+                spelling's similarity "score" in [0, 1]
+        """
+        return [
+            {"id": candidate.value, "name": self.floor_plan["nodes"][candidate.value]["label"], "score": candidate.score}
+            for candidate in self.room_index.search(query or "", limit=limit, cutoff=cutoff)
+        ]
+
+    def find_shelf(self, call_number):
+        """
+        Where a call number is shelved.
+
+        Returns:
+            dict: The shelf node "id", its "name", the range "label" and the
+                "floor" name, or None if no stack range covers the call number
+        """
+        shelf = self.stacks.locate(call_number) if self.stacks else None
+        if shelf is None:
+            return None
+        node = self.floor_plan["nodes"][shelf.node]
+        return {
+            "id": shelf.node,
+            "name": node["label"],
+            "label": shelf.label,
+            "floor": self.floors[node["floor"]]["name"]
+        }
+
+    def locate_call_number(self, call_number, start_location=None, render_map=True):
+        """
+        Directions and route map to the shelves holding a call number.
+
+        Args:
+            call_number (str): LC call number, e.g. "QA76.73 .P98"
+            start_location (str): Starting location query; the entrance if None
+            render_map (bool): Whether to render the route map
+
+        Returns:
+            dict: "response" and "map_image", as from plan_route
+        """
+        shelf = self.find_shelf(call_number)
+        if shelf is None:
+            return {
+                "response": f"I couldn't find where {call_number} is shelved. Please check the call number or ask at the service desk.",
+                "map_image": None
+            }
+        result = self.plan_route(start_location or self.entrance, shelf["id"], render_map=render_map)
+        located = f"{call_number} is shelved in {shelf['label'] or shelf['name']} ({shelf['floor']})."
+        return {"response": f"{located}\n\n{result['response']}", "map_image": result["map_image"]}
+
+    def get_step_directions(self, from_id, to_id, edge_type=WALK):
+        """Generate the direction lines for one leg of a route: a walk, a flight of stairs or an elevator ride."""
+        directions = []
+        current_node = self.floor_plan["nodes"][from_id]
+        next_node = self.floor_plan["nodes"][to_id]
+
+        if edge_type != WALK:
+            current_floor = self.floors[current_node["floor"]]
+            next_floor = self.floors[next_node["floor"]]
+            way = "up" if next_floor["level"] > current_floor["level"] else "down"
+            if edge_type == "elevator":
+                directions.append(f"From {current_node['label']}, take the elevator {way} to {next_floor['name']}")
+            else:
+                directions.append(f"From {current_node['label']}, take the stairs {way} to {next_floor['name']}")
+            directions.append(f"You will arrive at {next_node['label']}")
             return directions
-        except nx.NetworkXNoPath:
-            return ["No path found between these locations."]
+        
+        # Calculate relative position (left/right/ahead)
+        dx = next_node["x"] - current_node["x"]
+        dy = next_node["y"] - current_node["y"]
+        
+        # Get current and next location names
+        current_name = current_node["label"]
+        next_name = next_node["label"]
+        
+        # Generate direction based on relative positions
+        if abs(dx) > abs(dy):  # Primarily east-west movement
+            if dx > 0:
+                if dy > 20:  # Slightly north
+                    directions.append(f"From {current_name}, head east and slightly to your right to reach {next_name}")
+                elif dy < -20:  # Slightly south
+                    directions.append(f"From {current_name}, head east and slightly to your left to reach {next_name}")
+                else:
+                    directions.append(f"From {current_name}, continue straight east along the hallway to reach {next_name}")
+            else:
+                if dy > 20:  # Slightly north
+                    directions.append(f"From {current_name}, head west and slightly to your right to reach {next_name}")
+                elif dy < -20:  # Slightly south
+                    directions.append(f"From {current_name}, head west and slightly to your left to reach {next_name}")
+                else:
+                    directions.append(f"From {current_name}, continue straight west along the hallway to reach {next_name}")
+        else:  # Primarily north-south movement
+            if dy > 0:
+                if dx > 20:  # Slightly east
+                    directions.append(f"From {current_name}, turn right and head north to reach {next_name}")
+                elif dx < -20:  # Slightly west
+                    directions.append(f"From {current_name}, turn left and head north to reach {next_name}")
+                else:
+                    directions.append(f"From {current_name}, head straight north to reach {next_name}")
+            else:
+                if dx > 20:  # Slightly east
+                    directions.append(f"From {current_name}, turn right and head south to reach {next_name}")
+                elif dx < -20:  # Slightly west
+                    directions.append(f"From {current_name}, turn left and head south to reach {next_name}")
+                else:
+                    directions.append(f"From {current_name}, head straight south to reach {next_name}")
 
-    def highlight_room(self, room_id):
-        """Reset all rooms to default color and highlight the specified room."""
-        for node in self.floor_plan["nodes"].values():
-            node["color"] = "lightgray"
-            
-        if room_id in self.floor_plan["nodes"]:
-            self.floor_plan["nodes"][room_id]["color"] = "red"
+        # Add additional context for specific locations
+        if next_name == "1 South Collaborative Study Area":
+            directions.append("Look for the large '1South' sign above the entrance")
+        elif "Project Room" in next_name:
+            if "A" in next_name:
+                directions.append("Project Room A is located in the southeast corner of 1South")
+            else:
+                directions.append("Project Room B is located in the southwest corner of 1South")
+        elif next_name == "To Café Bergson":
+            directions.append("Look for the staircase on your right leading up")
+        elif next_name == "To Lower Level":
+            directions.append("Look for the staircase on your left leading down")
+        elif "Information Commons" in next_name:
+            directions.append("Look for the large open area with computer workstations")
+        elif "Circulation" in next_name:
+            directions.append("Look for the main service desk with self-checkout stations")
+
+        return directions
+
+    def get_directions(self, start, goal):
+        """Generate step-by-step directions between two locations."""
+        directions = self.route_table.directions(start, goal)
+        if directions is None:
+            return ["No path found between these locations."]
+        return directions
 
     def process_natural_language_query(self, query: str) -> str:
+        """Process a natural language navigation query and return formatted directions."""
+        return self.navigate(query)["response"]
+
+    def navigate(self, query: str) -> dict:
         """
-        Process a natural language navigation query.
+        Process a natural language navigation query into directions and a route map.
         Example inputs:
         - "How do I get from 1South to Information Commons?"
         - "Where is the Information Commons from 1South?"
         - "I'm at circulation, how do I get to periodicals?"
         """
         query = query.lower().strip()
-        start_location = None
-        end_location = None
         
-        # Common patterns for extracting locations
-        from_patterns = ["from", "at", "in", "near"]
-        to_patterns = ["to", "find", "reach", "get to"]
-        
-        # First try to find the destination (end location)
-        parts = query.split()
-        found_end = False
-        for pattern in to_patterns:
-            if pattern in query:
-                idx = query.index(pattern)
-                end_part = query[idx + len(pattern):].strip()
-                # Look for the longest matching alias
-                longest_match = ""
-                for alias in self.room_aliases.keys():
-                    if alias in end_part and len(alias) > len(longest_match):
-                        longest_match = alias
-                        end_location = self.room_aliases[alias]
-                        found_end = True
-                if found_end:
-                    break
-        
-        # Try to find the starting location
-        found_start = False
-        for pattern in from_patterns:
-            if pattern in query:
-                idx = query.index(pattern)
-                start_part = query[idx + len(pattern):].strip()
-                # Look for the longest matching alias
-                longest_match = ""
-                for alias in self.room_aliases.keys():
-                    if alias in start_part and len(alias) > len(longest_match):
-                        longest_match = alias
-                        start_location = self.room_aliases[alias]
-                        found_start = True
-                if found_start:
-                    break
+        # Every alias mentioned, with its position, from one scan of the query
+        mentions = self.phrase_matcher.find(query, ALIAS)
+
+        def first_mention_after(pattern):
+            for marker in pattern.finditer(query):
+                for match in mentions:
+                    if match.start >= marker.end():
+                        return match.values(ALIAS)[0]
+            return None
+
+        # The place right after "to" is the destination, the one after "from" the start
+        end_location = first_mention_after(TO_WORDS)
+        start_location = first_mention_after(FROM_WORDS)
+
+        # A call number in the query is the destination, e.g. "where is QA76.73 .P98?"
+        call_number = find_call_number(query)
+        if call_number:
+            return self.locate_call_number(call_number, start_location)
         
         # Debug output
         print(f"Parsed start location: {start_location}")
@@ -567,13 +460,15 @@ class ReceptionistSystem:
         
         # If we found both locations, use them
         if start_location and end_location and start_location != end_location:
-            return self.process_query(start_location, end_location)
+            return self.plan_route(start_location, end_location)
         # If we only found destination, use normal processing
         elif end_location:
-            return self.process_query("mainEntrance", end_location)
+            return self.plan_route(self.entrance, end_location)
         else:
-            return "I couldn't understand the locations in your query. Please specify where you want to go more clearly."
-
+            return {
+                "response": "I couldn't understand the locations in your query. Please specify where you want to go more clearly.",
+                "map_image": None
+            }
 
     def process_query(self, start_location, end_location):
         """
@@ -586,6 +481,21 @@ class ReceptionistSystem:
         Returns:
             str: Formatted directions or error message
         """
+        return self.plan_route(start_location, end_location, render_map=False)["response"]
+
+    def plan_route(self, start_location, end_location, render_map=True):
+        """
+        Build directions and the highlighted route map for one request.
+        
+        Args:
+            start_location (str): Starting location query
+            end_location (str): Destination location query
+            render_map (bool): Whether to render the route map
+            
+        Returns:
+            dict: "response" with formatted directions or error message, and
+                "map_image" with the base64 route map (None when there is no route)
+        """
         # Find matching rooms for both start and end locations
         start = self.find_closest_room_match(start_location)
         destination = self.find_closest_room_match(end_location)
@@ -596,20 +506,25 @@ class ReceptionistSystem:
             error_messages.append(f"Could not find starting location: '{start_location}'")
         if not destination:
             error_messages.append(f"Could not find destination: '{end_location}'")
+            suggestions = [candidate["name"] for candidate in self.find_room_candidates(end_location, limit=3, cutoff=ROOM_SUGGESTION_CUTOFF)]
+            if suggestions:
+                error_messages.append(f"Did you mean: {', '.join(suggestions)}?")
         
         if error_messages:
-            return "\n".join(error_messages) + "\nPlease rephrase or provide more details."
+            return {
+                "response": "\n".join(error_messages) + "\nPlease rephrase or provide more details.",
+                "map_image": None
+            }
             
         if start == destination:
-            return "You are already at your destination!"
+            return {"response": "You are already at your destination!", "map_image": None}
         
         # Get directions between the two points
         directions = self.get_directions(start, destination)
         
         # Highlight destination and show path on map
-        self.highlight_room(destination)
-        path = nx.shortest_path(self.nx_graph, start, destination)
-        self.visualize_map(highlight_path=path)
+        path = self.route_table.path(start, destination)
+        map_image = self.visualize_map(path, destination) if render_map else None
         
         # Format the directions nicely with step numbers
         numbered_directions = []
@@ -620,11 +535,14 @@ class ReceptionistSystem:
         start_name = self.floor_plan['nodes'][start]['label']
         dest_name = self.floor_plan['nodes'][destination]['label']
         
-        return "\n".join([
-            f"Directions from {start_name} to {dest_name}:",
-            "",  # Empty line for spacing
-            "\n".join(numbered_directions)
-        ])
+        return {
+            "response": "\n".join([
+                f"Directions from {start_name} to {dest_name}:",
+                "",  # Empty line for spacing
+                "\n".join(numbered_directions)
+            ]),
+            "map_image": map_image
+        }
     def get_navigation_options(self):
         """
         Returns a list of all available locations for navigation.
@@ -1,18 +1,21 @@
-from flask import Flask, request, jsonify
+import time
+# Startup times are measured from here, before the heavy imports below
+STARTED = time.perf_counter()
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from Main_Graph import ReceptionistSystem
 from library_rag import LibraryRAG
-import matplotlib
-import networkx as nx
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import base64
-from io import BytesIO
+from intent_classifier import IntentClassifier
 import logging
 from pathlib import Path
 import os
+import json
+import threading
 from dotenv import load_dotenv
-from openai import OpenAI
+from llm_backends import get_openai_client, get_backend_name
+from metrics import REGISTRY, REQUEST_SECONDS, LLM_CALLS, ERRORS, timed, stats_collector
+from snapshot_watcher import SnapshotWatcher
+from warmup import BackgroundWarmup, StartupClock
 
 # Load environment variables
 load_dotenv()
@@ -47,22 +50,108 @@ def after_request(response):
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
     return response
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# Chat responses mark the first response after startup; probes and metrics do not count
+@app.after_request
+def mark_first_response(response):
+    if request.path.startswith('/api/chat') and response.status_code < 500:
+        startup.mark('first_response')
+    return response
+
+# Initialize OpenAI client (LLM_BACKEND=local swaps in an offline stand-in)
+client = get_openai_client(api_key=os.getenv('OPENAI_API_KEY'))
+logger.info(f"Using LLM backend: {get_backend_name()}")
+
+startup = StartupClock(STARTED)
+REGISTRY.add_collector(startup.collector(
+    "receptionist_startup_seconds",
+    "Seconds from process start to each startup milestone"
+))
 
-# Initialize systems
+# Initialize systems; the RAG index is built in the background (see rag_warmup below)
 try:
-    receptionist = ReceptionistSystem()
-    library_rag = LibraryRAG(data_dir="library_data")
-    library_rag.initialize()
-    logger.info("All systems initialized successfully")
+    receptionist = ReceptionistSystem(map_background=os.getenv('MAP_BACKGROUND'))
+    cache_similarity = os.getenv('ANSWER_CACHE_SIMILARITY')
+    library_rag = LibraryRAG(
+        data_dir="library_data",
+        cache_size=int(os.getenv('ANSWER_CACHE_SIZE', '512')),
+        cache_ttl=float(os.getenv('ANSWER_CACHE_TTL', '3600')),
+        cache_similarity=float(cache_similarity) if cache_similarity else None,
+        retrieval_mode=os.getenv('RETRIEVAL_MODE', 'hybrid'),
+        index_backend=os.getenv('INDEX_BACKEND', 'chroma'),
+        index_dtype=os.getenv('INDEX_DTYPE', 'float16'),
+        category_routing=os.getenv('CATEGORY_ROUTING', '1') != '0',
+        fast_answers=os.getenv('FAST_ANSWERS', '1') != '0'
+    )
+    intent_classifier = IntentClassifier(
+        receptionist,
+        threshold=float(os.getenv('INTENT_CONFIDENCE_THRESHOLD', '0.75'))
+    )
+    REGISTRY.add_collector(stats_collector(
+        "receptionist_intent_classifications_total",
+        "Intent classifications answered locally or by the LLM fallback",
+        intent_classifier.get_stats,
+        {"local_hits": "local", "llm_fallbacks": "llm"}
+    ))
+    if library_rag.category_router:
+        REGISTRY.add_collector(stats_collector(
+            "receptionist_retrieval_category_total",
+            "Questions whose retrieval was narrowed to one page category",
+            library_rag.category_router.get_stats,
+            {"hours": "hours", "contact": "contact", "events": "events", "services": "services", "unrouted": "all"}
+        ))
+    if library_rag.use_fast_answers:
+        REGISTRY.add_collector(stats_collector(
+            "receptionist_fast_answers_total",
+            "Standalone questions answered from extracted facts, or passed on to retrieval",
+            # The store is replaced whenever the index is rebuilt from a new snapshot
+            lambda: library_rag.fast_answers.get_stats() if library_rag.fast_answers else {},
+            {"hits": "fact", "misses": "rag"}
+        ))
+    REGISTRY.add_collector(stats_collector(
+        "receptionist_index_reloads_total",
+        "New scrape snapshots indexed and swapped in without a restart",
+        library_rag.get_index_stats,
+        {"reloads": "swapped"}
+    ))
+    if library_rag.answer_cache:
+        REGISTRY.add_collector(stats_collector(
+            "receptionist_answer_cache_total",
+            "Answer cache lookups by result",
+            library_rag.answer_cache.get_stats,
+            {"exact_hits": "exact_hit", "semantic_hits": "semantic_hit", "misses": "miss"}
+        ))
+    logger.info("Directions ready, building the library index in the background")
 except Exception as e:
     logger.error(f"Error initializing systems: {e}")
     raise e
 
 
-def get_intent(query: str) -> str:
+# New scrape snapshots are indexed in the background and swapped in without a restart
+snapshot_watcher = SnapshotWatcher(library_rag, interval=float(os.getenv('SNAPSHOT_POLL_SECONDS', '60')))
+
+
+def warm_up_rag():
+    library_rag.initialize()
+    startup.mark('rag_ready')
+    if snapshot_watcher.interval > 0:
+        snapshot_watcher.start()
+
+# Embedding the library data can take minutes and may fail on API errors, so it
+# runs (and retries) in a thread while directions are already being served
+rag_warmup = BackgroundWarmup("library RAG", warm_up_rag, started=STARTED)
+
+# A "still warming up" reply for information questions asked before the index is ready
+WARMING_UP = {
+    'response': "I'm still loading library information. I can already give directions; please ask again in a moment.",
+    'map_image': None,
+    'intent': None,
+    'warming_up': True
+}
+
+
+def get_llm_intent(query: str) -> str:
     """Simple intent classification using OpenAI"""
+    LLM_CALLS.inc(stage="intent")
     try:
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -77,19 +166,24 @@ def get_intent(query: str) -> str:
         logger.error(f"Error in intent classification: {e}")
         return "INFORMATION"  # Default fallback
 
-def generate_map_image():
-    """Generate base64 encoded image from the current matplotlib figure"""
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close()
-    buf.seek(0)
-    image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-    buf.close()
-    return image_base64
+def get_intent(query: str) -> str:
+    """Classify locally and only ask the LLM about ambiguous queries"""
+    return intent_classifier.resolve(query, get_llm_intent)
+
+def get_rag_chat_history(chat_history: list) -> list:
+    """(question, answer) pairs from earlier information exchanges"""
+    return [(msg['question'], msg['answer']) 
+            for msg in chat_history 
+            if msg.get('intent') == 'information']
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle incoming chat requests"""
+    started = time.perf_counter()
     try:
         data = request.json
         user_query = data.get('message', '').strip()
@@ -101,33 +195,28 @@ def chat():
                 'map_image': None
             })
 
-        # Get intent using OpenAI
-        intent = get_intent(user_query).upper()
+        # Get intent (local classifier with OpenAI fallback)
+        with timed("intent"):
+            intent = get_intent(user_query).upper()
         logger.info(f"Classified intent: {intent}")
 
         # Handle directions
         if intent == "DIRECTIONS":
             try:
-                # Use natural language processing instead of simple destination lookup
-                directions_response = receptionist.process_natural_language_query(user_query)
-                
-                if "couldn't understand" in directions_response.lower():
-                    return jsonify({
-                        'response': directions_response,
-                        'map_image': None,
-                        'intent': 'directions'
-                    })
-
-                # Generate map after directions are processed (path will be highlighted by process_natural_language_query)
-                map_image = generate_map_image()
+                # Directions text and route map are built per request, so
+                # concurrent requests never share rendering state
+                with timed("directions"):
+                    result = receptionist.navigate(user_query)
+                REQUEST_SECONDS.observe(time.perf_counter() - started, intent="directions")
                 
                 return jsonify({
-                    'response': directions_response,
-                    'map_image': map_image,
+                    'response': result['response'],
+                    'map_image': result['map_image'],
                     'intent': 'directions'
                 })
             except Exception as e:
                 logger.error(f"Error handling directions: {e}")
+                ERRORS.inc(intent="directions")
                 return jsonify({
                     'response': "Sorry, I had trouble getting those directions. Please try again.",
                     'map_image': None,
@@ -136,12 +225,14 @@ def chat():
 
         # Handle information
         else:
+            if not rag_warmup.ready:
+                return jsonify(WARMING_UP), 503, {'Retry-After': '5'}
             try:
-                rag_chat_history = [(msg['question'], msg['answer']) 
-                                  for msg in chat_history 
-                                  if msg.get('intent') == 'information']
+                rag_chat_history = get_rag_chat_history(chat_history)
                 
-                result = library_rag.query(user_query, rag_chat_history)
+                with timed("rag"):
+                    result = library_rag.query(user_query, rag_chat_history)
+                REQUEST_SECONDS.observe(time.perf_counter() - started, intent="information")
                 
                 return jsonify({
                     'response': result["answer"],
@@ -150,6 +241,7 @@ def chat():
                 })
             except Exception as e:
                 logger.error(f"Error handling information query: {e}")
+                ERRORS.inc(intent="information")
                 return jsonify({
                     'response': "Sorry, I had trouble finding that information. Please try again.",
                     'map_image': None,
@@ -158,6 +250,7 @@ def chat():
 
     except Exception as e:
         logger.error(f"Error processing request: {e}")
+        ERRORS.inc(intent="unknown")
         return jsonify({
             'error': str(e),
             'response': 'An error occurred while processing your request.',
@@ -165,5 +258,173 @@ def chat():
             'intent': None
         }), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Handle chat requests as Server-Sent Events, streaming information answers token by token"""
+    data = request.json or {}
+    user_query = data.get('message', '').strip()
+    chat_history = data.get('chat_history', [])
+
+    def generate():
+        start = time.perf_counter()
+
+        if not user_query:
+            yield sse_event('done', {
+                'response': "Please provide a question.",
+                'map_image': None,
+                'intent': None
+            })
+            return
+
+        with timed("intent"):
+            intent = get_intent(user_query).upper()
+        logger.info(f"Classified intent: {intent}")
+
+        # Directions are fast and carry a map, so they arrive as a single frame
+        if intent == "DIRECTIONS":
+            try:
+                with timed("directions"):
+                    result = receptionist.navigate(user_query)
+                REQUEST_SECONDS.observe(time.perf_counter() - start, intent="directions")
+                yield sse_event('done', {
+                    'response': result['response'],
+                    'map_image': result['map_image'],
+                    'intent': 'directions'
+                })
+            except Exception as e:
+                logger.error(f"Error handling directions: {e}")
+                ERRORS.inc(intent="directions")
+                yield sse_event('error', {
+                    'response': "Sorry, I had trouble getting those directions. Please try again.",
+                    'map_image': None,
+                    'intent': 'directions'
+                })
+            return
+
+        if not rag_warmup.ready:
+            yield sse_event('error', WARMING_UP)
+            return
+
+        sources = []
+        first_token_ms = None
+        try:
+            for event in library_rag.stream_query(user_query, get_rag_chat_history(chat_history)):
+                if event['type'] == 'sources':
+                    sources = event['sources']
+                    yield sse_event('sources', {'sources': sources})
+                elif event['type'] == 'token':
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - start) * 1000
+                    yield sse_event('token', {'text': event['text']})
+                elif event['type'] == 'done':
+                    REQUEST_SECONDS.observe(time.perf_counter() - start, intent="information")
+                    yield sse_event('done', {
+                        'response': event['answer'],
+                        'map_image': None,
+                        'intent': 'information',
+                        'sources': sources,
+                        'time_to_first_token_ms': first_token_ms,
+                        'total_ms': (time.perf_counter() - start) * 1000
+                    })
+        except Exception as e:
+            logger.error(f"Error streaming information query: {e}")
+            ERRORS.inc(intent="information")
+            yield sse_event('error', {
+                'response': "Sorry, I had trouble finding that information. Please try again.",
+                'map_image': None,
+                'intent': 'information'
+            })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/intent/stats', methods=['GET'])
+def intent_stats():
+    """Report local intent classifier hit and LLM fallback rates"""
+    return jsonify(intent_classifier.get_stats())
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report answer cache hit ratio and latency saved"""
+    if not library_rag.answer_cache:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **library_rag.answer_cache.get_stats()})
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the server is up; directions can be served even while RAG is warming"""
+    return jsonify({
+        'status': 'ok',
+        'uptime_seconds': time.perf_counter() - STARTED,
+        'startup': startup.get_stats()
+    })
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: 200 once the library index is built, 503 while it is still warming up"""
+    stats = rag_warmup.get_stats()
+    return jsonify({'status': 'ready' if stats['ready'] else 'warming_up', **stats}), 200 if stats['ready'] else 503
+
+def admin_allowed() -> bool:
+    """Admin calls need ADMIN_TOKEN in X-Admin-Token if it is set, and otherwise must come from this machine"""
+    token = os.getenv('ADMIN_TOKEN')
+    if token:
+        return request.headers.get('X-Admin-Token') == token
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+@app.route('/api/admin/index', methods=['GET'])
+def index_status():
+    """Report the live snapshot and reload history"""
+    if not admin_allowed():
+        return jsonify({'error': 'forbidden'}), 403
+    return jsonify({'ready': rag_warmup.ready, **library_rag.get_index_stats()})
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_index():
+    """Index a snapshot (the latest finished crawl by default) in the background and swap it in"""
+    if not admin_allowed():
+        return jsonify({'error': 'forbidden'}), 403
+    if not rag_warmup.ready:
+        return jsonify({'error': 'the index is still warming up'}), 503
+    if library_rag.get_index_stats()['reloading']:
+        return jsonify({'error': 'a reload is already running', **library_rag.get_index_stats()}), 409
+
+    name = (request.get_json(silent=True) or {}).get('snapshot')
+    try:
+        snapshot_dir = library_rag.latest_snapshot_dir(complete=not name)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    if name:
+        snapshot_dir = snapshot_dir.parent / name
+        if Path(name).name != name or not snapshot_dir.is_dir():
+            return jsonify({'error': f"unknown snapshot: {name}"}), 404
+    if snapshot_dir == library_rag.snapshot_dir:
+        return jsonify({'status': 'current', **library_rag.get_index_stats()})
+
+    def run():
+        try:
+            library_rag.reload(snapshot_dir)
+        except Exception as e:
+            logger.error(f"Reloading {snapshot_dir.name} failed: {e}")
+
+    threading.Thread(target=run, name="index-reload", daemon=True).start()
+    return jsonify({'status': 'reloading', 'target': snapshot_dir.name, **library_rag.get_index_stats()}), 202
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Per-stage latency histograms and counters in Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5050)
\ No newline at end of file
+    # The debug reloader imports this module in a watcher process and a serving
+    # child; only the child (WERKZEUG_RUN_MAIN) builds the index
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        rag_warmup.start()
+    startup.mark('listening')
+    app.run(debug=True, port=5050)
+else:
+    # Imported by a WSGI server
+    rag_warmup.start()
\ No newline at end of file
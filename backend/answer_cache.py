@@ -0,0 +1,157 @@
+# answer_cache.py
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+
+# Query vectors of recent misses kept for put(), so an answered question is embedded once
+PENDING_VECTORS = 256
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        similarity_threshold: Optional[float] = None,
+        embed: Optional[Callable[[str], List[float]]] = None
+    ):
+        """
+        LRU + TTL cache of RAG answers for standalone questions
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Age after which an entry is no longer served
+            similarity_threshold: Cosine similarity for a semantic hit; None disables it
+            embed: Function embedding a question, required for semantic hits
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold if embed else None
+        self.embed = embed
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Index generation the entries were computed on; see clear()
+        self.generation = 0
+        # Vectors computed by get() for questions not answered yet, oldest first
+        self._pending_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, question: str) -> Optional[Dict[str, Any]]:
+        """Cached result for the question, or None"""
+        key = normalize_question(question)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry["created"] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                self.saved_seconds += entry["cost"]
+                return entry["result"]
+
+        vector = self._embed(key) if self.similarity_threshold is not None else None
+        if vector is not None:
+            with self._lock:
+                best_key, best_score = None, self.similarity_threshold
+                for other_key, other in self._entries.items():
+                    if now - other["created"] > self.ttl_seconds or other["vector"] is None:
+                        continue
+                    score = float(np.dot(vector, other["vector"]))
+                    if score >= best_score:
+                        best_key, best_score = other_key, score
+                if best_key is not None:
+                    entry = self._entries[best_key]
+                    self._entries.move_to_end(best_key)
+                    self.semantic_hits += 1
+                    self.saved_seconds += entry["cost"]
+                    return entry["result"]
+                self._pending_vectors[key] = vector
+                self._pending_vectors.move_to_end(key)
+                while len(self._pending_vectors) > PENDING_VECTORS:
+                    self._pending_vectors.popitem(last=False)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, question: str, result: Dict[str, Any], cost: float = 0.0, generation: Optional[int] = None):
+        """
+        Store a result along with the seconds it took to compute
+
+        Args:
+            generation: Index generation the result was computed on; it is dropped
+                if the cache has been cleared for a newer one meanwhile
+        """
+        key = normalize_question(question)
+        vector = None
+        if self.similarity_threshold is not None:
+            # The miss that led here usually embedded the question already
+            with self._lock:
+                vector = self._pending_vectors.pop(key, None)
+            if vector is None:
+                # Without a vector the entry still serves exact hits
+                vector = self._embed(key)
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = {
+                "result": result,
+                "created": time.time(),
+                "cost": cost,
+                "vector": vector
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, generation: Optional[int] = None):
+        """Drop every entry, e.g. after the index is rebuilt; results of older generations are no longer stored"""
+        with self._lock:
+            self._entries.clear()
+            self._pending_vectors.clear()
+            if generation is not None:
+                self.generation = generation
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit ratio and latency saved since startup"""
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / total if total else 0.0,
+                "saved_seconds": self.saved_seconds
+            }
+
+    def _embed(self, key: str) -> Optional[np.ndarray]:
+        """Unit query vector, or None if embedding failed; semantic hits are only an optimisation"""
+        try:
+            return self._unit(self.embed(key))
+        except Exception as e:
+            self.logger.warning(f"Embedding for the answer cache failed, skipping semantic lookup: {e}")
+            return None
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
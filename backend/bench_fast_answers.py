@@ -0,0 +1,63 @@
+# bench_fast_answers.py
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from library_rag import LibraryRAG
+
+QUESTIONS_FILE = Path(__file__).parent / "fast_answer_questions.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coverage, precision and latency of fact-based answers")
+    parser.add_argument("--data-dir", default="library_data")
+    parser.add_argument("--questions", default=str(QUESTIONS_FILE))
+    parser.add_argument("--rag", action="store_true", help="Also time the same questions through retrieval and the LLM")
+    parser.add_argument("--verbose", action="store_true", help="Print every question's outcome")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    rag = LibraryRAG(data_dir=args.data_dir, cache_size=0)
+    rag.create_vectorstore()
+    if not rag.fast_answers:
+        raise SystemExit("The latest snapshot has no facts.json; run web_scraping/fact_extractor.py on it first")
+
+    answerable = [item for item in questions if item["expected_urls"]]
+    correct = wrong = 0
+    latencies = []
+    for item in questions:
+        start = time.perf_counter()
+        result = rag.fast_answers.answer(item["question"])
+        latencies.append((time.perf_counter() - start) * 1e6)
+        # An answer is right if it cites a page the question is about; questions with no expected pages should fall back
+        right = bool(result) and any(
+            fragment in source["url"] for source in result["sources"] for fragment in item["expected_urls"]
+        )
+        correct += right
+        wrong += bool(result) and not right
+        if args.verbose:
+            outcome = "rag" if result is None else ("ok" if right else "WRONG")
+            print(f"  {outcome:>5}  {item['question']}")
+
+    answered = correct + wrong
+    print(f"\n{len(questions)} questions, {len(answerable)} answerable from facts")
+    print(f"coverage   {correct / len(answerable):.2f} of answerable questions answered correctly")
+    print(f"precision  {correct / answered if answered else 0:.2f} of fact answers correct ({wrong} wrong)")
+    print(f"latency    p50 {statistics.median(latencies):.0f}us, max {max(latencies):.0f}us per question")
+
+    if args.rag:
+        rag.fast_answers = None
+        rag.setup_qa_chain()
+        rag_latencies = []
+        for item in answerable:
+            start = time.perf_counter()
+            rag.query(item["question"])
+            rag_latencies.append((time.perf_counter() - start) * 1000)
+        print(f"rag        p50 {statistics.median(rag_latencies):.0f}ms per answerable question")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_fuzzy_index.py
+import random
+import statistics
+import string
+import time
+from difflib import get_close_matches
+from fuzzy_index import FuzzyIndex
+
+WORDS = [
+    "north", "south", "east", "west", "tower", "reading", "room", "study", "collection", "library",
+    "lab", "media", "center", "office", "lounge", "stacks", "archive", "seminar", "gallery", "commons",
+    "music", "maps", "periodicals", "reference", "government", "special", "rare", "books", "project", "quiet",
+]
+
+
+def catalog(size: int, seed: int = 0):
+    """Building-wide room names: numbered rooms plus named spaces"""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < size:
+        if rng.random() < 0.5:
+            names.add(f"Room {rng.randint(1000, 5999)}")
+        else:
+            names.add(" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title())
+    return sorted(names)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Drop, double or replace one character"""
+    i = rng.randrange(len(name))
+    edit = rng.choice(("drop", "double", "replace"))
+    if edit == "drop":
+        return name[:i] + name[i + 1:]
+    if edit == "double":
+        return name[:i] + name[i] + name[i:]
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def main(queries: int = 300):
+    rng = random.Random(1)
+    print("Lookups of one-typo room names; 'found' counts the intended name ranked first (and in the top 5)")
+    print(f"{'names':>7}{'difflib ms':>12}{'found':>8}{'index ms':>10}{'p99 ms':>8}{'found':>8}{'top 5':>7}")
+    for size in (100, 1000, 5000):
+        names = catalog(size)
+        lowered = {name.lower(): name for name in names}
+        index = FuzzyIndex((name, name) for name in names)
+        targets = [rng.choice(names) for _ in range(queries)]
+        sample = [typo(target, rng).lower() for target in targets]
+
+        start = time.perf_counter()
+        previous = [get_close_matches(query, lowered.keys(), n=1, cutoff=0.6) for query in sample]
+        difflib_ms = (time.perf_counter() - start) * 1000 / queries
+        difflib_found = sum(1 for target, old in zip(targets, previous) if old and lowered[old[0]] == target)
+
+        samples, found, top5 = [], 0, 0
+        for target, query in zip(targets, sample):
+            begin = time.perf_counter()
+            candidates = index.search(query, limit=5, cutoff=0.55)
+            samples.append((time.perf_counter() - begin) * 1000)
+            ranked = [candidate.name for candidate in candidates]
+            found += ranked[:1] == [target]
+            top5 += target in ranked
+        samples.sort()
+        print(f"{size:>7}{difflib_ms:>12.3f}{difflib_found:>8}{statistics.mean(samples):>10.3f}"
+              f"{samples[int(len(samples) * 0.99)]:>8.3f}{found:>8}{top5:>7}")
+
+
+if __name__ == "__main__":
+    main()
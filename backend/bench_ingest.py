@@ -0,0 +1,65 @@
+# bench_ingest.py
+import argparse
+import json
+from library_rag import LibraryRAG
+from bench_retrieval import QUESTIONS_FILE, evaluate
+
+
+def index_stats(rag: LibraryRAG) -> dict:
+    """Size of the index built from the configured pages, without embedding anything"""
+    documents = rag.process_library_data()
+    chunks = rag.build_chunks(documents)
+    dimensions = len(rag.embeddings.embed_query("library"))
+    chars = sum(len(chunk["text"]) for chunk in chunks)
+    return {
+        "documents": len(documents),
+        "chunks": len(chunks),
+        "chars": chars,
+        # About four characters per token for English text
+        "tokens": chars // 4,
+        "vector_bytes": len(chunks) * dimensions * 2
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the index built from raw pages and from cleaned pages")
+    parser.add_argument("--data-dir", default="library_data")
+    parser.add_argument("--questions", default=str(QUESTIONS_FILE))
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--retrieval", action="store_true", help="Also embed both indexes and compare hit rate and MRR")
+    args = parser.parse_args()
+
+    rags = {
+        "raw": LibraryRAG(data_dir=args.data_dir, cache_size=0, use_processed=False),
+        "cleaned": LibraryRAG(data_dir=args.data_dir, cache_size=0, use_processed=True),
+    }
+    snapshot = rags["cleaned"].latest_snapshot_dir()
+    if rags["cleaned"].pages_dir(snapshot).name != "processed":
+        raise SystemExit(f"No cleaned pages in {snapshot}; run: python ../web_scraping/page_cleaner.py {snapshot}")
+
+    stats = {name: index_stats(rag) for name, rag in rags.items()}
+    print(f"\n{'':<14}{'raw':>12}{'cleaned':>12}{'smaller':>10}")
+    for key, label in [("documents", "documents"), ("chunks", "chunks"), ("chars", "chunk chars"),
+                       ("tokens", "embed tokens"), ("vector_bytes", "float16 bytes")]:
+        before, after = stats["raw"][key], stats["cleaned"][key]
+        print(f"{label:<14}{before:>12,}{after:>12,}{1 - after / before:>10.1%}")
+
+    if args.retrieval:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = json.load(f)
+        print(f"\n{len(questions)} questions, top {args.k} chunks, hybrid retrieval")
+        print(f"{'pages':<10}{'hit@1':>8}{'hit@k':>8}{'MRR':>8}")
+        for name, rag in rags.items():
+            # An in-memory index per variant, so neither reuses the other's vectors
+            rag.persist_dir = None
+            rag.index_backend = "numpy"
+            rag.create_vectorstore()
+            ranks, _ = evaluate(rag.build_retriever("hybrid", k=args.k), questions)
+            hit1 = sum(rank == 1 for rank in ranks) / len(ranks)
+            hitk = sum(rank is not None for rank in ranks) / len(ranks)
+            mrr = sum(1 / rank for rank in ranks if rank) / len(ranks)
+            print(f"{name:<10}{hit1:>8.2f}{hitk:>8.2f}{mrr:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
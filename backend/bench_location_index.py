@@ -0,0 +1,91 @@
+# bench_location_index.py
+import random
+import statistics
+import time
+from location_index import LocationIndex, DESCRIPTOR, FEATURE, NEARBY
+from phrase_matcher import PhraseMatcher
+from Main_Graph import ReceptionistSystem, LOST_USER_WEIGHTS
+
+QUERIES = [
+    "i'm lost, i see glass walls and a whiteboard near some study tables",
+    "there are lots of computers and printers around me, and a help desk",
+    "i see bookshelves and comfortable seating, it's quiet here",
+    "i'm near the stairs next to a service desk with self-checkout stations",
+    "there's a microphone and soundproof walls, near the information commons",
+]
+WORDS = [
+    "glass", "wooden", "quiet", "large", "small", "blue", "red", "study", "reading", "group",
+    "carrels", "tables", "chairs", "lamps", "windows", "shelves", "maps", "posters", "screens", "desks",
+    "printers", "scanners", "lockers", "plants", "sofas", "whiteboards", "murals", "clocks", "signs", "benches",
+]
+
+
+def nested_loops(descriptors, features, description):
+    """Substring test for every descriptor and every feature and nearby phrase"""
+    scores = {}
+    for descriptor, locations in descriptors.items():
+        if descriptor in description:
+            for location in locations:
+                scores[location] = scores.get(location, 0.0) + LOST_USER_WEIGHTS[DESCRIPTOR]
+    for location, details in features.items():
+        for kind in (FEATURE, NEARBY):
+            for phrase in details[kind if kind == NEARBY else "features"]:
+                if phrase in description:
+                    scores[location] = scores.get(location, 0.0) + LOST_USER_WEIGHTS[kind]
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:3]
+
+
+def automaton_dict(matcher, description):
+    """One automaton scan, then a dict accumulation per match"""
+    scores = {}
+    seen = set()
+    for match in matcher.find_all(description):
+        if match.phrase in seen:
+            continue
+        seen.add(match.phrase)
+        for kind, value in match.entries:
+            for location in (value if kind == DESCRIPTOR else [value]):
+                scores[location] = scores.get(location, 0.0) + LOST_USER_WEIGHTS[kind]
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:3]
+
+
+def time_us(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for query in QUERIES:
+            fn(query)
+        samples.append((time.perf_counter() - start) * 1e6 / len(QUERIES))
+    return statistics.median(samples)
+
+
+def main(runs: int = 50):
+    receptionist = ReceptionistSystem()
+    print(f"{'places':>7}{'phrases':>9}{'nested loops us':>17}{'automaton us':>14}{'index us':>10}")
+
+    rng = random.Random(0)
+    for extra in (0, 1000, 10000):
+        # Made-up places with eight features each, standing in for many more floors
+        features = dict(receptionist.location_features)
+        for i in range(extra):
+            phrases = [" ".join(rng.sample(WORDS, rng.randint(2, 3))) for _ in range(8)]
+            features[f"place{i}"] = {"features": phrases[:5], "nearby": phrases[5:]}
+        descriptors = receptionist.area_descriptors
+
+        phrases = [(descriptor, DESCRIPTOR, locations) for descriptor, locations in descriptors.items()]
+        for location, details in features.items():
+            phrases += [(feature, FEATURE, location) for feature in details["features"]]
+            phrases += [(nearby, NEARBY, location) for nearby in details["nearby"]]
+        matcher = PhraseMatcher(phrases)
+        index = LocationIndex(
+            (phrase, value if kind == DESCRIPTOR else [value], LOST_USER_WEIGHTS[kind]) for phrase, kind, value in phrases
+        )
+
+        loops = time_us(lambda query: nested_loops(descriptors, features, query), runs)
+        automaton = time_us(lambda query: automaton_dict(matcher, query), runs)
+        indexed = time_us(lambda query: index.rank(query, limit=3), runs)
+        print(f"{len(features):>7}{len(phrases):>9}{loops:>17.1f}{automaton:>14.1f}{indexed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_map_render.py
+import base64
+import statistics
+import time
+from io import BytesIO
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from Main_Graph import ReceptionistSystem
+
+
+def render_full_figure(receptionist, path):
+    """Previous per-request rendering: redraw the whole pyplot figure and save it"""
+    floor_plan = receptionist.floors[receptionist.floor_plan["nodes"][path[0]]["floor"]]
+    plt.figure(figsize=(15, 10))
+    for edge in floor_plan["edges"]:
+        start = floor_plan["nodes"][edge["from"]]
+        end = floor_plan["nodes"][edge["to"]]
+        plt.plot([start["x"], end["x"]], [start["y"], end["y"]], 'k-', linewidth=1, alpha=0.5)
+    plt.axhline(y=400, color='gray', linestyle='--', alpha=0.3)
+    for node in floor_plan["nodes"].values():
+        color = "red" if node is floor_plan["nodes"][path[-1]] else node.get("color", "lightgray")
+        plt.plot(node["x"], node["y"], 'o', color=color, markersize=12)
+        va = 'bottom' if node["y"] > 400 else 'top'
+        plt.text(node["x"] + 5, node["y"], node["label"], fontsize=8, ha='left', va=va)
+    for a, b in zip(path, path[1:]):
+        start, end = floor_plan["nodes"][a], floor_plan["nodes"][b]
+        plt.plot([start["x"], end["x"]], [start["y"], end["y"]], 'r-', linewidth=2)
+    plt.title("Library Floor Plan Navigation")
+    plt.grid(True)
+    plt.axis('equal')
+    plt.xlim(50, 800)
+    plt.ylim(150, 650)
+    buf = BytesIO()
+    plt.savefig(buf, format='png', bbox_inches='tight')
+    plt.close()
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+def time_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main(runs: int = 30):
+    start = time.perf_counter()
+    receptionist = ReceptionistSystem()
+    print(f"Startup (route table + base map): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    destination = "referenceCollection"
+    path = receptionist.route_table.path("mainEntrance", destination)
+
+    results = {
+        "full figure per request": time_ms(lambda: render_full_figure(receptionist, path), runs),
+        "cached base + overlay": time_ms(
+            lambda: receptionist.map_renderer.render_base64(path, destination), runs
+        ),
+    }
+
+    print(f"\nPer-request map render time over {runs} runs:")
+    for name, samples in results.items():
+        print(f"  {name:<25} mean {statistics.mean(samples):7.1f} ms   "
+              f"p50 {statistics.median(samples):7.1f} ms   max {max(samples):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_phrase_matcher.py
+import random
+import statistics
+import string
+import time
+from phrase_matcher import PhraseMatcher, ALIAS
+from location_index import DESCRIPTOR, FEATURE, NEARBY
+from Main_Graph import ReceptionistSystem
+
+QUERIES = [
+    "how do i get from the help desk to the book nook",
+    "i'm at circulation, how do i get to periodicals?",
+    "directions to room 3370 from the music collection",
+    "i'm lost, i see glass walls and a whiteboard near some study tables",
+    "where can i find the government documents in the lower level",
+]
+
+
+def scan_loops(aliases, descriptors, features, query):
+    """Previous approach: one `in` test per phrase, per from/to pattern and per pass"""
+    found = []
+    for pattern in ["to", "find", "reach", "get to", "from", "at", "in", "near"]:
+        if pattern in query:
+            part = query[query.index(pattern) + len(pattern):]
+            found += [alias for alias in aliases if alias in part]
+    found += [alias for alias in aliases if alias in query]
+    found += [descriptor for descriptor in descriptors if descriptor in query]
+    for details in features.values():
+        found += [phrase for phrase in details["features"] + details["nearby"] if phrase in query]
+    return found
+
+
+def time_us(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for query in QUERIES:
+            fn(query)
+        samples.append((time.perf_counter() - start) * 1e6 / len(QUERIES))
+    return statistics.median(samples)
+
+
+def main(runs: int = 200):
+    receptionist = ReceptionistSystem()
+    print(f"{len(receptionist.phrase_matcher)} place phrases on {len(receptionist.floors)} floors")
+    print(f"{'extra aliases':>14}{'phrases':>10}{'in loops (us/query)':>22}{'automaton (us/query)':>23}")
+
+    rng = random.Random(0)
+    for extra in (0, 1000, 10000):
+        # Made-up room names standing in for more floors and rooms
+        aliases = dict(receptionist.room_aliases)
+        while len(aliases) < len(receptionist.room_aliases) + extra:
+            name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+            aliases[f"{name} room"] = "mainEntrance"
+
+        phrases = [(alias, ALIAS, room_id) for alias, room_id in aliases.items()]
+        phrases += [(descriptor, DESCRIPTOR, locations) for descriptor, locations in receptionist.area_descriptors.items()]
+        for location, details in receptionist.location_features.items():
+            phrases += [(feature, FEATURE, location) for feature in details["features"]]
+            phrases += [(nearby, NEARBY, location) for nearby in details["nearby"]]
+        matcher = PhraseMatcher(phrases)
+
+        loops = time_us(lambda query: scan_loops(
+            aliases, receptionist.area_descriptors, receptionist.location_features, query
+        ), runs)
+        automaton = time_us(matcher.find_all, runs)
+        print(f"{extra:>14}{len(matcher):>10}{loops:>22.1f}{automaton:>23.1f}")
+
+
+if __name__ == "__main__":
+    main()
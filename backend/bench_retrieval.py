@@ -0,0 +1,67 @@
+# bench_retrieval.py
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from library_rag import LibraryRAG
+
+QUESTIONS_FILE = Path(__file__).parent / "retrieval_questions.json"
+
+
+def first_relevant_rank(documents, expected_urls):
+    """1-based rank of the first document whose URL contains an expected fragment, or None"""
+    for rank, doc in enumerate(documents, 1):
+        url = doc.metadata.get("url", "")
+        if any(fragment in url for fragment in expected_urls):
+            return rank
+    return None
+
+
+def evaluate(retriever, questions, context_chars=None):
+    ranks, latencies = [], []
+    for item in questions:
+        start = time.perf_counter()
+        documents = retriever.get_relevant_documents(item["question"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        ranks.append(first_relevant_rank(documents, item["expected_urls"]))
+        if context_chars is not None:
+            context_chars.append(sum(len(doc.page_content) for doc in documents))
+    return ranks, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hit rate and MRR of the retrieval modes")
+    parser.add_argument("--data-dir", default="library_data")
+    parser.add_argument("--questions", default=str(QUESTIONS_FILE))
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--verbose", action="store_true", help="Print the rank of every question")
+    parser.add_argument("--routed", action="store_true", help="Also evaluate each mode with category routing")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    rag = LibraryRAG(data_dir=args.data_dir, cache_size=0)
+    rag.create_vectorstore()
+
+    print(f"\n{len(questions)} questions, top {args.k} chunks per question")
+    print(f"{'mode':<12}{'hit@1':>8}{'hit@k':>8}{'MRR':>8}{'p50':>10}{'context':>10}")
+    variants = [(mode, rag.build_retriever(mode, k=args.k)) for mode in LibraryRAG.RETRIEVAL_MODES]
+    if args.routed:
+        variants += [(f"{mode}+cat", rag.build_routed_retriever(mode, k=args.k)) for mode in LibraryRAG.RETRIEVAL_MODES]
+    for mode, retriever in variants:
+        context_chars = []
+        ranks, latencies = evaluate(retriever, questions, context_chars)
+        hit1 = sum(rank == 1 for rank in ranks) / len(ranks)
+        hitk = sum(rank is not None for rank in ranks) / len(ranks)
+        mrr = sum(1 / rank for rank in ranks if rank) / len(ranks)
+        print(f"{mode:<12}{hit1:>8.2f}{hitk:>8.2f}{mrr:>8.3f}{statistics.median(latencies):>8.1f}ms"
+              f"{statistics.mean(context_chars):>10.0f}")
+        if args.verbose:
+            for item, rank in zip(questions, ranks):
+                print(f"    {rank or '-':>3}  {item['question']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_routing.py
+import argparse
+import random
+import statistics
+import time
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from floor_graph import FloorGraph
+
+
+def synthetic_building(levels: int, side: int, spacing: float = 20.0, seed: int = 0):
+    """Floors of side x side corridor grids, linked by stairs in two corners and a central elevator"""
+    rng = random.Random(seed)
+    floors = []
+    for level in range(levels):
+        nodes, edges = {}, []
+        for i in range(side):
+            for j in range(side):
+                nodes[f"f{level}_{i}_{j}"] = {"x": i * spacing, "y": j * spacing, "label": f"{level}/{i}/{j}"}
+                # Corridors are never shorter than the straight line, a few are much longer
+                if i:
+                    edges.append({"from": f"f{level}_{i - 1}_{j}", "to": f"f{level}_{i}_{j}",
+                                  "weight": spacing * rng.uniform(1.0, 1.5)})
+                if j:
+                    edges.append({"from": f"f{level}_{i}_{j - 1}", "to": f"f{level}_{i}_{j}",
+                                  "weight": spacing * rng.uniform(1.0, 1.5)})
+        floors.append({"id": str(level), "level": level, "nodes": nodes, "edges": edges})
+
+    last, mid = side - 1, side // 2
+    connectors = [
+        {"type": "stairs", "per_floor": 120, "nodes": [f"f{level}_0_0" for level in range(levels)]},
+        {"type": "stairs", "per_floor": 120, "nodes": [f"f{level}_{last}_{last}" for level in range(levels)]},
+        {"type": "elevator", "wait": 60, "per_floor": 100, "nodes": [f"f{level}_{mid}_{mid}" for level in range(levels)]},
+    ]
+    return floors, connectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time A* routes across a synthetic multi-floor building")
+    parser.add_argument("--levels", type=int, default=6)
+    parser.add_argument("--side", type=int, default=25, help="Grid nodes along each side of a floor")
+    parser.add_argument("--routes", type=int, default=2000)
+    args = parser.parse_args()
+
+    floors, connectors = synthetic_building(args.levels, args.side)
+    start = time.perf_counter()
+    graph = FloorGraph(floors, connectors)
+    build_ms = (time.perf_counter() - start) * 1000
+    n = len(graph)
+    csr_bytes = graph.indptr.nbytes + graph.indices.nbytes + graph.weights.nbytes + graph.edge_types.nbytes
+    print(f"{n} nodes, {len(graph.indices) // 2} edges on {args.levels} floors; "
+          f"built in {build_ms:.1f} ms, CSR arrays {csr_bytes / 1024:.0f} KiB")
+
+    rng = random.Random(1)
+    pairs = [tuple(rng.sample(range(n), 2)) for _ in range(args.routes)]
+    samples = []
+    results = []
+    for source, target in pairs:
+        begin = time.perf_counter()
+        results.append(graph.astar(source, target))
+        samples.append((time.perf_counter() - begin) * 1000)
+    samples.sort()
+    print(f"\nA* over {args.routes} random routes (uncached):")
+    print(f"  mean {statistics.mean(samples):.3f} ms   p50 {statistics.median(samples):.3f} ms   "
+          f"p99 {samples[int(len(samples) * 0.99)]:.3f} ms   max {samples[-1]:.3f} ms")
+
+    # Same routes from SciPy's Dijkstra, to check A* returns the shortest ones
+    matrix = csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n))
+    sources = sorted({source for source, _ in pairs[:200]})
+    distances = dijkstra(matrix, indices=sources)
+    row = {source: i for i, source in enumerate(sources)}
+    worst = max(
+        abs(result[0] - distances[row[source], target])
+        for (source, target), result in zip(pairs[:200], results[:200])
+    )
+    print(f"  largest difference from Dijkstra over 200 routes: {worst:.6f}")
+
+    print(f"\nAll-pairs table the previous RouteTable would precompute: "
+          f"{n * n * (np.dtype(np.float32).itemsize + np.dtype(np.int32).itemsize) / 2 ** 20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
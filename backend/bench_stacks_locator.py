@@ -0,0 +1,68 @@
+# bench_stacks_locator.py
+import itertools
+import random
+import statistics
+import string
+import time
+from stacks_locator import StacksLocator, normalize_call_number
+
+# One- and two-letter classes, A to ZZ
+CLASSES = list(string.ascii_uppercase) + ["".join(pair) for pair in itertools.product(string.ascii_uppercase, repeat=2)]
+
+
+def shelf_list(rows: int, seed: int = 0):
+    """Contiguous ranges, e.g. QA 1 - QA 13.99, QA 14 - QA 29.99, spread over every class"""
+    rng = random.Random(seed)
+    per_class = max(1, rows // len(CLASSES))
+    ranges = []
+    for letters in CLASSES:
+        starts = [1] + sorted(rng.sample(range(2, 10000), per_class - 1))
+        ends = [start - 1 for start in starts[1:]] + [9999]
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            ranges.append({"start": f"{letters}{start}", "end": f"{letters}{end}.99", "node": f"shelf{len(ranges)}", "label": f"Range {i}"})
+    rng.shuffle(ranges)
+    return ranges
+
+
+def call_number(rng: random.Random) -> str:
+    letters = rng.choice(CLASSES)
+    return f"{letters}{rng.randint(1, 9999)}.{rng.randint(1, 99)} .{rng.choice(string.ascii_uppercase)}{rng.randint(1, 999)} {rng.randint(1900, 2026)}"
+
+
+def linear_scan(ranges, call_number):
+    """Without an index: test every range"""
+    key = normalize_call_number(call_number)
+    for shelf in ranges:
+        if shelf.start <= key <= shelf.end:
+            return shelf
+    return None
+
+
+def main(queries: int = 2000, scans: int = 20):
+    rng = random.Random(1)
+    print(f"{'ranges':>8}{'build s':>9}{'bisect us':>11}{'p99 us':>8}{'scan us':>11}{'mismatches':>12}")
+    for rows in (1000, 100000, 500000):
+        ranges = shelf_list(rows)
+        start = time.perf_counter()
+        locator = StacksLocator(ranges)
+        build = time.perf_counter() - start
+
+        sample = [call_number(rng) for _ in range(queries)]
+        samples = []
+        found = []
+        for query in sample:
+            begin = time.perf_counter()
+            found.append(locator.locate(query))
+            samples.append((time.perf_counter() - begin) * 1e6)
+        samples.sort()
+
+        start = time.perf_counter()
+        scanned = [linear_scan(locator.shelves, query) for query in sample[:scans]]
+        scan_us = (time.perf_counter() - start) * 1e6 / scans
+        mismatches = sum(1 for a, b in zip(found, scanned) if a != b) + found.count(None)
+        print(f"{len(locator):>8}{build:>9.2f}{statistics.mean(samples):>11.2f}"
+              f"{samples[int(len(samples) * 0.99)]:>8.2f}{scan_us:>11.0f}{mismatches:>12}")
+
+
+if __name__ == "__main__":
+    main()
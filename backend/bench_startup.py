@@ -0,0 +1,81 @@
+# bench_startup.py
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+import requests
+
+DIRECTIONS_QUERY = "How do I get to the vocal booth?"
+INFORMATION_QUERY = "How do I print in the library?"
+
+
+def poll(check, timeout: float, interval: float = 0.05):
+    """Call check() until it returns a truthy value or the timeout passes; returns the value or None"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            result = check()
+            if result:
+                return result
+        except requests.RequestException:
+            pass
+        time.sleep(interval)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time from launching answer.py to its first responses")
+    parser.add_argument("--url", default="http://localhost:5050")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for the index to be ready")
+    args = parser.parse_args()
+
+    # Its own session, so the reloader's serving child is stopped with it
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "answer.py"],
+        cwd=Path(__file__).parent,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    try:
+        times = {}
+        if not poll(lambda: requests.get(f"{args.url}/healthz", timeout=1).ok, args.timeout):
+            raise SystemExit("The server never answered /healthz")
+        times["healthz"] = time.perf_counter() - started
+
+        chat = lambda query: requests.post(f"{args.url}/api/chat", json={"message": query}, timeout=30)
+        response = chat(DIRECTIONS_QUERY)
+        times["first directions answer"] = time.perf_counter() - started
+        print(f"Directions before the index is ready: HTTP {response.status_code}, intent {response.json().get('intent')}")
+
+        response = chat(INFORMATION_QUERY)
+        if response.status_code == 503:
+            times["information refused (warming up)"] = time.perf_counter() - started
+
+        if not poll(lambda: requests.get(f"{args.url}/readyz", timeout=1).ok, args.timeout, interval=0.25):
+            raise SystemExit("The index was not ready before the timeout")
+        times["readyz"] = time.perf_counter() - started
+        response = chat(INFORMATION_QUERY)
+        times["first information answer"] = time.perf_counter() - started
+        print(f"Information once ready: HTTP {response.status_code}")
+
+        server_times = requests.get(f"{args.url}/healthz", timeout=1).json()["startup"]
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+    print(f"\n{'seen by the client':<36}{'seconds':>10}")
+    for name, seconds in times.items():
+        print(f"{name:<36}{seconds:>10.2f}")
+    print(f"\n{'recorded by the serving process':<36}{'seconds':>10}")
+    for name, seconds in sorted(server_times.items(), key=lambda item: item[1]):
+        print(f"{name:<36}{seconds:>10.2f}")
+    print("\nBefore background warm-up, no request was answered until the index was ready (the readyz row).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# bench_vector_index.py
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from library_rag import LibraryRAG
+
+QUESTIONS_FILE = Path(__file__).parent / "retrieval_questions.json"
+BACKENDS = {
+    "chroma": {"index_backend": "chroma"},
+    "numpy-float16": {"index_backend": "numpy", "index_dtype": "float16"},
+    "numpy-int8": {"index_backend": "numpy", "index_dtype": "int8"},
+}
+
+
+def memory_kb():
+    """Resident and proportional set size of this process in kB (PSS counts shared pages once)"""
+    usage = {}
+    for path, keys in [("/proc/self/status", ("VmRSS",)), ("/proc/self/smaps_rollup", ("Pss",))]:
+        try:
+            with open(path) as f:
+                for line in f:
+                    name, _, value = line.partition(":")
+                    if name in keys:
+                        usage[name] = int(value.split()[0])
+        except OSError:
+            pass
+    if "VmRSS" not in usage:
+        import resource
+        usage["VmRSS"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+
+def run_worker(args):
+    """Open one index, time searches, then report memory once every worker is loaded"""
+    rss_before = memory_kb()["VmRSS"]
+    rag = LibraryRAG(data_dir=args.data_dir, cache_size=0, **BACKENDS[args.worker])
+    store = rag.open_vectorstore()
+    queries = np.load(args.queries)
+
+    similarity, mmr, top_ids = [], [], []
+    for _ in range(args.repeat):
+        for query in queries:
+            start = time.perf_counter()
+            documents = store.similarity_search_by_vector(query.tolist(), k=args.k)
+            similarity.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            store.max_marginal_relevance_search_by_vector(query.tolist(), k=args.k, fetch_k=2 * args.k)
+            mmr.append((time.perf_counter() - start) * 1000)
+    for query in queries:
+        documents = store.similarity_search_by_vector(query.tolist(), k=args.k)
+        top_ids.append([doc.metadata.get("content_hash") for doc in documents])
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+    usage = memory_kb()
+    print(json.dumps({
+        "similarity": similarity,
+        "mmr": mmr,
+        "top_ids": top_ids,
+        "rss_delta_kb": usage["VmRSS"] - rss_before,
+        "pss_kb": usage.get("Pss")
+    }), flush=True)
+
+
+def run_backend(name, args, queries_path):
+    """
+    Start args.workers processes on one backend and collect their results
+
+    Workers are started one after another so each times its queries alone,
+    and all stay alive until memory is measured.
+    """
+    command = [sys.executable, __file__, "--worker", name, "--queries", queries_path,
+               "--data-dir", args.data_dir, "--k", str(args.k), "--repeat", str(args.repeat)]
+    workers = []
+    for _ in range(args.workers):
+        worker = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        workers.append(worker)
+        while worker.stdout.readline().strip() != "ready":
+            if worker.poll() is not None:
+                raise RuntimeError(f"{name} worker exited with code {worker.returncode}")
+    results = []
+    for worker in workers:
+        worker.stdin.write("\n")
+        worker.stdin.flush()
+    for worker in workers:
+        results.append(json.loads(worker.stdout.readline()))
+        worker.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query latency and memory of the vector index backends")
+    parser.add_argument("--data-dir", default="library_data")
+    parser.add_argument("--k", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the question set per worker")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent processes holding each index open")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--queries", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    stores = {}
+    for name, options in BACKENDS.items():
+        rag = LibraryRAG(data_dir=args.data_dir, cache_size=0, **options)
+        rag.create_vectorstore()
+        stores[name] = rag.vectorstore
+
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        questions = [item["question"] for item in json.load(f)]
+    queries = np.asarray(rag.embeddings.embed_documents(questions), dtype=np.float32)
+    with tempfile.NamedTemporaryFile(suffix=".npy", delete=False) as f:
+        np.save(f, queries)
+        queries_path = f.name
+
+    # Exact float32 top-k over the embeddings Chroma stores, as the reference for every backend
+    stored = stores["chroma"].get(include=["embeddings", "metadatas"])
+    matrix = np.asarray(stored["embeddings"], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    hashes = [metadata["content_hash"] for metadata in stored["metadatas"]]
+    reference = [[hashes[i] for i in np.argsort(-(matrix @ (q / np.linalg.norm(q))), kind="stable")[:args.k]]
+                 for q in queries]
+
+    results = {}
+    try:
+        for name in BACKENDS:
+            results[name] = run_backend(name, args, queries_path)
+    finally:
+        Path(queries_path).unlink()
+
+    print(f"\n{len(questions)} queries x {args.repeat} passes, k={args.k}, {args.workers} worker processes per backend")
+    print(f"{'backend':<15}{'top-k p50':>11}{'p95':>9}{'mmr p50':>10}{'p95':>9}"
+          f"{'RSS/worker':>12}{'PSS total':>11}{'overlap':>9}")
+    for name, workers in results.items():
+        similarity = [ms for worker in workers for ms in worker["similarity"]]
+        mmr = [ms for worker in workers for ms in worker["mmr"]]
+        rss = statistics.mean(worker["rss_delta_kb"] for worker in workers) / 1024
+        pss = [worker["pss_kb"] for worker in workers]
+        pss_total = f"{sum(pss) / 1024:.0f} MB" if None not in pss else "n/a"
+        overlap = statistics.mean(
+            len(set(ids) & set(ref)) / len(ref) for ids, ref in zip(workers[0]["top_ids"], reference)
+        )
+        print(f"{name:<15}{np.percentile(similarity, 50):>9.2f}ms{np.percentile(similarity, 95):>7.2f}ms"
+              f"{np.percentile(mmr, 50):>8.2f}ms{np.percentile(mmr, 95):>7.2f}ms"
+              f"{rss:>9.0f} MB{pss_total:>11}{overlap:>9.2f}")
+    print("\nRSS/worker is the growth from opening the index and querying it; PSS total splits shared pages")
+    print("between the workers; overlap is the share of the exact float32 top-k each backend returns.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# category_router.py
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from text_match import compile_phrases
+
+# Phrasing that ties a question to one of the categories the scraper files pages under
+CATEGORY_PHRASES = {
+    "hours": {
+        "hours": 2.0,
+        "open": 1.5,
+        "opens": 1.5,
+        "opening": 1.5,
+        "close": 1.5,
+        "closes": 1.5,
+        "closed": 1.5,
+        "closing": 1.5,
+        "what time": 2.0,
+        "schedule": 1.0,
+        "weekend": 1.0,
+        "holiday": 1.0,
+        "24 hours": 2.0,
+    },
+    "contact": {
+        "contact": 2.0,
+        "phone": 2.0,
+        "phone number": 2.0,
+        "email": 2.0,
+        "call": 1.5,
+        "reach": 1.0,
+        "address": 1.0,
+        "librarian": 1.0,
+        "staff": 1.0,
+        "ask a librarian": 2.0,
+    },
+    "events": {
+        "event": 2.0,
+        "events": 2.0,
+        "exhibit": 2.0,
+        "exhibits": 2.0,
+        "exhibition": 2.0,
+        "exhibitions": 2.0,
+        "workshop": 1.5,
+        "workshops": 1.5,
+        "calendar": 1.5,
+        "happening": 1.0,
+    },
+    "services": {
+        "borrow": 1.5,
+        "renew": 1.5,
+        "checkout": 1.5,
+        "check out": 1.5,
+        "print": 1.5,
+        "printing": 1.5,
+        "scan": 1.5,
+        "scanning": 1.5,
+        "interlibrary loan": 2.0,
+        "request": 1.0,
+        "reserve": 1.0,
+        "course reserves": 2.0,
+        "equipment": 1.5,
+        "laptop": 1.5,
+        "service": 1.0,
+        "services": 1.0,
+    },
+}
+
+
+class CategoryRouter:
+    def __init__(self, threshold: float = 0.6, prior: float = 0.5):
+        """
+        Picks the page category a question targets, if it clearly targets one
+
+        Args:
+            threshold: Minimum confidence for the question to be narrowed to a category
+            prior: Smoothing mass that keeps single weak cues below the threshold
+        """
+        self.threshold = threshold
+        self.prior = prior
+        self.patterns = {category: compile_phrases(phrases) for category, phrases in CATEGORY_PHRASES.items()}
+
+        self._lock = threading.Lock()
+        self.routed = {category: 0 for category in CATEGORY_PHRASES}
+        self.unrouted = 0
+
+    def classify(self, query: str) -> Tuple[str, float]:
+        """Best matching category and its confidence in [0, 1]"""
+        text = query.lower()
+        scores = {
+            category: sum(CATEGORY_PHRASES[category][m] for m in pattern.findall(text))
+            for category, pattern in self.patterns.items()
+        }
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        best, runner_up = scores[ranked[0]], scores[ranked[1]]
+        return ranked[0], (best - runner_up) / (sum(scores.values()) + self.prior)
+
+    def route(self, query: str) -> Optional[str]:
+        """Category to search for the query, or None to search everything"""
+        category, confidence = self.classify(query)
+        with self._lock:
+            if confidence >= self.threshold:
+                self.routed[category] += 1
+                return category
+            self.unrouted += 1
+        return None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Questions narrowed to each category, and searched unfiltered"""
+        with self._lock:
+            routed, unrouted = dict(self.routed), self.unrouted
+        total = sum(routed.values()) + unrouted
+        return {
+            "threshold": self.threshold,
+            "total": total,
+            **routed,
+            "unrouted": unrouted,
+            "routed_rate": (total - unrouted) / total if total else 0.0,
+        }
+
+
+class CategoryRoutedRetriever(BaseRetriever):
+    """Searches only the question's category when the router is confident, and everything otherwise"""
+
+    router: Any
+    retrievers: Dict[str, BaseRetriever]
+    fallback: BaseRetriever
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        retriever = self.retrievers.get(self.router.route(query), self.fallback)
+        # The inner retriever is called without callbacks so retrieval is timed once
+        return retriever.get_relevant_documents(query)
@@ -0,0 +1,174 @@
+# fast_answers.py
+import json
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+from category_router import CATEGORY_PHRASES, CategoryRouter
+from hybrid_retrieval import tokenize
+
+# Written into each snapshot by the scraper's fact_extractor
+FACTS_FILE = "facts.json"
+# Questions are matched to a place by these words only together with more specific ones
+GENERIC_TOKENS = {
+    "a", "an", "the", "of", "and", "for", "at", "to", "in", "on", "us", "our", "about",
+    "library", "libraries", "northwestern", "contact", "staff", "hours", "visit", "plan",
+    "services", "service", "center", "information", "general",
+}
+# Question phrasing that names no place
+QUESTION_TOKENS = {
+    "what", "whats", "when", "where", "who", "whose", "which", "how", "is", "are", "do", "does", "can", "i",
+    "you", "me", "my", "we", "get", "find", "give", "tell", "please", "number", "time", "today", "it",
+}
+PHONE_DIGITS = re.compile(r"\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Router categories answered from facts; fact kinds use the same names
+KINDS = ("contact", "hours")
+
+
+def digits(phone: str) -> str:
+    return re.sub(r"\D", "", phone)[-10:]
+
+
+class FastAnswerStore:
+    def __init__(self, facts: List[Dict[str, Any]], router: Optional[CategoryRouter] = None, max_sentences: int = 2):
+        """
+        Contact and hours answers looked up without retrieval or the LLM
+
+        Facts come from the scraper's fact_extractor (facts.json in the
+        snapshot): sentences with phone numbers, emails or opening times, each
+        keyed by the place or service its page is about. A question is answered
+        when it asks for contact details or hours and names exactly one known
+        place, or quotes a known phone number or email address.
+
+        Args:
+            facts: Fact dicts ({'entity', 'aliases', 'kind', 'text', 'url', ...})
+            router: Classifies whether a question asks for contact details or hours
+            max_sentences: Fact sentences included in an answer
+        """
+        self.router = router or CategoryRouter()
+        self.max_sentences = max_sentences
+
+        # Facts by entity; titles such as "About the Music Library" and "Music Library"
+        # share their distinctive words and are one entity
+        self.facts: Dict[FrozenSet[str], Dict[str, List[Dict[str, Any]]]] = defaultdict(lambda: defaultdict(list))
+        self.names: Dict[FrozenSet[str], str] = {}
+        # Alias words -> (alias words, entity, whether the alias is the entity's own name)
+        self.aliases: Dict[str, List[tuple]] = defaultdict(list)
+        self.by_value: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.known_tokens = set(GENERIC_TOKENS) | QUESTION_TOKENS
+        for phrases in CATEGORY_PHRASES.values():
+            self.known_tokens.update(token for phrase in phrases for token in tokenize(phrase))
+        self.home = None
+
+        # Shallower pages first, so a place's own landing page is quoted before its subpages
+        for fact in sorted(facts, key=lambda fact: (fact["url"].count("/"), fact["url"])):
+            # An all-generic title ("Libraries" on the home page) is kept under its own words
+            key = self.entity_key(fact["entity"]) or frozenset(tokenize(fact["entity"]))
+            self.names.setdefault(key, fact["entity"])
+            if fact["text"] not in {f["text"] for f in self.facts[key][fact["kind"]]}:
+                self.facts[key][fact["kind"]].append(fact)
+            for alias in [fact["entity"]] + fact.get("aliases", []):
+                tokens = self.entity_key(alias)
+                entry = (tokens, key, tokens == key)
+                if tokens and entry not in self.aliases[min(tokens)]:
+                    self.aliases[min(tokens)].append(entry)
+            for email in fact.get("emails", []):
+                self.by_value[email.lower()].append(fact)
+            for phone in fact.get("phones", []):
+                self.by_value[digits(phone)].append(fact)
+            # The site's home page, the shallowest with contact details, has the general library contacts
+            if self.home is None and fact["kind"] == "contact":
+                self.home = key
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path, router: Optional[CategoryRouter] = None) -> Optional["FastAnswerStore"]:
+        """Store for a facts.json file, or None if the snapshot has none"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["facts"], router)
+
+    @staticmethod
+    def entity_key(name: str) -> FrozenSet[str]:
+        return frozenset(tokenize(name)) - GENERIC_TOKENS
+
+    def match_entities(self, tokens: FrozenSet[str]) -> List[FrozenSet[str]]:
+        """Entities with an alias whose distinctive words all appear in the question, best matches only"""
+        best: Dict[FrozenSet[str], tuple] = {}
+        for token in tokens:
+            for alias_tokens, key, is_name in self.aliases.get(token, []):
+                if alias_tokens <= tokens:
+                    # More matched words first, then a match on the entity's own name over a URL section
+                    best[key] = max(best.get(key, (0, False)), (len(alias_tokens), is_name))
+        if not best:
+            return []
+        top = max(best.values())
+        return [key for key, score in best.items() if score == top]
+
+    def answer_value(self, question: str) -> Optional[Dict[str, Any]]:
+        """Answer "whose number/email is ..." from a phone number or email quoted in the question"""
+        values = [email.lower() for email in EMAIL.findall(question)]
+        values += [digits(phone) for phone in PHONE_DIGITS.findall(question)]
+        for value in values:
+            facts = self.by_value.get(value)
+            if facts:
+                entity = facts[0]["entity"]
+                return self.format(self.names.get(self.entity_key(entity), entity), facts[:self.max_sentences])
+        return None
+
+    def format(self, entity: str, facts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        sources, seen = [], set()
+        for fact in facts:
+            if fact["url"] not in seen:
+                seen.add(fact["url"])
+                sources.append({"url": fact["url"], "category": fact.get("category", ""), "title": fact.get("title", "")})
+        return {
+            "answer": f"{entity}: " + " ".join(fact["text"] for fact in facts),
+            "sources": sources
+        }
+
+    def answer(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer built from stored facts, or None to fall back to retrieval and the LLM
+
+        Returns:
+            {"answer": ..., "sources": [...]} like LibraryRAG.query
+        """
+        result = self.answer_value(question)
+        if result is None:
+            kind, confidence = self.router.classify(question)
+            if kind in KINDS and confidence >= self.router.threshold:
+                tokens = frozenset(tokenize(question))
+                entities = self.match_entities(tokens)
+                # "How do I contact the library?" names no place, so it gets the general contacts
+                if not entities and kind == "contact" and self.home and tokens <= self.known_tokens:
+                    entities = [self.home]
+                # Two equally good places are ambiguous, which the LLM handles better
+                if len(entities) == 1 and self.facts[entities[0]][kind]:
+                    key = entities[0]
+                    result = self.format(self.names[key], self.facts[key][kind][:self.max_sentences])
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "total": total,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
@@ -0,0 +1,221 @@
+# floor_graph.py
+import heapq
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+FLOOR_PLANS_DIR = Path(__file__).resolve().parent / "floor_plans"
+
+WALK = "walk"
+EDGE_TYPES = (WALK, "stairs", "elevator")
+
+
+class FloorGraph:
+    def __init__(
+        self,
+        floors: List[dict],
+        connectors: List[dict] = (),
+        floor_height: float = 100.0,
+        landmarks: int = 8
+    ):
+        """
+        Building-wide routing graph with integer node ids and CSR adjacency
+
+        Every node gets a 3D position (x, y, level * floor_height). Walking
+        edges come from each floor; stairs and elevators in `connectors` link
+        floors. Stairs join consecutive nodes of their list at `per_floor` per
+        level climbed; an elevator joins every pair of its stops at `wait`
+        plus `per_floor` per level.
+
+        A* is guided by the larger of two lower bounds on the remaining cost:
+        the straight-line 3D distance, and the triangle-inequality bound from
+        route costs to a few landmark nodes (ALT). Routes between floors have
+        to detour through a staircase or elevator, which the straight line
+        does not see but the landmark bound does.
+
+        Args:
+            floors: Floor dicts with "id", "level", "nodes" and "edges"
+            connectors: Dicts with "type" ("stairs" or "elevator"), "nodes", "per_floor" and optional "wait"
+            floor_height: Graph units between two levels, used by the A* heuristic
+            landmarks: Number of landmark nodes; 0 uses the straight-line bound only
+        """
+        self.node_ids: List[str] = []
+        self.floor_of: List[str] = []
+        coords = []
+        for floor in floors:
+            z = floor["level"] * floor_height
+            for node_id, node in floor["nodes"].items():
+                self.node_ids.append(node_id)
+                self.floor_of.append(floor["id"])
+                coords.append((node["x"], node["y"], z))
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        if len(self.index) != len(self.node_ids):
+            duplicates = sorted(node_id for node_id, count in Counter(self.node_ids).items() if count > 1)
+            raise ValueError(f"Node ids used on more than one floor: {duplicates}")
+        self.coords = np.array(coords, dtype=np.float32).reshape(-1, 3)
+
+        # Keep the lightest weight if an edge is listed twice
+        edges: Dict[Tuple[int, int], Tuple[float, int]] = {}
+
+        def add(a: str, b: str, weight: float, edge_type: str):
+            for node_id in (a, b):
+                if node_id not in self.index:
+                    raise ValueError(f"Edge {a} - {b} names unknown node {node_id}")
+            u, v = self.index[a], self.index[b]
+            key = (min(u, v), max(u, v))
+            if weight < edges.get(key, (math.inf, 0))[0]:
+                edges[key] = (float(weight), EDGE_TYPES.index(edge_type))
+
+        for floor in floors:
+            for edge in floor["edges"]:
+                add(edge["from"], edge["to"], edge["weight"], WALK)
+        # Edges between floors, in the floor files' edge format, for anything that
+        # reads the building as an edge list rather than through this graph
+        self.connector_edges: List[dict] = []
+        levels = {floor["id"]: floor["level"] for floor in floors}
+        for connector in connectors:
+            stops = connector["nodes"]
+            for node_id in stops:
+                if node_id not in self.index:
+                    raise ValueError(f"Connector stop {node_id} is not a node")
+            climb = lambda a, b: abs(levels[self.floor_of[self.index[a]]] - levels[self.floor_of[self.index[b]]])
+            if connector["type"] == "elevator":
+                pairs = [(a, b) for i, a in enumerate(stops) for b in stops[i + 1:]]
+            else:
+                pairs = list(zip(stops, stops[1:]))
+            for a, b in pairs:
+                weight = connector.get("wait", 0) + connector["per_floor"] * climb(a, b)
+                add(a, b, weight, connector["type"])
+                self.connector_edges.append({"from": a, "to": b, "weight": weight, "type": connector["type"]})
+
+        # Both directions of every undirected edge, grouped by source node
+        n = len(self.node_ids)
+        keys = np.array(list(edges), dtype=np.int32).reshape(-1, 2)
+        values = np.array([weight for weight, _ in edges.values()], dtype=np.float32)
+        types = np.array([edge_type for _, edge_type in edges.values()], dtype=np.uint8)
+        sources = np.concatenate([keys[:, 0], keys[:, 1]])
+        targets = np.concatenate([keys[:, 1], keys[:, 0]])
+        order = np.argsort(sources, kind="stable")
+        self.indptr = np.searchsorted(sources[order], np.arange(n + 1)).astype(np.int32)
+        self.indices = targets[order].astype(np.int32)
+        self.weights = np.concatenate([values, values])[order]
+        self.edge_types = np.concatenate([types, types])[order]
+
+        # A* stays optimal if the heuristic never exceeds the remaining cost, so
+        # straight-line 3D distance is scaled by the smallest weight per unit of
+        # length found on any edge (hand-drawn weights can be shorter than the line)
+        coords = self.coords.astype(np.float64)
+        lengths = np.linalg.norm(coords[self.indices] - np.repeat(coords, np.diff(self.indptr), axis=0), axis=1)
+        ratios = self.weights[lengths > 0].astype(np.float64) / lengths[lengths > 0]
+        # Shaved slightly so float32 rounding cannot make it overestimate
+        self.heuristic_scale = float(ratios.min()) * (1 - 1e-6) if len(ratios) else 0.0
+
+        # The search indexes these per step; Python lists are several times
+        # faster to index from Python than NumPy scalars
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._weights = self.weights.tolist()
+        # One row per axis, so the per-target distance is three contiguous array ops
+        self._scaled_coords = np.ascontiguousarray((coords * self.heuristic_scale).T)
+        self.landmark_distances = self._landmark_distances(landmarks)
+
+    def _landmark_distances(self, count: int) -> Optional[np.ndarray]:
+        """Route costs from `count` landmarks to every node, landmarks picked farthest-first"""
+        n = len(self.node_ids)
+        if count <= 0 or n == 0:
+            return None
+        matrix = csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+        # Spread out landmarks give the tightest bounds; start from the node farthest from node 0
+        reach = dijkstra(matrix, indices=0)
+        landmark = int(np.argmax(np.where(np.isfinite(reach), reach, -1)))
+        rows = []
+        nearest = np.full(n, np.inf)
+        for _ in range(min(count, n)):
+            row = dijkstra(matrix, indices=landmark)
+            rows.append(row)
+            nearest = np.minimum(nearest, row)
+            landmark = int(np.argmax(np.where(np.isfinite(nearest), nearest, -1)))
+        return np.array(rows)
+
+    def heuristic(self, target: int) -> List[float]:
+        """Lower bound on the route cost from every node to target"""
+        offsets = self._scaled_coords - self._scaled_coords[:, target, None]
+        bound = np.sqrt((offsets * offsets).sum(axis=0))
+        if self.landmark_distances is not None:
+            # |d(L, t) - d(L, v)| <= d(v, t); inf - inf gives NaN, which fmax ignores
+            with np.errstate(invalid="ignore"):
+                landmark_bound = np.abs(self.landmark_distances - self.landmark_distances[:, target, None]).max(axis=0)
+            bound = np.fmax(bound, landmark_bound)
+        return bound.tolist()
+
+    @classmethod
+    def load(cls, directory: Path = FLOOR_PLANS_DIR) -> Tuple["FloorGraph", dict, List[dict]]:
+        """Read building.json and its floor files; returns the graph, the building and the floors"""
+        directory = Path(directory)
+        with open(directory / "building.json", encoding="utf-8") as f:
+            building = json.load(f)
+        floors = []
+        for name in building["floors"]:
+            with open(directory / name, encoding="utf-8") as f:
+                floors.append(json.load(f))
+        graph = cls(floors, building.get("connectors", []), building.get("floor_height", 100.0))
+        return graph, building, floors
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def edge_type(self, a: str, b: str) -> Optional[str]:
+        """"walk", "stairs" or "elevator" for an edge, None if a and b are not adjacent"""
+        u, v = self.index[a], self.index[b]
+        start, end = self._indptr[u], self._indptr[u + 1]
+        for k in range(start, end):
+            if self._indices[k] == v:
+                return EDGE_TYPES[self.edge_types[k]]
+        return None
+
+    def astar(self, source: int, target: int) -> Optional[Tuple[float, List[int]]]:
+        """Cost and node indices of the shortest route, or None if target is unreachable"""
+        if source == target:
+            return 0.0, [source]
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        h = self.heuristic(target)
+
+        best = {source: 0.0}
+        parent = {source: -1}
+        closed = set()
+        heap = [(h[source], 0.0, source)]
+        while heap:
+            _, cost, u = heapq.heappop(heap)
+            if u == target:
+                path = [u]
+                while parent[u] != -1:
+                    u = parent[u]
+                    path.append(u)
+                path.reverse()
+                return cost, path
+            if u in closed:
+                continue
+            closed.add(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                new_cost = cost + weights[k]
+                if new_cost < best.get(v, math.inf):
+                    best[v] = new_cost
+                    parent[v] = u
+                    heapq.heappush(heap, (new_cost + h[v], new_cost, v))
+        return None
+
+    def route(self, start: str, goal: str) -> Optional[Tuple[float, List[str]]]:
+        """Cost and node ids of the shortest route between two node ids"""
+        if start not in self.index or goal not in self.index:
+            return None
+        result = self.astar(self.index[start], self.index[goal])
+        if result is None:
+            return None
+        cost, path = result
+        return cost, [self.node_ids[i] for i in path]
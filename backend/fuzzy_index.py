@@ -0,0 +1,87 @@
+# fuzzy_index.py
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Iterable, List, NamedTuple, Tuple
+import numpy as np
+
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+class Candidate(NamedTuple):
+    value: Any
+    name: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(NON_ALPHANUMERIC.sub(" ", text).split())
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of the normalized text, padded so word edges count"""
+    padded = f"  {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    def __init__(self, names: Iterable[Tuple[str, Any]]):
+        """
+        Character-trigram index over room names for typo-tolerant lookup
+
+        Each name is scored against a query by the Dice coefficient of their
+        trigram sets, 2|A∩B| / (|A| + |B|): 1.0 for the same name, falling
+        as characters are dropped, swapped or added. Overlaps are counted
+        from the postings of the query's trigrams only, so a lookup costs
+        about as much as the number of names sharing a trigram with it.
+
+        Args:
+            names: (name, value) pairs, e.g. (label or alias, node id); several
+                names may share a value
+        """
+        self.names: List[str] = []
+        self.values: List[Any] = []
+        postings = defaultdict(list)
+        sizes = []
+        for name, value in names:
+            grams = trigrams(name)
+            if not grams:
+                continue
+            name_id = len(self.names)
+            self.names.append(name)
+            self.values.append(value)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings[gram].append(name_id)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.sizes = np.array(sizes, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, cutoff: float = 0.0) -> List[Candidate]:
+        """Best-scoring names for query, one per value, highest score first"""
+        grams = trigrams(query)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return []
+        overlap = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        scores = 2 * overlap / (self.sizes + len(grams))
+
+        ranked = np.flatnonzero(scores >= max(cutoff, 1e-9))
+        ranked = ranked[np.argsort(-scores[ranked], kind="stable")]
+        candidates = []
+        seen = set()
+        for name_id in ranked:
+            value = self.values[name_id]
+            if value in seen:
+                continue
+            seen.add(value)
+            candidates.append(Candidate(value, self.names[name_id], float(scores[name_id])))
+            if len(candidates) == limit:
+                break
+        return candidates
@@ -0,0 +1,102 @@
+# hybrid_retrieval.py
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+# Keeps room numbers, phone number groups and email parts as their own tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    def __init__(self, texts: List[str], metadatas: List[Dict[str, Any]], k1: float = 1.5, b: float = 0.75):
+        """
+        In-process Okapi BM25 inverted index over text chunks
+
+        Args:
+            texts: Chunk texts
+            metadatas: Metadata for each chunk, returned with the documents
+            k1: Term frequency saturation
+            b: Document length normalisation
+        """
+        self.texts = texts
+        self.metadatas = metadatas
+        self.k1 = k1
+        self.b = b
+
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            self.doc_lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                self.postings[token].append((doc_id, tf))
+
+        n = len(texts)
+        self.avg_length = sum(self.doc_lengths) / n if n else 0.0
+        self.idf = {
+            token: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for token, docs in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (chunk index, score) pairs for the query"""
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[token]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def documents(self, query: str, k: int = 10) -> List[Document]:
+        return [Document(page_content=self.texts[i], metadata=self.metadatas[i])
+                for i, _ in self.search(query, k)]
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = 60) -> List[Document]:
+    """Merge ranked lists, scoring each document by the sum of 1 / (rrf_k + rank)"""
+    scores: Dict[str, float] = defaultdict(float)
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = doc.metadata.get("content_hash") or doc.page_content
+            scores[key] += 1.0 / (rrf_k + rank)
+            documents.setdefault(key, doc)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [documents[key] for key in ordered[:k]]
+
+
+class KeywordRetriever(BaseRetriever):
+    """BM25-only retriever"""
+
+    bm25: Any
+    k: int = 6
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.bm25.documents(query, self.k)
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuses vector retrieval with BM25 keyword retrieval by reciprocal rank fusion"""
+
+    vector_retriever: BaseRetriever
+    bm25: Any
+    k: int = 6
+    bm25_k: int = 12
+    rrf_k: int = 60
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # The inner retriever is called without callbacks so retrieval is timed once
+        vector_docs = self.vector_retriever.get_relevant_documents(query)
+        keyword_docs = self.bm25.documents(query, self.bm25_k)
+        return reciprocal_rank_fusion([vector_docs, keyword_docs], self.k, self.rrf_k)
@@ -0,0 +1,150 @@
+# intent_classifier.py
+import threading
+from typing import Callable, Dict, Tuple
+from stacks_locator import find_call_number
+from text_match import compile_phrases
+
+DIRECTIONS = "DIRECTIONS"
+INFORMATION = "INFORMATION"
+
+# Phrasing that almost always means the user wants to be walked somewhere
+DIRECTION_PHRASES = {
+    "how do i get to": 2.0,
+    "how do i get from": 2.0,
+    "how to get to": 2.0,
+    "how can i get to": 2.0,
+    "directions to": 2.0,
+    "direction to": 2.0,
+    "take me to": 2.0,
+    "show me the way": 2.0,
+    "way to": 1.5,
+    "where is": 1.5,
+    "where's": 1.5,
+    "where are": 1.0,
+    "how do i find": 1.5,
+    "where can i find": 1.5,
+    "call number": 2.0,
+    "shelved": 1.5,
+    "i'm lost": 2.0,
+    "im lost": 2.0,
+    "i am lost": 2.0,
+    "lost": 1.0,
+    "navigate": 1.5,
+    "located": 1.0,
+    "go to": 1.0,
+    "get to": 1.0,
+    "walk to": 1.5,
+    "find the": 1.0,
+    "which way": 1.5,
+    "nearest": 1.0,
+}
+
+# Phrasing that points at library facts rather than a place in the building
+INFORMATION_PHRASES = {
+    "hours": 2.0,
+    "open": 1.5,
+    "close": 1.5,
+    "closed": 1.5,
+    "closing": 1.5,
+    "when": 1.5,
+    "what time": 2.0,
+    "how long": 1.5,
+    "how many": 1.5,
+    "how much": 1.5,
+    "cost": 1.5,
+    "fee": 1.5,
+    "fine": 1.0,
+    "fines": 1.5,
+    "policy": 2.0,
+    "renew": 2.0,
+    "borrow": 1.0,
+    "checkout": 1.0,
+    "reserve": 1.5,
+    "book a": 1.5,
+    "contact": 1.5,
+    "phone": 1.5,
+    "email": 1.5,
+    "call": 1.0,
+    "who": 1.0,
+    "can i": 1.0,
+    "do you have": 1.5,
+    "is there": 0.5,
+    "what is": 1.0,
+    "what are": 1.0,
+    "tell me about": 2.0,
+    "events": 1.5,
+    "access": 1.0,
+    "wifi": 1.5,
+    "print": 1.0,
+    "printing": 1.0,
+    "services": 1.0,
+}
+
+# Mentioning a known place is a weak hint towards directions on its own
+PLACE_WEIGHT = 0.5
+# A call number almost always means "which shelf is this on"
+CALL_NUMBER_WEIGHT = 1.5
+
+
+class IntentClassifier:
+    def __init__(self, receptionist, threshold: float = 0.75, prior: float = 0.5):
+        """
+        Local DIRECTIONS/INFORMATION classifier used before falling back to the LLM
+
+        Args:
+            receptionist: ReceptionistSystem whose aliases and descriptors name known places
+            threshold: Minimum confidence for the local answer to be used
+            prior: Smoothing mass that keeps single weak cues below the threshold
+        """
+        self.threshold = threshold
+        self.prior = prior
+
+        places = list(receptionist.room_aliases.keys()) + list(receptionist.area_descriptors.keys())
+        self.direction_pattern = compile_phrases(DIRECTION_PHRASES)
+        self.information_pattern = compile_phrases(INFORMATION_PHRASES)
+        self.place_pattern = compile_phrases(place.lower() for place in places)
+
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.llm_fallbacks = 0
+
+    def classify(self, query: str) -> Tuple[str, float]:
+        """Return the locally predicted intent and its confidence in [0, 1]"""
+        text = query.lower()
+        direction_score = sum(DIRECTION_PHRASES[m] for m in self.direction_pattern.findall(text))
+        information_score = sum(INFORMATION_PHRASES[m] for m in self.information_pattern.findall(text))
+        if self.place_pattern.search(text):
+            direction_score += PLACE_WEIGHT
+        if find_call_number(text):
+            direction_score += CALL_NUMBER_WEIGHT
+
+        total = direction_score + information_score + self.prior
+        if direction_score > information_score:
+            return DIRECTIONS, (direction_score - information_score) / total
+        return INFORMATION, (information_score - direction_score) / total
+
+    def resolve(self, query: str, fallback: Callable[[str], str]) -> str:
+        """Classify locally, escalating to fallback when confidence is below threshold"""
+        intent, confidence = self.classify(query)
+        if confidence >= self.threshold:
+            with self._lock:
+                self.local_hits += 1
+            return intent
+
+        with self._lock:
+            self.llm_fallbacks += 1
+        return fallback(query)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit and fallback rates for tuning the threshold"""
+        with self._lock:
+            hits, fallbacks = self.local_hits, self.llm_fallbacks
+        total = hits + fallbacks
+        return {
+            "threshold": self.threshold,
+            "total": total,
+            "local_hits": hits,
+            "llm_fallbacks": fallbacks,
+            "hit_rate": hits / total if total else 0.0,
+            "fallback_rate": fallbacks / total if total else 0.0,
+        }
@@ -1,23 +1,97 @@
 # library_rag.py
-from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
-from langchain_openai import ChatOpenAI
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import ConversationalRetrievalChain
-from typing import List, Dict, Any
+from langchain_core.callbacks import BaseCallbackHandler
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+import copy
+import hashlib
+import threading
+import weakref
+from collections import defaultdict
 import json
+import time
 from pathlib import Path
 import logging
 import os
 from datetime import datetime
+import numpy as np
 from dotenv import load_dotenv
+from answer_cache import AnswerCache
+from category_router import CATEGORY_PHRASES, CategoryRoutedRetriever, CategoryRouter
+from fast_answers import FACTS_FILE, FastAnswerStore
+from hybrid_retrieval import BM25Index, HybridRetriever, KeywordRetriever
+from numpy_index import NumpyVectorStore
+from llm_backends import get_backend_name, get_chat_model, get_embeddings, OPENAI
+from metrics import STAGE_SECONDS, LLM_CALLS
+
+class LLMStageTimer(BaseCallbackHandler):
+    """Records the duration of every call made by one LLM as a request stage"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage=self.stage)
+        LLM_CALLS.inc(stage=self.stage)
+
+class RetrieverTimer(BaseCallbackHandler):
+    """Records the duration of vector retrieval inside a chain call"""
+
+    def __init__(self):
+        self._started = {}
+
+    def on_retriever_start(self, serialized, query, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage="retrieval")
 
 class LibraryRAG:
+    RETRIEVAL_MODES = ("hybrid", "mmr", "bm25")
+    INDEX_BACKENDS = ("chroma", "numpy")
+    # State built from one snapshot, replaced together when a new snapshot is swapped in
+    INDEX_ATTRIBUTES = ("vectorstore", "bm25", "category_bm25", "fast_answers", "qa_chain", "llm", "prompt", "snapshot_dir")
+
     def __init__(
         self,
         data_dir: str,
         chunk_size: int = 500,
-        chunk_overlap: int = 100
+        chunk_overlap: int = 100,
+        persist_dir: Optional[str] = "vector_index",
+        collection_name: str = "library_chunks",
+        cache_size: int = 512,
+        cache_ttl: float = 3600,
+        cache_similarity: Optional[float] = None,
+        retrieval_mode: str = "hybrid",
+        index_backend: str = "chroma",
+        index_dtype: str = "float16",
+        use_processed: bool = True,
+        category_routing: bool = True,
+        fast_answers: bool = True
     ):
         """
         Initialize the Library RAG system
@@ -26,18 +100,46 @@ class LibraryRAG:
             data_dir: Directory containing scraped library data
             chunk_size: Size of text chunks for processing
             chunk_overlap: Overlap between chunks
+            persist_dir: Directory for the on-disk vector index (None keeps it in memory)
+            collection_name: Name of the Chroma collection inside persist_dir; backends other
+                than OpenAI add their name, e.g. "library_chunks_local"
+            cache_size: Answers kept in the cache (0 disables caching)
+            cache_ttl: Seconds a cached answer stays valid
+            cache_similarity: Query-embedding cosine similarity for a cache hit (None for exact matches only)
+            retrieval_mode: "hybrid" (BM25 + vector, fused by reciprocal rank), "mmr" or "bm25"
+            index_backend: "chroma", or "numpy" for a memory-mapped matrix searched exactly
+            index_dtype: Storage type of the numpy backend, "float16" or "int8"
+            use_processed: Index the pages page_cleaner wrote to processed/ (boilerplate and
+                near-duplicates removed) when the snapshot has them, instead of raw/
+            category_routing: Search only the hours/contact/events/services chunks when a
+                question clearly asks about that category
+            fast_answers: Answer contact and hours questions that name one place from the
+                snapshot's facts.json, without retrieval or the LLM
         """
         # Load environment variables
         load_dotenv()
         
-        # Verify API key is available
+        # Verify API key is available (the local stand-in backend needs none)
         self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        if not self.api_key and get_backend_name() == OPENAI:
             raise ValueError("OPENAI_API_KEY not found in .env file")
             
         self.data_dir = Path(data_dir)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        # Vectors from different embedding backends must never be mixed; the default
+        # OpenAI backend keeps the unsuffixed name indexes were persisted under before
+        backend = get_backend_name()
+        self.collection_name = collection_name if backend == OPENAI else f"{collection_name}_{backend}"
+        if retrieval_mode not in self.RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode}")
+        self.retrieval_mode = retrieval_mode
+        if index_backend not in self.INDEX_BACKENDS:
+            raise ValueError(f"Unknown index backend: {index_backend}")
+        self.index_backend = index_backend
+        self.index_dtype = index_dtype
+        self.use_processed = use_processed
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -51,52 +153,85 @@ class LibraryRAG:
             separators=["\n\n", "\n", " ", ""]
         )
         
-        self.embeddings = OpenAIEmbeddings()
+        self.embeddings = get_embeddings()
         self.vectorstore = None
+        self.bm25 = None
+        self.category_bm25: Dict[str, BM25Index] = {}
+        self.category_router = CategoryRouter() if category_routing else None
+        self.use_fast_answers = fast_answers
+        self.fast_answers = None
+        self.snapshot_dir = None
+        self._reload_lock = threading.Lock()
+        self.generation = 0
+        self.reloads = 0
+        self.last_reload: Optional[Dict[str, Any]] = None
         self.qa_chain = None
+        self.llm = None
+        self.prompt = None
+        self.answer_cache = AnswerCache(
+            max_entries=cache_size,
+            ttl_seconds=cache_ttl,
+            similarity_threshold=cache_similarity,
+            embed=self.embeddings.embed_query
+        ) if cache_size > 0 else None
         
         # Ensure data directory exists
         if not self.data_dir.exists():
             raise ValueError(f"Data directory not found: {self.data_dir}")
 
-    def process_library_data(self) -> List[Dict[str, str]]:
-        """Process scraped library data into documents"""
+    def latest_snapshot_dir(self, complete: bool = False) -> Path:
+        """Most recent timestamped scrape directory (only finished crawls, which have changes.json, if complete)"""
+        domain_dirs = [d for d in self.data_dir.iterdir() if d.is_dir()]
+        if not domain_dirs:
+            raise ValueError(f"No domain directories found in {self.data_dir}")
+            
+        latest_domain = domain_dirs[0]
+        timestamp_dirs = [d for d in latest_domain.iterdir() if d.is_dir()]
+        if complete:
+            timestamp_dirs = [d for d in timestamp_dirs if (d / 'changes.json').exists()]
+        if not timestamp_dirs:
+            raise ValueError(f"No timestamp directories found in {latest_domain}")
+            
+        return max(timestamp_dirs, key=lambda x: x.stat().st_mtime)
+
+    def pages_dir(self, snapshot_dir: Path) -> Path:
+        """processed/ if it holds cleaned pages and use_processed is set, otherwise raw/"""
+        processed = snapshot_dir / 'processed'
+        if self.use_processed and any(processed.glob('*/*.json')):
+            return processed
+        return snapshot_dir / 'raw'
+
+    @staticmethod
+    def load_document(file: Path, category: str) -> Dict[str, Any]:
+        """Structured document for one scraped page"""
+        with open(file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {
+            'page_content': f"Category: {category}\nTitle: {data.get('title', '')}\n\nContent: {data.get('content', '')}",
+            'metadata': {
+                'url': data.get('url', ''),
+                'category': category,
+                'title': data.get('title', ''),
+                'timestamp': data.get('timestamp', '')
+            }
+        }
+
+    def process_library_data(self, snapshot_dir: Optional[Path] = None) -> List[Dict[str, str]]:
+        """Process scraped library data into documents (from the most recent snapshot by default)"""
         documents = []
         
         try:
-            # Find the most recent data directory
-            domain_dirs = [d for d in self.data_dir.iterdir() if d.is_dir()]
-            if not domain_dirs:
-                raise ValueError(f"No domain directories found in {self.data_dir}")
-                
-            latest_domain = domain_dirs[0]
-            timestamp_dirs = [d for d in latest_domain.iterdir() if d.is_dir()]
-            if not timestamp_dirs:
-                raise ValueError(f"No timestamp directories found in {latest_domain}")
-                
-            latest_dir = max(timestamp_dirs, key=lambda x: x.stat().st_mtime)
-            self.logger.info(f"Using data from: {latest_dir}")
+            pages_dir = self.pages_dir(Path(snapshot_dir) if snapshot_dir else self.latest_snapshot_dir())
+            self.logger.info(f"Using data from: {pages_dir}")
             
             # Process each category
             categories = ['contact', 'hours', 'events', 'services', 'general']
             for category in categories:
-                category_dir = latest_dir / 'raw' / category
+                category_dir = pages_dir / category
                 if category_dir.exists():
                     for file in category_dir.glob('*.json'):
                         try:
-                            with open(file, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                # Create structured document
-                                doc = {
-                                    'page_content': f"Category: {category}\nTitle: {data.get('title', '')}\n\nContent: {data.get('content', '')}",
-                                    'metadata': {
-                                        'url': data.get('url', ''),
-                                        'category': category,
-                                        'title': data.get('title', ''),
-                                        'timestamp': data.get('timestamp', '')
-                                    }
-                                }
-                                documents.append(doc)
+                            documents.append(self.load_document(file, category))
                         except Exception as e:
                             self.logger.error(f"Error processing {file}: {e}")
                             
@@ -110,45 +245,297 @@ class LibraryRAG:
             self.logger.error(f"Error processing library data: {e}")
             raise
 
-    def create_vectorstore(self):
-        """Create vector store from processed documents"""
+    @staticmethod
+    def chunk_id(text: str, metadata: Dict[str, Any]) -> str:
+        """Stable content hash used as the vector store id of a chunk"""
+        key = f"{metadata.get('url', '')}\0{text}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def build_chunks(
+        self,
+        documents: Optional[List[Dict[str, Any]]] = None,
+        snapshot_dir: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """Split processed documents (all pages of the snapshot by default) into chunks keyed by their content hash"""
+        if documents is None:
+            documents = self.process_library_data(snapshot_dir)
+        
+        chunks_by_id = {}
+        for doc in documents:
+            chunks = self.text_splitter.create_documents(
+                [doc['page_content']], 
+                metadatas=[doc['metadata']]
+            )
+            for chunk in chunks:
+                chunk_id = self.chunk_id(chunk.page_content, chunk.metadata)
+                # Identical chunks (e.g. repeated page footers) are embedded once
+                chunks_by_id[chunk_id] = {
+                    'id': chunk_id,
+                    'text': chunk.page_content,
+                    'metadata': {**chunk.metadata, 'content_hash': chunk_id}
+                }
+                
+        return list(chunks_by_id.values())
+
+    def open_vectorstore(self):
+        """Open the configured vector store, loading the persisted collection if there is one"""
+        persist_directory = None
+        if self.persist_dir:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            persist_directory = str(self.persist_dir)
+            
+        if self.index_backend == "numpy":
+            return NumpyVectorStore(
+                embedding_function=self.embeddings,
+                persist_directory=persist_directory,
+                collection_name=f"{self.collection_name}_{self.index_dtype}",
+                dtype=self.index_dtype
+            )
+        return Chroma(
+            collection_name=self.collection_name,
+            embedding_function=self.embeddings,
+            persist_directory=persist_directory
+        )
+
+    def create_vectorstore(self, batch_size: int = 256, snapshot_dir: Optional[Path] = None, seed=None):
+        """Create or incrementally update the vector store from processed documents
+        
+        Chunks are stored under their content hash, so with a persist_dir only
+        chunks that are new or changed since the last run are embedded, and
+        chunks that no longer exist in the data are removed.
+        
+        Args:
+            batch_size: Chunks embedded per request
+            snapshot_dir: Scrape directory to index (defaults to the latest)
+            seed: Another vector store whose embeddings are copied for chunks it already holds
+        """
         try:
-            documents = self.process_library_data()
+            snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.latest_snapshot_dir()
+            chunks = self.build_chunks(snapshot_dir=snapshot_dir)
             
-            # Split documents into chunks
-            texts = []
-            metadatas = []
+            self.vectorstore = self.open_vectorstore()
+            existing_ids = set(self.vectorstore.get(include=[])['ids'])
+                
+            current_ids = {chunk['id'] for chunk in chunks}
+            new_chunks = [chunk for chunk in chunks if chunk['id'] not in existing_ids]
+            stale_ids = list(existing_ids - current_ids)
             
-            for doc in documents:
-                chunks = self.text_splitter.create_documents(
-                    [doc['page_content']], 
-                    metadatas=[doc['metadata']]
-                )
-                texts.extend([chunk.page_content for chunk in chunks])
-                metadatas.extend([chunk.metadata for chunk in chunks])
+            if stale_ids:
+                for start in range(0, len(stale_ids), batch_size):
+                    self.vectorstore.delete(ids=stale_ids[start:start + batch_size])
+                    
+            # Only new or changed chunks hit the embedding API
+            embedded = self.add_chunks(new_chunks, batch_size, seed)
+            self.persist_vectorstore()
                 
-            # Create vector store
-            self.vectorstore = Chroma.from_texts(
-                texts=texts,
-                metadatas=metadatas,
-                embedding=self.embeddings
+            # The keyword index is cheap to rebuild, so it is kept in memory only
+            self.build_keyword_indexes(
+                [chunk['text'] for chunk in chunks],
+                [chunk['metadata'] for chunk in chunks]
+            )
+                
+            self.load_fast_answers(snapshot_dir)
+            self.snapshot_dir = snapshot_dir
+            # Answers from the previous index may cite chunks that changed
+            if self.answer_cache:
+                self.answer_cache.clear()
+                
+            self.logger.info(
+                f"Vectorstore ready with {len(current_ids)} chunks "
+                f"({embedded} embedded, {len(new_chunks) - embedded} copied, "
+                f"{len(existing_ids & current_ids)} reused, {len(stale_ids)} removed)"
             )
-            
-            self.logger.info(f"Created vectorstore with {len(texts)} chunks")
             
         except Exception as e:
             self.logger.error(f"Error creating vector store: {e}")
             raise
 
+    def persist_vectorstore(self):
+        """Write the numpy index once a batch of adds and deletes is done; Chroma writes as it goes"""
+        if isinstance(self.vectorstore, NumpyVectorStore):
+            self.vectorstore.persist()
+
+    def add_chunks(self, chunks: List[Dict[str, Any]], batch_size: int = 256, seed=None) -> int:
+        """
+        Add chunks to the vector store, embedding only those seed does not already hold
+        
+        Returns:
+            Number of chunks sent to the embedding API
+        """
+        reused = {}
+        if seed is not None and chunks:
+            stored = seed.get(ids=[chunk['id'] for chunk in chunks], include=['embeddings'])
+            reused = dict(zip(stored['ids'], np.asarray(stored['embeddings'], dtype=np.float32).tolist()))
+            
+        copied = [chunk for chunk in chunks if chunk['id'] in reused]
+        for start in range(0, len(copied), batch_size):
+            batch = copied[start:start + batch_size]
+            texts = [chunk['text'] for chunk in batch]
+            embeddings = [reused[chunk['id']] for chunk in batch]
+            metadatas = [chunk['metadata'] for chunk in batch]
+            ids = [chunk['id'] for chunk in batch]
+            if isinstance(self.vectorstore, NumpyVectorStore):
+                self.vectorstore.add_embeddings(texts, embeddings, metadatas, ids)
+            else:
+                # Chroma only embeds through add_texts, so copied vectors go to the collection directly
+                self.vectorstore._collection.add(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=texts)
+                
+        new_chunks = [chunk for chunk in chunks if chunk['id'] not in reused]
+        for start in range(0, len(new_chunks), batch_size):
+            batch = new_chunks[start:start + batch_size]
+            self.vectorstore.add_texts(
+                texts=[chunk['text'] for chunk in batch],
+                metadatas=[chunk['metadata'] for chunk in batch],
+                ids=[chunk['id'] for chunk in batch]
+            )
+        return len(new_chunks)
+
+    def reload(self, snapshot_dir: Optional[Path] = None, batch_size: int = 256) -> bool:
+        """
+        Build the index for a new snapshot next to the live one, then swap it in
+        
+        The new vector store, keyword indexes, fact store and QA chain are built
+        in memory on a copy of this object; chunks the live index already holds
+        keep their embeddings. The swap replaces every index attribute at once
+        (see INDEX_ATTRIBUTES). Queries that started before it finish on the
+        chain they captured, and the old index is freed when the last of them
+        lets go of it. The on-disk index in persist_dir is not touched, so a
+        restart indexes the latest snapshot incrementally as before.
+        
+        Args:
+            snapshot_dir: Scrape directory to switch to (defaults to the latest finished crawl)
+            batch_size: Chunks embedded per request
+            
+        Returns:
+            False if the snapshot is already live or another reload is running
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.latest_snapshot_dir(complete=True)
+            if snapshot_dir == self.snapshot_dir:
+                return False
+            started = time.perf_counter()
+            self.logger.info(f"Building index for {snapshot_dir.name} in the background")
+            
+            staged = copy.copy(self)
+            staged.persist_dir = None
+            # Each generation gets its own collection, as in-memory Chroma collections share one client
+            staged.collection_name = f"{self.collection_name}_{snapshot_dir.name}_{self.generation + 1}"
+            # The live cache keeps serving until the swap
+            staged.answer_cache = None
+            staged.create_vectorstore(batch_size, snapshot_dir, seed=self.vectorstore)
+            staged.setup_qa_chain()
+            
+            for name in self.INDEX_ATTRIBUTES:
+                setattr(self, name, getattr(staged, name))
+            self.generation += 1
+            # Queries still running on the old index can no longer cache their answers
+            if self.answer_cache:
+                self.answer_cache.clear(self.generation)
+            self.release_on_collect(staged.vectorstore, f"{snapshot_dir.name} (generation {self.generation})")
+            
+            self.reloads += 1
+            self.last_reload = {
+                "snapshot": snapshot_dir.name,
+                "seconds": time.perf_counter() - started,
+                "finished_at": datetime.now().isoformat(timespec="seconds")
+            }
+            self.logger.info(
+                f"Swapped in index for {snapshot_dir.name} after {self.last_reload['seconds']:.1f}s; "
+                f"the previous index is freed once in-flight queries finish"
+            )
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def release_on_collect(self, store, label: str):
+        """Drop an in-memory store's collection and log it once nothing references the store"""
+        logger = self.logger
+        client = getattr(store, '_client', None)
+        collection = getattr(getattr(store, '_collection', None), 'name', None)
+        
+        def release():
+            if client is not None and collection:
+                client.delete_collection(collection)
+            logger.info(f"Released index for {label}")
+        weakref.finalize(store, release)
+
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Live snapshot and reload history"""
+        return {
+            "snapshot": self.snapshot_dir.name if self.snapshot_dir else None,
+            "generation": self.generation,
+            "reloading": self._reload_lock.locked(),
+            "reloads": self.reloads,
+            "last_reload": self.last_reload,
+        }
+
+    def load_fast_answers(self, snapshot_dir: Path):
+        """Load the snapshot's extracted contact and hours facts, if fast answers are on and it has them"""
+        if not self.use_fast_answers:
+            return
+        self.fast_answers = FastAnswerStore.load(snapshot_dir / FACTS_FILE, self.category_router)
+        if self.fast_answers is None:
+            self.logger.info(f"{snapshot_dir.name} has no {FACTS_FILE}, every question goes to the LLM")
+
+    def build_keyword_indexes(self, texts: List[str], metadatas: List[Dict[str, Any]]):
+        """BM25 over every chunk, plus one per category for category-routed questions"""
+        self.bm25 = BM25Index(texts, metadatas)
+        by_category = defaultdict(list)
+        for text, metadata in zip(texts, metadatas):
+            by_category[metadata.get('category', 'general')].append((text, metadata))
+        self.category_bm25 = {
+            category: BM25Index([text for text, _ in items], [metadata for _, metadata in items])
+            for category, items in by_category.items()
+        }
+
+    def build_retriever(self, mode: Optional[str] = None, k: int = 6, category: Optional[str] = None):
+        """Retriever for the given mode (defaults to the configured retrieval_mode), limited to one category if given"""
+        mode = mode or self.retrieval_mode
+        bm25 = self.category_bm25[category] if category else self.bm25
+        if mode == "bm25":
+            return KeywordRetriever(bm25=bm25, k=k)
+        search_kwargs = {
+            "k": k,
+            "fetch_k": 2 * k
+        }
+        if category:
+            search_kwargs["filter"] = {"category": category}
+        mmr = self.vectorstore.as_retriever(search_type="mmr", search_kwargs=search_kwargs)
+        if mode == "mmr":
+            return mmr
+        return HybridRetriever(vector_retriever=mmr, bm25=bm25, k=k, bm25_k=2 * k)
+
+    def build_routed_retriever(self, mode: Optional[str] = None, k: int = 6):
+        """build_retriever() that narrows questions the category router is confident about to that category"""
+        retrievers = {
+            category: self.build_retriever(mode, k, category)
+            for category in CATEGORY_PHRASES if category in self.category_bm25
+        }
+        return CategoryRoutedRetriever(
+            router=self.category_router or CategoryRouter(),
+            retrievers=retrievers,
+            fallback=self.build_retriever(mode, k)
+        )
+
     def setup_qa_chain(self):
         """Setup the QA chain"""
         try:
             if not self.vectorstore:
                 raise ValueError("Vector store not created. Run create_vectorstore first.")
                 
-            llm = ChatOpenAI(
+            llm = get_chat_model(
                 temperature=0,
-                model_name="gpt-4o"
+                model_name="gpt-4o",
+                callbacks=[LLMStageTimer("llm_answer")]
+            )
+            self.llm = llm
+            # Separate instance so the condense-question call is timed on its own
+            condense_llm = get_chat_model(
+                temperature=0,
+                model_name="gpt-4o",
+                callbacks=[LLMStageTimer("llm_condense")]
             )
 
             # Create a custom prompt template for better context integration
@@ -175,16 +562,12 @@ class LibraryRAG:
                 HumanMessagePromptTemplate.from_template(human_template)
             ]
             prompt = ChatPromptTemplate.from_messages(messages)
+            self.prompt = prompt
 
             self.qa_chain = ConversationalRetrievalChain.from_llm(
                 llm=llm,
-                retriever=self.vectorstore.as_retriever(
-                    search_type="mmr",
-                    search_kwargs={
-                        "k": 6,
-                        "fetch_k": 12
-                    }
-                ),
+                condense_question_llm=condense_llm,
+                retriever=self.build_routed_retriever() if self.category_router else self.build_retriever(),
                 combine_docs_chain_kwargs={"prompt": prompt},
                 return_source_documents=True,
                 verbose=True  # Helps with debugging
@@ -201,30 +584,134 @@ class LibraryRAG:
         self.setup_qa_chain()
         self.logger.info("RAG system initialized successfully")
 
+    def get_cached_answer(self, question: str, chat_history: List) -> Optional[Dict[str, Any]]:
+        """Cached result for a standalone question; follow-ups depend on history and are never cached"""
+        if not self.answer_cache or chat_history:
+            return None
+        return self.answer_cache.get(question)
+
+    def get_fast_answer(self, question: str, chat_history: List) -> Optional[Dict[str, Any]]:
+        """Answer from extracted facts for a standalone contact or hours question"""
+        fast_answers = self.fast_answers
+        if not fast_answers or chat_history:
+            return None
+        return fast_answers.answer(question)
+
+    def cache_answer(self, question: str, chat_history: List, result: Dict[str, Any], started: float, generation: int):
+        """Cache a standalone question's result along with the time it took, unless the index was swapped since"""
+        if self.answer_cache and not chat_history:
+            self.answer_cache.put(question, result, cost=time.perf_counter() - started, generation=generation)
+
     def query(self, question: str, chat_history: List = None) -> Dict[str, Any]:
         """Query the RAG system"""
         if not self.qa_chain:
             raise ValueError("RAG system not initialized. Run initialize first.")
             
         chat_history = chat_history or []
+        # Read before the chain, so an answer is never tagged newer than the index it came from
+        generation = self.generation
         
         try:
-            response = self.qa_chain({
+            ready = self.get_cached_answer(question, chat_history) or self.get_fast_answer(question, chat_history)
+            if ready:
+                return ready
+                
+            started = time.perf_counter()
+            # A reload may swap the chain mid-query; this query stays on the one it started with
+            qa_chain = self.qa_chain
+            response = qa_chain({
                 "question": question, 
                 "chat_history": chat_history
-            })
+            }, callbacks=[RetrieverTimer()])
             
-            sources = [{
-                "url": doc.metadata.get("url", ""),
-                "category": doc.metadata.get("category", ""),
-                "title": doc.metadata.get("title", "")
-            } for doc in response.get("source_documents", [])]
-                
-            return {
+            sources = self.format_sources(response.get("source_documents", []))
+            result = {
                 "answer": response["answer"].strip(),
                 "sources": sources
             }
+            self.cache_answer(question, chat_history, result, started, generation)
+                
+            return result
             
         except Exception as e:
             self.logger.error(f"Error processing query: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def format_sources(documents: List) -> List[Dict[str, str]]:
+        """Source citations for retrieved chunks"""
+        return [{
+            "url": doc.metadata.get("url", ""),
+            "category": doc.metadata.get("category", ""),
+            "title": doc.metadata.get("title", "")
+        } for doc in documents]
+
+    @staticmethod
+    def format_chat_history(chat_history: List[Tuple[str, str]]) -> str:
+        """Render (question, answer) pairs the way ConversationalRetrievalChain does"""
+        return "".join(f"\nHuman: {question}\nAssistant: {answer}" for question, answer in chat_history)
+
+    def stream_query(self, question: str, chat_history: List = None) -> Iterator[Dict[str, Any]]:
+        """
+        Query the RAG system, yielding events as soon as they are available
+        
+        Runs the same steps as the QA chain: condense the question against the
+        chat history, retrieve context, then stream the answer from the LLM.
+        
+        Yields:
+            {"type": "sources", "sources": [...]} once retrieval is done, then
+            {"type": "token", "text": ...} for each answer fragment, then
+            {"type": "done", "answer": ...} with the full answer
+        """
+        if not self.qa_chain:
+            raise ValueError("RAG system not initialized. Run initialize first.")
+            
+        chat_history = chat_history or []
+        # Read before the chain, so an answer is never tagged newer than the index it came from
+        generation = self.generation
+        
+        try:
+            ready = self.get_cached_answer(question, chat_history) or self.get_fast_answer(question, chat_history)
+            if ready:
+                yield {"type": "sources", "sources": ready["sources"]}
+                yield {"type": "token", "text": ready["answer"]}
+                yield {"type": "done", "answer": ready["answer"]}
+                return
+                
+            started = time.perf_counter()
+            # A reload may swap the index mid-stream; this query stays on the one it started with
+            qa_chain, prompt, llm = self.qa_chain, self.prompt, self.llm
+            history = self.format_chat_history(chat_history)
+            standalone_question = question
+            if chat_history:
+                standalone_question = qa_chain.question_generator.predict(
+                    question=question,
+                    chat_history=history
+                )
+                
+            documents = qa_chain.retriever.get_relevant_documents(
+                standalone_question,
+                callbacks=[RetrieverTimer()]
+            )
+            sources = self.format_sources(documents)
+            yield {"type": "sources", "sources": sources}
+            
+            messages = prompt.format_messages(
+                context="\n\n".join(doc.page_content for doc in documents),
+                question=standalone_question,
+                chat_history=history
+            )
+            
+            answer = []
+            for chunk in llm.stream(messages):
+                if chunk.content:
+                    answer.append(chunk.content)
+                    yield {"type": "token", "text": chunk.content}
+                    
+            result = {"answer": "".join(answer).strip(), "sources": sources}
+            self.cache_answer(question, chat_history, result, started, generation)
+            yield {"type": "done", "answer": result["answer"]}
+            
+        except Exception as e:
+            self.logger.error(f"Error streaming query: {e}")
+            raise
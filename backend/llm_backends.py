@@ -0,0 +1,166 @@
+# llm_backends.py
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+OPENAI = "openai"
+LOCAL = "local"
+
+
+def get_backend_name() -> str:
+    """Backend selected with LLM_BACKEND ("openai" by default, or "local")"""
+    return os.getenv("LLM_BACKEND", OPENAI).lower()
+
+
+class LatencyModel:
+    """Log-normal latency with a given median and 95th percentile, in milliseconds"""
+
+    def __init__(self, median_ms: float, p95_ms: float, seed: Optional[int] = None):
+        self.median_ms = median_ms
+        self.mu = math.log(median_ms) if median_ms > 0 else 0.0
+        # z(0.95) = 1.645 for the standard normal
+        self.sigma = math.log(p95_ms / median_ms) / 1.645 if 0 < median_ms < p95_ms else 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "LatencyModel":
+        """Parse "median_ms,p95_ms" from an environment variable"""
+        median, p95 = (float(v) for v in os.getenv(name, default).split(","))
+        seed = os.getenv("LOCAL_LLM_SEED")
+        return cls(median, p95, seed=int(seed) if seed else None)
+
+    def sample(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        with self._lock:
+            return self._rng.lognormvariate(self.mu, self.sigma)
+
+    def sleep(self):
+        delay = self.sample()
+        if delay:
+            time.sleep(delay / 1000)
+
+
+class LocalEmbeddings(Embeddings):
+    """Deterministic hashed bag-of-words embeddings with simulated API latency"""
+
+    def __init__(self, dimensions: int = 256, latency: Optional[LatencyModel] = None):
+        self.dimensions = dimensions
+        self.latency = latency or LatencyModel.from_env("LOCAL_EMBED_LATENCY", "80,200")
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.latency.sleep()
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.latency.sleep()
+        return self._embed(text)
+
+
+class LocalChatModel(BaseChatModel):
+    """Deterministic chat model that answers from its prompt with simulated latency"""
+
+    model_name: str = "local-stand-in"
+    first_token_latency: Any = None
+    token_latency: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.first_token_latency is None:
+            self.first_token_latency = LatencyModel.from_env("LOCAL_CHAT_LATENCY", "400,1200")
+        if self.token_latency is None:
+            self.token_latency = LatencyModel.from_env("LOCAL_TOKEN_LATENCY", "15,40")
+
+    @property
+    def _llm_type(self) -> str:
+        return "local-stand-in"
+
+    @staticmethod
+    def respond(messages: List[BaseMessage]) -> str:
+        """Answer built only from the prompt, so the same prompt always gets the same answer"""
+        prompt = messages[-1].content if messages else ""
+        question = re.search(r"Question:\s*(.+)", prompt)
+        subject = (question.group(1) if question else prompt).strip().splitlines()[0][:200]
+        digest = hashlib.sha256("".join(m.content for m in messages).encode("utf-8")).hexdigest()
+        return (f"This is a local stand-in answer about: {subject}. "
+                f"It was generated offline (ref {digest[:8]}). "
+                f"Is there anything else you would like to know?")
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self.respond(messages)
+        self.first_token_latency.sleep()
+        for _ in text.split():
+            self.token_latency.sleep()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        text = self.respond(messages)
+        self.first_token_latency.sleep()
+        for i, word in enumerate(text.split(" ")):
+            if i:
+                self.token_latency.sleep()
+            token = word if i == 0 else " " + word
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class LocalOpenAIClient:
+    """Stand-in for openai.OpenAI covering client.chat.completions.create"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel.from_env("LOCAL_INTENT_LATENCY", "300,800")
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: List[dict], temperature: float = 0, **kwargs):
+        self.latency.sleep()
+        query = messages[-1]["content"].rsplit("Query:", 1)[-1].lower()
+        wants_directions = re.search(r"\b(where|how do i get|directions?|lost|find|way to)\b", query)
+        content = "DIRECTIONS" if wants_directions else "INFORMATION"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """OpenAI SDK client, or the local stand-in"""
+    if get_backend_name() == LOCAL:
+        return LocalOpenAIClient()
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def get_chat_model(model_name: str, temperature: float = 0, callbacks: Optional[list] = None):
+    """LangChain chat model for the configured backend"""
+    if get_backend_name() == LOCAL:
+        return LocalChatModel(model_name=model_name, callbacks=callbacks)
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(temperature=temperature, model_name=model_name, callbacks=callbacks)
+
+
+def get_embeddings():
+    """LangChain embeddings for the configured backend"""
+    if get_backend_name() == LOCAL:
+        return LocalEmbeddings()
+    from langchain_community.embeddings import OpenAIEmbeddings
+    return OpenAIEmbeddings()
@@ -0,0 +1,151 @@
+# load_test.py
+import argparse
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+DIRECTIONS_QUERIES = [
+    "How do I get to 1South?",
+    "Where is the Information Commons?",
+    "How do I get to the vocal booth?",
+    "Where is the circulation desk?",
+    "How do I get from circulation to periodicals?",
+    "Where is Project Room A?",
+    "Take me to the book nook",
+    "Where is the reference collection?",
+    "I'm at the cafe, how do I get to the lower level?",
+    "Where are the study rooms?",
+]
+
+INFORMATION_QUERIES = [
+    "What are the library hours?",
+    "When does the library close today?",
+    "How do I print in the library?",
+    "How do I reserve a study room?",
+    "Who do I contact about interlibrary loan?",
+    "What is the phone number for the help desk?",
+    "Can I renew my books online?",
+    "What events are happening this week?",
+    "Do you have scanners?",
+    "Tell me about research consultations",
+]
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def fetch_stage_buckets(url):
+    """Cumulative stage histogram buckets and sums from the server's /metrics endpoint"""
+    try:
+        text = requests.get(f"{url}/metrics", timeout=10).text
+    except requests.RequestException:
+        return {}
+    stages = defaultdict(lambda: {"buckets": {}, "sum": 0.0})
+    for line in text.splitlines():
+        match = re.match(r'receptionist_stage_seconds_bucket\{stage="([^"]+)",le="([^"]+)"\} (\S+)', line)
+        if match:
+            stage, le, count = match.groups()
+            stages[stage]["buckets"][float(le)] = float(count)
+            continue
+        match = re.match(r'receptionist_stage_seconds_sum\{stage="([^"]+)"\} (\S+)', line)
+        if match:
+            stages[match.group(1)]["sum"] = float(match.group(2))
+    return stages
+
+
+def bucket_quantile(buckets, q):
+    """Upper bucket bound containing the q-quantile, in milliseconds"""
+    total = buckets[float("inf")]
+    for bound in sorted(buckets):
+        if buckets[bound] >= q * total:
+            return bound * 1000
+    return float("inf")
+
+
+def report_stages(before, after):
+    print(f"\n{'server stage':<14}{'count':>7}{'mean':>10}{'p50<=':>10}{'p95<=':>10}{'p99<=':>10}")
+    for stage in sorted(after):
+        buckets = {le: count - before.get(stage, {}).get("buckets", {}).get(le, 0)
+                   for le, count in after[stage]["buckets"].items()}
+        count = buckets.get(float("inf"), 0)
+        if not count:
+            continue
+        mean = (after[stage]["sum"] - before.get(stage, {}).get("sum", 0.0)) / count * 1000
+        print(f"{stage:<14}{int(count):>7}{mean:>8.0f}ms"
+              f"{bucket_quantile(buckets, 0.5):>8.0f}ms{bucket_quantile(buckets, 0.95):>8.0f}ms"
+              f"{bucket_quantile(buckets, 0.99):>8.0f}ms")
+
+
+def send(url, kind, query):
+    start = time.perf_counter()
+    try:
+        response = requests.post(f"{url}/api/chat", json={"message": query, "chat_history": []}, timeout=120)
+        ok = response.status_code == 200
+        intent = response.json().get("intent") if ok else None
+    except requests.RequestException:
+        ok, intent = False, None
+    return kind, intent, ok, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive /api/chat with a mix of directions and information queries")
+    parser.add_argument("--url", default="http://localhost:5050")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--directions-ratio", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workload = []
+    for _ in range(args.requests):
+        if rng.random() < args.directions_ratio:
+            workload.append(("directions", rng.choice(DIRECTIONS_QUERIES)))
+        else:
+            workload.append(("information", rng.choice(INFORMATION_QUERIES)))
+
+    print(f"Sending {args.requests} requests to {args.url} with concurrency {args.concurrency}...")
+    stages_before = fetch_stage_buckets(args.url)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda item: send(args.url, *item), workload))
+    elapsed = time.perf_counter() - start
+    stages_after = fetch_stage_buckets(args.url)
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    misclassified = 0
+    for kind, intent, ok, ms in results:
+        if not ok:
+            errors[kind] += 1
+            continue
+        latencies[kind].append(ms)
+        latencies["all"].append(ms)
+        misclassified += intent != kind
+
+    print(f"\nThroughput: {len(results) / elapsed:.1f} req/s over {elapsed:.1f}s")
+    print(f"Misclassified intents: {misclassified}")
+    print(f"\n{'query type':<14}{'count':>7}{'errors':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for kind in ["directions", "information", "all"]:
+        samples = latencies.get(kind, [])
+        if not samples:
+            continue
+        err = sum(errors.values()) if kind == "all" else errors[kind]
+        print(f"{kind:<14}{len(samples):>7}{err:>8}"
+              f"{statistics.mean(samples):>9.0f}ms{percentile(samples, 50):>8.0f}ms"
+              f"{percentile(samples, 95):>8.0f}ms{percentile(samples, 99):>8.0f}ms")
+
+    if stages_after:
+        report_stages(stages_before, stages_after)
+
+
+if __name__ == "__main__":
+    main()
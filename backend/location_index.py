@@ -0,0 +1,97 @@
+# location_index.py
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+import numpy as np
+from fuzzy_index import normalize
+
+WORD = re.compile(r"[a-z0-9]+")
+# Kinds of evidence in a lost user's description
+DESCRIPTOR = "descriptor"
+FEATURE = "feature"
+NEARBY = "nearby"
+# Trie key holding the id of the phrase that ends at a node; never a word
+PHRASE_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words with a plural "s" dropped, so "study tables" and "study table" agree"""
+    text = text.lower()
+    words = WORD.findall(text) if text.isascii() else normalize(text).split()
+    return [word[:-1] if len(word) > 3 and word[-1] == "s" and word[-2] != "s" else word for word in words]
+
+
+class LocationIndex:
+    def __init__(self, phrases: Iterable[Tuple[str, Iterable[Any], float]]):
+        """
+        Inverted index from place phrases to the locations they are evidence for
+
+        Phrases are stored as a trie of their words. A description is scored
+        by walking the trie from each of its words for as long as some phrase
+        continues: a few dict lookups per word, however many phrases the
+        floors define. The postings of every phrase found are summed per
+        location with one bincount.
+
+        Args:
+            phrases: (phrase, locations, weight) triples; a phrase registered
+                more than once adds every weight to its locations
+        """
+        self.locations: List[Any] = []
+        position: Dict[Any, int] = {}
+        self._trie: dict = {}
+        ids: List[List[int]] = []
+        weights: List[List[float]] = []
+        for phrase, locations, weight in phrases:
+            words = tokenize(phrase)
+            if not words:
+                continue
+            node = self._trie
+            for word in words:
+                node = node.setdefault(word, {})
+            if PHRASE_END not in node:
+                node[PHRASE_END] = len(ids)
+                ids.append([])
+                weights.append([])
+            phrase_id = node[PHRASE_END]
+            for location in locations:
+                if location not in position:
+                    position[location] = len(self.locations)
+                    self.locations.append(location)
+                ids[phrase_id].append(position[location])
+                weights[phrase_id].append(weight)
+        # Postings per phrase id: location positions and the weight each gets
+        self.ids = [np.array(phrase_ids, dtype=np.int32) for phrase_ids in ids]
+        self.weights = [np.array(phrase_weights, dtype=np.float64) for phrase_weights in weights]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def phrases_in(self, text: str) -> List[int]:
+        """Ids of the phrases in text, each once, in order of first appearance"""
+        words = tokenize(text)
+        trie = self._trie
+        found = {}
+        for i in range(len(words)):
+            node = trie
+            for word in words[i:]:
+                node = node.get(word)
+                if node is None:
+                    break
+                if PHRASE_END in node:
+                    found[node[PHRASE_END]] = None
+        return list(found)
+
+    def scores(self, text: str) -> np.ndarray:
+        """Summed weight per location of the phrases in text; each phrase counts once"""
+        found = self.phrases_in(text)
+        if not found:
+            return np.zeros(len(self.locations))
+        ids = np.concatenate([self.ids[phrase_id] for phrase_id in found])
+        weights = np.concatenate([self.weights[phrase_id] for phrase_id in found])
+        return np.bincount(ids, weights=weights, minlength=len(self.locations))
+
+    def rank(self, text: str, limit: int = 3) -> List[Tuple[Any, float]]:
+        """Locations with a positive score for text, highest first, as (location, score)"""
+        scores = self.scores(text)
+        ranked = np.flatnonzero(scores > 0)
+        ranked = ranked[np.argsort(-scores[ranked], kind="stable")][:limit]
+        return [(self.locations[i], float(scores[i])) for i in ranked]
@@ -0,0 +1,138 @@
+# map_renderer.py
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional, Tuple
+import base64
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image, ImageDraw
+
+# Default box covered by a floor plan image in graph coordinates, north up
+PLAN_WIDTH = 800
+PLAN_HEIGHT = 650
+
+
+class MapRenderer:
+    def __init__(
+        self,
+        floor_plan: dict,
+        background: Optional[Path] = None,
+        extent: Tuple[float, float, float, float] = (0, PLAN_WIDTH, 0, PLAN_HEIGHT),
+        path_color: str = "red",
+        path_width: int = 4,
+        marker_radius: int = 10,
+        title: str = "Library Floor Plan Navigation"
+    ):
+        """
+        Render the static floor plan once and draw routes on top per request
+
+        Args:
+            floor_plan: One floor with "nodes", "edges" and optionally the "hallway_y" to draw
+            background: Floor plan image to draw the graph on; None draws the schematic only
+            extent: Graph coordinates (left, right, bottom, top) covered by the background image
+            path_color: Colour of the highlighted route and destination marker
+            path_width: Route line width in pixels
+            marker_radius: Destination marker radius in pixels
+            title: Heading of the schematic map
+        """
+        self.floor_plan = floor_plan
+        self.background = Path(background) if background else None
+        self.extent = extent
+        self.path_color = path_color
+        self.path_width = path_width
+        self.marker_radius = marker_radius
+        self.title = title
+
+        self.base_image, self.node_pixels = self._render_base()
+
+    def _render_base(self):
+        """Rasterize the floor plan and record the pixel position of every node"""
+        fig = Figure(figsize=(15, 10))
+        FigureCanvasAgg(fig)
+        nodes = self.floor_plan["nodes"]
+
+        if self.background and self.background.exists():
+            ax = fig.add_axes([0, 0, 1, 1])
+            left, right, bottom, top = self.extent
+            ax.imshow(Image.open(self.background), extent=self.extent, aspect='auto')
+            ax.set_xlim(left, right)
+            ax.set_ylim(bottom, top)
+            ax.axis("off")
+        else:
+            ax = fig.add_subplot()
+            if self.floor_plan.get("hallway_y") is not None:
+                ax.axhline(y=self.floor_plan["hallway_y"], color='gray', linestyle='--', alpha=0.3)
+            ax.set_title(self.title)
+            ax.set_xlabel("West → East")
+            ax.set_ylabel("South → North")
+            ax.grid(True)
+            ax.set_xlim(50, 800)
+            ax.set_ylim(150, 650)
+            ax.set_aspect('equal', adjustable='box')
+            ax.text(750, 600, 'N↑', fontsize=12, ha='center')
+
+        for edge in self.floor_plan["edges"]:
+            start = nodes[edge["from"]]
+            end = nodes[edge["to"]]
+            ax.plot([start["x"], end["x"]], [start["y"], end["y"]],
+                    'k-', linewidth=1, alpha=0.5)
+
+        for node in nodes.values():
+            ax.plot(node["x"], node["y"], 'o', color=node.get("color", "lightgray"), markersize=12)
+            va = 'bottom' if node["y"] > 400 else 'top'
+            ax.text(node["x"] + 5, node["y"], node["label"], fontsize=8, ha='left', va=va)
+
+        fig.canvas.draw()
+        width, height = fig.canvas.get_width_height()
+        image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB")
+
+        # Matplotlib display coordinates start at the bottom-left corner
+        coords = np.array([[node["x"], node["y"]] for node in nodes.values()], dtype=float)
+        display = ax.transData.transform(coords)
+        node_pixels = {
+            node_id: (float(x), float(height - y))
+            for node_id, (x, y) in zip(nodes, display)
+        }
+        return image, node_pixels
+
+    def render_image(self, path: Optional[List[str]] = None, destination: Optional[str] = None) -> Image.Image:
+        """Copy of the base map with the route and destination drawn on top"""
+        image = self.base_image.copy()
+        draw = ImageDraw.Draw(image)
+
+        if path and len(path) > 1:
+            draw.line([self.node_pixels[node_id] for node_id in path],
+                      fill=self.path_color, width=self.path_width, joint="curve")
+
+        if destination in self.node_pixels:
+            x, y = self.node_pixels[destination]
+            r = self.marker_radius
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=self.path_color)
+        return image
+
+    def render(self, path: Optional[List[str]] = None, destination: Optional[str] = None) -> bytes:
+        """PNG of the base map with the route and destination drawn on top"""
+        return encode_png(self.render_image(path, destination))
+
+    def render_base64(self, path: Optional[List[str]] = None, destination: Optional[str] = None) -> str:
+        """Base64 encoded PNG, as sent to the frontend"""
+        return base64.b64encode(self.render(path, destination)).decode('utf-8')
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buf = BytesIO()
+    image.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def stack_images(images: List[Image.Image]) -> Image.Image:
+    """Images one above the other, e.g. each floor a route passes through"""
+    if len(images) == 1:
+        return images[0]
+    stacked = Image.new("RGB", (max(image.width for image in images), sum(image.height for image in images)), "white")
+    top = 0
+    for image in images:
+        stacked.paste(image, (0, top))
+        top += image.height
+    return stacked
@@ -0,0 +1,434 @@
+# numpy_index.py
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+try:
+    import fcntl
+except ImportError:  # Windows; saves from several processes are then not serialized
+    fcntl = None
+
+DTYPES = ("float16", "int8")
+# Rows converted to float32 at a time when scoring, bounding the per-query scratch memory
+SCORE_BLOCK_ROWS = 4096
+# float32 value of every float16 bit pattern; a table lookup is about twice as fast as astype
+_HALF_TO_FLOAT = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float32)
+# File in a collection directory naming the version subdirectory that holds the current rows
+CURRENT_FILE = "CURRENT"
+# Prefix of version subdirectories
+VERSION_PREFIX = "v-"
+# Times a load re-reads CURRENT when a concurrent save removed the version it named
+LOAD_ATTEMPTS = 3
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Unit-normalized rows in the storage dtype, plus per-row scales for int8"""
+    vectors = _unit_rows(np.asarray(vectors, dtype=np.float32))
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1
+    return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+
+def _to_float32(rows: np.ndarray) -> np.ndarray:
+    if rows.dtype == np.float16:
+        return np.take(_HALF_TO_FLOAT, rows.view(np.uint16))
+    return rows.astype(np.float32)
+
+
+def _dequantize(rows: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    rows = _to_float32(rows)
+    return rows * scales[:, None] if scales is not None else rows
+
+
+class NumpyVectorStore(VectorStore):
+    def __init__(
+        self,
+        embedding_function: Embeddings,
+        persist_directory: Optional[str] = None,
+        collection_name: str = "library_chunks",
+        dtype: str = "float16"
+    ):
+        """
+        Exact cosine-similarity vector store over a contiguous NumPy matrix
+
+        Embeddings are stored unit-normalized as float16, or as int8 with a
+        float32 scale per row. A persisted collection is opened with
+        np.load(mmap_mode="r"), so worker processes serving the same index
+        share one read-only copy of the matrix through the page cache.
+
+        Adds and deletes change the in-memory rows only; persist() writes
+        them out once a batch of changes is done. Each write goes to a new
+        version subdirectory and CURRENT is then pointed at it, so a process
+        loading while another saves never sees a mix of old and new files.
+
+        Args:
+            embedding_function: Embeddings used for added texts and queries
+            persist_directory: Directory holding the collection (None keeps it in memory)
+            collection_name: Subdirectory of persist_directory for this collection
+            dtype: "float16" or "int8"
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        self.embedding_function = embedding_function
+        self.dtype = dtype
+        self.path = Path(persist_directory) / collection_name if persist_directory else None
+
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.vectors = np.zeros((0, 0), dtype=dtype)
+        self.scales = np.zeros(0, dtype=np.float32) if dtype == "int8" else None
+        # Row indices matching each metadata filter, rebuilt when the rows change
+        self._filter_rows: Dict[tuple, np.ndarray] = {}
+        # Writable arrays with room to grow that self.vectors and self.scales are views
+        # of; None while the rows are the read-only memory-mapped files
+        self._vector_buffer: Optional[np.ndarray] = None
+        self._scale_buffer: Optional[np.ndarray] = None
+        # Whether the rows differ from what persist() last wrote
+        self.dirty = False
+
+        if self.path and self._version_dir() is not None:
+            self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def _version_dir(self) -> Optional[Path]:
+        """Directory named by CURRENT; the collection itself for indexes written before versions"""
+        try:
+            return self.path / (self.path / CURRENT_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return self.path if (self.path / "chunks.json").exists() else None
+
+    def _load(self):
+        for attempt in range(LOAD_ATTEMPTS):
+            try:
+                return self._load_version(self._version_dir())
+            except FileNotFoundError:
+                # Another process saved twice between reading CURRENT and opening the files
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+
+    def _load_version(self, directory: Path):
+        with open(directory / "chunks.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["dtype"] != self.dtype:
+            raise ValueError(
+                f"Index at {self.path} is {manifest['dtype']}, not {self.dtype}; "
+                f"rebuild it or delete the directory"
+            )
+        vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+        scales = np.load(directory / "scales.npy", mmap_mode="r") if self.dtype == "int8" else None
+        if len(vectors) != len(manifest["ids"]):
+            raise ValueError(f"Index at {directory} is incomplete: {len(vectors)} vectors, {len(manifest['ids'])} ids")
+        self._filter_rows = {}
+        self._vector_buffer = self._scale_buffer = None
+        self.ids = manifest["ids"]
+        self.texts = manifest["texts"]
+        self.metadatas = manifest["metadatas"]
+        self.vectors = vectors
+        self.scales = scales
+
+    def persist(self):
+        """Write the rows if they changed since the last write, then reopen them memory-mapped"""
+        if self.path and self.dirty:
+            self._save()
+        self.dirty = False
+
+    @contextmanager
+    def _save_lock(self):
+        """Exclusive lock on the collection directory, held by one saving process at a time"""
+        with open(self.path / ".lock", "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _save(self):
+        """
+        Write the rows to a new version directory and point CURRENT at it
+
+        The pointer is swapped with one os.replace, so a reader sees either
+        the old version or the new one. The version it replaced is kept for
+        readers that already read the old pointer; older ones are removed.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._save_lock():
+            version = Path(tempfile.mkdtemp(prefix=VERSION_PREFIX, dir=self.path))
+            np.save(version / "vectors.npy", np.ascontiguousarray(self.vectors))
+            if self.scales is not None:
+                np.save(version / "scales.npy", np.ascontiguousarray(self.scales))
+            with open(version / "chunks.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "dtype": self.dtype,
+                    "ids": self.ids,
+                    "texts": self.texts,
+                    "metadatas": self.metadatas
+                }, f, ensure_ascii=False)
+
+            previous = self._version_dir()
+            fd, tmp = tempfile.mkstemp(prefix=f".{CURRENT_FILE}.", dir=self.path)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(version.name)
+            os.replace(tmp, self.path / CURRENT_FILE)
+
+            for old in self.path.glob(f"{VERSION_PREFIX}*"):
+                if old not in (version, previous):
+                    shutil.rmtree(old, ignore_errors=True)
+            if previous == self.path:
+                for name in ("chunks.json", "vectors.npy", "scales.npy"):
+                    (self.path / name).unlink(missing_ok=True)
+            # Opened before the lock is released, after which another save may remove it
+            self._load_version(version)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self.embedding_function.embed_documents(texts), metadatas, ids)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Add texts with embeddings computed elsewhere (e.g. copied from another index)"""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+
+        vectors, scales = _quantize(embeddings, self.dtype)
+        self._append_rows(vectors, scales)
+        self.ids = self.ids + ids
+        self.texts = self.texts + texts
+        self.metadatas = self.metadatas + [dict(m) for m in metadatas]
+        self._filter_rows = {}
+        self.dirty = True
+        return ids
+
+    def _append_rows(self, vectors: np.ndarray, scales: Optional[np.ndarray]):
+        """Copy rows into the buffers, doubling them when full, so adding in batches stays linear"""
+        count, added = len(self.ids), len(vectors)
+        if self._vector_buffer is None or len(self._vector_buffer) < count + added:
+            capacity = max(count + added, 2 * count, 1024)
+            vector_buffer = np.empty((capacity, vectors.shape[1]), dtype=vectors.dtype)
+            scale_buffer = np.empty(capacity, dtype=np.float32) if scales is not None else None
+            if count:
+                vector_buffer[:count] = self.vectors
+                if scales is not None:
+                    scale_buffer[:count] = self.scales
+            self._vector_buffer, self._scale_buffer = vector_buffer, scale_buffer
+        self._vector_buffer[count:count + added] = vectors
+        self.vectors = self._vector_buffer[:count + added]
+        if scales is not None:
+            self._scale_buffer[count:count + added] = scales
+            self.scales = self._scale_buffer[:count + added]
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        removed = set(ids)
+        keep = np.array([i not in removed for i in self.ids], dtype=bool)
+        self.ids = [i for i, k in zip(self.ids, keep) if k]
+        self.texts = [t for t, k in zip(self.texts, keep) if k]
+        self.metadatas = [m for m, k in zip(self.metadatas, keep) if k]
+        self.vectors = np.asarray(self.vectors)[keep]
+        self._vector_buffer = self.vectors
+        if self.scales is not None:
+            self.scales = np.asarray(self.scales)[keep]
+            self._scale_buffer = self.scales
+        self._filter_rows = {}
+        self.dirty = True
+        return True
+
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Stored ids (and documents/metadatas/embeddings if included), all or only the given ids, like Chroma.get"""
+        if ids is None:
+            rows = list(range(len(self.ids)))
+        else:
+            wanted = set(ids)
+            rows = [row for row, chunk_id in enumerate(self.ids) if chunk_id in wanted]
+        result = {"ids": [self.ids[row] for row in rows]}
+        include = ["documents", "metadatas"] if include is None else include
+        if "documents" in include:
+            result["documents"] = [self.texts[row] for row in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [self.metadatas[row] for row in rows]
+        if "embeddings" in include:
+            scales = self.scales[rows] if self.scales is not None else None
+            result["embeddings"] = _dequantize(np.asarray(self.vectors)[rows], scales)
+        return result
+
+    def filter_rows(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Indices of rows whose metadata equals every value in filter (None when unfiltered)"""
+        if not filter:
+            return None
+        key = tuple(sorted(filter.items()))
+        if key not in self._filter_rows:
+            self._filter_rows[key] = np.array([
+                i for i, metadata in enumerate(self.metadatas)
+                if all(metadata.get(field) == value for field, value in filter.items())
+            ], dtype=np.int64)
+        return self._filter_rows[key]
+
+    def scores(self, embedding: List[float], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of the query to every stored vector, or only to the given rows"""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        query = query / norm if norm else query
+        count = len(self.vectors) if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCORE_BLOCK_ROWS):
+            if rows is None:
+                block = self.vectors[start:start + SCORE_BLOCK_ROWS]
+            else:
+                block = self.vectors[rows[start:start + SCORE_BLOCK_ROWS]]
+            scores[start:start + len(block)] = _to_float32(block) @ query
+        if self.scales is not None:
+            scores *= self.scales if rows is None else self.scales[rows]
+        return scores
+
+    def top_k(
+        self,
+        embedding: List[float],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the k most similar vectors (among rows matching filter), best first"""
+        rows = self.filter_rows(filter)
+        scores = self.scores(embedding, rows)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return (order if rows is None else rows[order]), scores[order]
+
+    def _document(self, index: int) -> Document:
+        return Document(page_content=self.texts[index], metadata=self.metadatas[index])
+
+    # filter is a dict of metadata values that must all be equal, e.g. {"category": "hours"}
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        indices, scores = self.top_k(embedding, k, filter)
+        return [(self._document(i), float(s)) for i, s in zip(indices, scores)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k, filter)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return self.similarity_search_by_vector(self.embedding_function.embed_query(query), k, filter)
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        indices, relevance = self.top_k(embedding, fetch_k, filter)
+        if not len(indices):
+            return []
+        # Candidate vectors are few, so they are compared at full precision
+        candidates = _dequantize(
+            self.vectors[indices],
+            self.scales[indices] if self.scales is not None else None
+        )
+
+        selected = [0]
+        # Highest similarity of each candidate to anything already selected
+        redundancy = candidates @ candidates[0]
+        available = np.ones(len(indices), dtype=bool)
+        available[0] = False
+        while len(selected) < min(k, len(indices)):
+            mmr = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            available[best] = False
+            redundancy = np.maximum(redundancy, candidates @ candidates[best])
+        return [self._document(indices[i]) for i in selected]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return self.max_marginal_relevance_search_by_vector(
+            self.embedding_function.embed_query(query), k, fetch_k, lambda_mult, filter
+        )
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> "NumpyVectorStore":
+        store = cls(embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        store.persist()
+        return store
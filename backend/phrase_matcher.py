@@ -0,0 +1,115 @@
+# phrase_matcher.py
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+ALIAS = "alias"
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    phrase: str
+    entries: Tuple[Tuple[str, Any], ...]
+
+    def values(self, kind: str) -> List[Any]:
+        """Values registered for this phrase under one kind, e.g. the room id of an alias"""
+        return [value for entry_kind, value in self.entries if entry_kind == kind]
+
+
+class PhraseMatcher:
+    def __init__(self, phrases: Iterable[Tuple[str, str, Any]]):
+        """
+        Aho-Corasick automaton over the room aliases the receptionist knows
+
+        One pass over a query finds all phrases in it, however many there
+        are, instead of testing each phrase with `in`. A match has to start
+        at a word boundary, so "reference" is not found in "preference",
+        but it may run into a longer word ("admin" in "administration").
+
+        Args:
+            phrases: (phrase, kind, value) triples; phrases are matched lowercased,
+                and a phrase registered more than once keeps every (kind, value)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self.phrases: List[str] = []
+        entries: List[List[Tuple[str, Any]]] = []
+        ids: Dict[str, int] = {}
+
+        for phrase, kind, value in phrases:
+            phrase = phrase.lower()
+            if not phrase:
+                continue
+            if phrase not in ids:
+                ids[phrase] = len(self.phrases)
+                self.phrases.append(phrase)
+                entries.append([])
+                self._add(phrase, ids[phrase])
+            entries[ids[phrase]].append((kind, value))
+        self.entries = [tuple(phrase_entries) for phrase_entries in entries]
+        self._link()
+
+    def _add(self, phrase: str, phrase_id: int):
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (phrase_id,)
+
+    def _link(self):
+        """Breadth-first failure links; each state also reports the phrases ending at its fallbacks"""
+        # States one character deep fall back to the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find_all(self, text: str) -> List[Match]:
+        """Every occurrence of every phrase in lowercased text, overlapping ones included, by end position"""
+        goto, fail, output = self._goto, self._fail, self._output
+        phrases, entries = self.phrases, self.entries
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase_id in output[state]:
+                phrase = phrases[phrase_id]
+                start = i + 1 - len(phrase)
+                if start == 0 or not text[start - 1].isalnum():
+                    matches.append(Match(start, i + 1, phrase, entries[phrase_id]))
+        return matches
+
+    @staticmethod
+    def longest(matches: Iterable[Match], kind: Optional[str] = None) -> List[Match]:
+        """Leftmost-longest non-overlapping matches, optionally only phrases registered under kind"""
+        if kind is not None:
+            matches = [match for match in matches if any(entry[0] == kind for entry in match.entries)]
+        chosen = []
+        last_end = 0
+        for match in sorted(matches, key=lambda match: (match.start, -match.end)):
+            if match.start >= last_end:
+                chosen.append(match)
+                last_end = match.end
+        return chosen
+
+    def find(self, text: str, kind: Optional[str] = None) -> List[Match]:
+        """Longest non-overlapping matches in lowercased text, left to right"""
+        return self.longest(self.find_all(text), kind)
@@ -0,0 +1,64 @@
+# snapshot_watcher.py
+import logging
+import threading
+from typing import Optional
+
+
+class SnapshotWatcher:
+    def __init__(self, rag, interval: float = 60.0):
+        """
+        Polls the data directory and hot-swaps the RAG index when a newer finished crawl appears
+
+        A crawl is finished once the scraper has written its changes.json,
+        which it does after the cleaned pages and facts. Reloads run in the
+        watcher's thread; queries keep using the live index meanwhile. Each
+        new crawl is loaded once, so a snapshot picked through the admin
+        endpoint is not replaced until the next crawl finishes.
+
+        Args:
+            rag: LibraryRAG whose reload() is called
+            interval: Seconds between checks
+        """
+        self.rag = rag
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_seen = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="snapshot-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> bool:
+        """Reload if the newest finished crawl is newer than the live snapshot; returns whether it did"""
+        try:
+            latest = self.rag.latest_snapshot_dir(complete=True)
+        except ValueError:
+            return False
+        if latest == self.last_seen:
+            return False
+        live = self.rag.snapshot_dir
+        if latest == live or (live and latest.stat().st_mtime <= live.stat().st_mtime):
+            self.last_seen = latest
+            return False
+        self.logger.info(f"New snapshot {latest.name}, reloading the index")
+        try:
+            reloaded = self.rag.reload(latest)
+        except Exception as e:
+            # The live index keeps serving; the next check tries again
+            self.logger.error(f"Reloading {latest.name} failed: {e}")
+            return False
+        # A reload already running (e.g. from the admin endpoint) means trying again next time
+        if reloaded:
+            self.last_seen = latest
+        return reloaded
@@ -0,0 +1,128 @@
+# stacks_locator.py
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+# Class letters, class number with optional decimal, then cutters and dates
+CALL_NUMBER = re.compile(r"^([A-Z]{1,3})(?:\s*(\d{1,5})(?:\.(\d+))?)?([A-Z0-9\s.]*)$")
+# Cutters (".P98"), dates and volumes ("2003", "1999b"); a bare run of letters is not valid
+CALL_NUMBER_PART = re.compile(r"[A-Z]\d+|\d+[A-Z]?|[A-Z]+")
+# A call number inside a sentence; needs a decimal or cutter so "B238" or "Room 3370" is not one
+CALL_NUMBER_IN_TEXT = re.compile(
+    r"\b[A-Z]{1,3} ?\d{1,5}(?:\.\d+(?:\s*\.?[A-Z]\d+)*|(?:\s*\.?[A-Z]\d+)+)(?:\s+\d{4})?\b",
+    re.IGNORECASE
+)
+# Sorts after every character a key can hold, so an end key covers what is filed under it
+KEY_END = "~"
+# Width of the padded class letters that start every key
+CLASS_WIDTH = 3
+
+
+class Shelf(NamedTuple):
+    start: str
+    end: str
+    node: str
+    label: str
+
+
+def normalize_call_number(call_number: str) -> Optional[str]:
+    """
+    Sort key for an LC call number, or None if it is not one
+
+    "QA76.73.P98 S63 2003", "qa 76.73 .p98 s63 2003" and "QA 76.73 P98 S63
+    2003" give the same key. Keys compare as strings in shelf order: the
+    class letters are padded to three and the class number to five digits,
+    and a space, which sorts before digits and letters, separates cutters.
+    """
+    match = CALL_NUMBER.match(" ".join(call_number.upper().split()))
+    if not match:
+        return None
+    letters, number, decimal, rest = match.groups()
+    parts = CALL_NUMBER_PART.findall(rest)
+    if (parts and not number) or any(part.isalpha() for part in parts):
+        return None
+    key = letters.ljust(CLASS_WIDTH)
+    if number:
+        key += number.zfill(5)
+        if decimal and decimal.rstrip("0"):
+            key += "." + decimal.rstrip("0")
+    for part in parts:
+        key += " " + part
+    return key
+
+
+def range_end_key(key: str) -> str:
+    """
+    Key just past everything filed under the end of a range
+
+    A class such as "L" covers its subclasses LA to LT. Otherwise only
+    cutters and dates, which follow a space, are covered: "QA76.9" includes
+    "QA76.9 .C65 2003" but not "QA76.95", a later class number.
+    """
+    if len(key) == CLASS_WIDTH:
+        return key.rstrip() + KEY_END
+    return key + " " + KEY_END
+
+
+def find_call_number(text: str) -> Optional[str]:
+    """First call number in free text, e.g. "where is QA76.73 .P98?", or None"""
+    match = CALL_NUMBER_IN_TEXT.search(text)
+    return match.group(0).upper() if match else None
+
+
+class StacksLocator:
+    def __init__(self, ranges: Iterable[dict]):
+        """
+        Interval index from LC call-number ranges to the floor-graph node of their shelves
+
+        Ranges are sorted by start key once; a lookup bisects for the last
+        range starting at or before the call number and checks its end, so
+        it takes O(log n) however many shelves are listed. An end covers
+        the cutters and dates filed under it, and a class end its
+        subclasses; see range_end_key.
+
+        Args:
+            ranges: Dicts with "start" and "end" call numbers, the shelf's "node"
+                id and an optional "label" such as "Ranges 12-18"
+
+        Raises:
+            ValueError: A call number does not parse, or two ranges overlap
+        """
+        shelves = []
+        for row in ranges:
+            start, end = normalize_call_number(row["start"]), normalize_call_number(row["end"])
+            for call_number, key in ((row["start"], start), (row["end"], end)):
+                if key is None:
+                    raise ValueError(f"Not an LC call number: '{call_number}'")
+            end = range_end_key(end)
+            if end < start:
+                raise ValueError(f"Range {row['start']} - {row['end']} ends before it starts")
+            shelves.append(Shelf(start, end, row["node"], row.get("label", "")))
+        shelves.sort()
+        for previous, shelf in zip(shelves, shelves[1:]):
+            if shelf.start <= previous.end:
+                raise ValueError(f"Ranges for {previous.node} and {shelf.node} overlap at '{shelf.start.strip()}'")
+
+        self.shelves: List[Shelf] = shelves
+        self.starts: List[str] = [shelf.start for shelf in shelves]
+
+    @classmethod
+    def load(cls, path: Path) -> "StacksLocator":
+        """Read a JSON file with a "ranges" list"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["ranges"])
+
+    def __len__(self) -> int:
+        return len(self.shelves)
+
+    def locate(self, call_number: str) -> Optional[Shelf]:
+        """Shelf range holding call_number, or None if it does not parse or no range covers it"""
+        key = normalize_call_number(call_number)
+        if key is None:
+            return None
+        i = bisect_right(self.starts, key) - 1
+        if i >= 0 and key <= self.shelves[i].end:
+            return self.shelves[i]
+        return None
@@ -0,0 +1,40 @@
+# stress_map_rendering.py
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from Main_Graph import ReceptionistSystem
+
+
+def main(requests: int = 400, workers: int = 16, seed: int = 0):
+    """Render route maps from many threads and compare them to serial renders"""
+    receptionist = ReceptionistSystem()
+    node_ids = list(receptionist.floor_plan["nodes"])
+    rng = random.Random(seed)
+    pairs = [tuple(rng.sample(node_ids, 2)) for _ in range(requests)]
+
+    # Reference images rendered one at a time
+    expected = {}
+    for start, goal in set(pairs):
+        expected[(start, goal)] = receptionist.plan_route(start, goal)
+
+    def run(pair):
+        return pair, receptionist.plan_route(*pair)
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, pairs))
+    elapsed = time.perf_counter() - begin
+
+    mismatches = [pair for pair, result in results if result != expected[pair]]
+
+    print(f"{requests} concurrent directions requests on {workers} threads in {elapsed:.2f}s")
+    print(f"Distinct routes: {len(expected)}")
+    print(f"Mismatched maps or directions: {len(mismatches)}")
+    for start, goal in mismatches[:10]:
+        print(f"  {start} -> {goal}")
+    return not mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,6 @@
+# conftest.py
+import sys
+from pathlib import Path
+
+# Backend modules import each other by top-level name, as when run from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,94 @@
+# test_answer_cache.py
+import pytest
+from answer_cache import AnswerCache, normalize_question
+
+
+class Embedder:
+    """Embeds by a fixed vector per question, counting calls; fails while broken is set"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = 0
+        self.broken = False
+
+    def __call__(self, text):
+        self.calls += 1
+        if self.broken:
+            raise TimeoutError("embedding request timed out")
+        return self.vectors[text]
+
+
+@pytest.fixture
+def embedder():
+    return Embedder({
+        "when does the library open": [1.0, 0.0, 0.0],
+        "what time does the library open": [0.99, 0.1, 0.0],
+        "where are the printers": [0.0, 1.0, 0.0],
+    })
+
+
+def test_normalize_question():
+    assert normalize_question("  When does the Library OPEN?! ") == "when does the library open"
+
+
+def test_exact_hit_ignores_case_and_punctuation():
+    cache = AnswerCache(max_entries=4)
+    cache.put("When does the library open?", {"answer": "8am"}, cost=2.0)
+    assert cache.get("when does the library open") == {"answer": "8am"}
+    assert cache.get("Where are the printers?") is None
+    stats = cache.get_stats()
+    assert (stats["exact_hits"], stats["misses"], stats["saved_seconds"]) == (1, 1, 2.0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AnswerCache(max_entries=2)
+    cache.put("a", {"answer": "a"})
+    cache.put("b", {"answer": "b"})
+    cache.get("a")
+    cache.put("c", {"answer": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_expired_entry_is_not_served(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("answer_cache.time.time", lambda: now[0])
+    cache = AnswerCache(ttl_seconds=60)
+    cache.put("a", {"answer": "a"})
+    now[0] += 59
+    assert cache.get("a")
+    now[0] += 2
+    assert cache.get("a") is None
+
+
+def test_semantic_hit_embeds_each_question_once(embedder):
+    cache = AnswerCache(similarity_threshold=0.95, embed=embedder)
+    assert cache.get("When does the library open?") is None
+    cache.put("When does the library open?", {"answer": "8am"})
+    assert embedder.calls == 1
+    assert cache.get("What time does the library open?") == {"answer": "8am"}
+    assert cache.get("Where are the printers?") is None
+    assert cache.get_stats()["semantic_hits"] == 1
+
+
+def test_embedding_failure_is_a_miss(embedder):
+    cache = AnswerCache(similarity_threshold=0.95, embed=embedder)
+    embedder.broken = True
+    assert cache.get("When does the library open?") is None
+    cache.put("When does the library open?", {"answer": "8am"})
+    # Stored without a vector: exact hits only
+    assert cache.get("when does the library open") == {"answer": "8am"}
+    assert cache.get("What time does the library open?") is None
+
+    embedder.broken = False
+    assert cache.get("What time does the library open?") is None
+
+
+def test_results_of_an_older_generation_are_dropped():
+    cache = AnswerCache()
+    cache.put("a", {"answer": "old"}, generation=0)
+    cache.clear(generation=1)
+    cache.put("a", {"answer": "old"}, generation=0)
+    assert cache.get("a") is None
+    cache.put("a", {"answer": "new"}, generation=1)
+    assert cache.get("a") == {"answer": "new"}
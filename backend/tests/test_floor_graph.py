@@ -0,0 +1,98 @@
+# test_floor_graph.py
+import itertools
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from bench_routing import synthetic_building
+from floor_graph import FloorGraph
+from Main_Graph import ReceptionistSystem
+from route_table import RouteTable
+
+
+def floor(level, *names, spacing=10):
+    nodes = {name: {"x": i * spacing, "y": 0, "label": name} for i, name in enumerate(names)}
+    edges = [{"from": a, "to": b, "weight": spacing} for a, b in zip(names, names[1:])]
+    return {"id": str(level), "level": level, "nodes": nodes, "edges": edges}
+
+
+@pytest.fixture
+def building():
+    floors = [floor(level, f"stairs{level}", f"hall{level}", f"lift{level}") for level in range(4)]
+    connectors = [
+        {"type": "stairs", "per_floor": 120, "nodes": [f"stairs{level}" for level in range(4)]},
+        {"type": "elevator", "wait": 60, "per_floor": 10, "nodes": [f"lift{level}" for level in range(4)]},
+    ]
+    return FloorGraph(floors, connectors, landmarks=2)
+
+
+def test_route_takes_the_cheapest_connector(building):
+    cost, path = building.route("stairs0", "hall3")
+    # One elevator ride of three floors beats three flights of stairs
+    assert path == ["stairs0", "hall0", "lift0", "lift3", "hall3"]
+    assert cost == pytest.approx(10 + 10 + 60 + 30 + 10)
+    assert building.edge_type("lift0", "lift3") == "elevator"
+    assert building.edge_type("stairs0", "stairs2") is None
+
+
+def test_connector_edges_match_the_graph(building):
+    elevator = [(e["from"], e["to"]) for e in building.connector_edges if e["type"] == "elevator"]
+    stairs = [(e["from"], e["to"]) for e in building.connector_edges if e["type"] == "stairs"]
+    assert len(elevator) == 6
+    assert stairs == [("stairs0", "stairs1"), ("stairs1", "stairs2"), ("stairs2", "stairs3")]
+    for edge in building.connector_edges:
+        assert building.edge_type(edge["from"], edge["to"]) == edge["type"]
+
+
+def test_unknown_nodes_are_rejected():
+    with pytest.raises(ValueError, match="unknown node"):
+        FloorGraph([{**floor(0, "a", "b"), "edges": [{"from": "a", "to": "c", "weight": 1}]}])
+    with pytest.raises(ValueError, match="more than one floor"):
+        FloorGraph([floor(0, "a", "b"), floor(1, "a")])
+
+
+def test_unreachable_and_unknown_targets():
+    graph = FloorGraph([floor(0, "a", "b"), floor(1, "c")])
+    assert graph.route("a", "c") is None
+    assert graph.route("a", "nowhere") is None
+    assert graph.route("a", "a") == (0.0, ["a"])
+
+
+@pytest.mark.parametrize("landmarks", [0, 8])
+def test_astar_matches_dijkstra(landmarks):
+    floors, connectors = synthetic_building(levels=3, side=8)
+    graph = FloorGraph(floors, connectors, landmarks=landmarks)
+    n = len(graph)
+    distances = dijkstra(csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n)))
+    for source, target in itertools.islice(itertools.permutations(range(0, n, 7), 2), 400):
+        cost, path = graph.astar(source, target)
+        assert cost == pytest.approx(distances[source, target], rel=1e-5)
+        assert path[0] == source and path[-1] == target
+
+
+def test_heuristic_never_overestimates():
+    floors, connectors = synthetic_building(levels=3, side=8)
+    graph = FloorGraph(floors, connectors)
+    n = len(graph)
+    distances = dijkstra(csr_matrix((graph.weights, graph.indices, graph.indptr), shape=(n, n)))
+    for target in range(0, n, 11):
+        assert (np.array(graph.heuristic(target)) <= distances[:, target] + 1e-3).all()
+
+
+def test_route_table_describes_an_elevator_ride_as_one_step(building):
+    table = RouteTable(building, lambda a, b, edge_type: [f"{edge_type} {a} -> {b}"])
+    assert table.directions("stairs0", "hall3") == [
+        "walk stairs0 -> hall0", "walk hall0 -> lift0", "elevator lift0 -> lift3", "walk lift3 -> hall3"
+    ]
+    assert table.distance("stairs0", "missing") == float("inf")
+
+
+def test_receptionist_edge_list_links_every_elevator_pair():
+    receptionist = ReceptionistSystem()
+    listed = {
+        frozenset((edge["from"], edge["to"])) for edge in receptionist.floor_plan["edges"]
+        if edge.get("type") == "elevator"
+    }
+    for connector in receptionist.building["connectors"]:
+        if connector["type"] == "elevator":
+            assert listed >= {frozenset(pair) for pair in itertools.combinations(connector["nodes"], 2)}
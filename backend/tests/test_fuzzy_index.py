@@ -0,0 +1,42 @@
+# test_fuzzy_index.py
+import pytest
+from fuzzy_index import FuzzyIndex, normalize, trigrams
+
+
+@pytest.fixture
+def index():
+    return FuzzyIndex([
+        ("Periodicals Reading Room", "periodicals"),
+        ("periodicals", "periodicals"),
+        ("Government Documents", "govDocs"),
+        ("Music Library", "music"),
+        ("Café Bergson", "cafe"),
+    ])
+
+
+def test_normalize_strips_accents_case_and_punctuation():
+    assert normalize("  Café   Bergson! ") == "cafe bergson"
+
+
+def test_dice_score_of_trigram_sets(index):
+    assert index.search("Music Library", limit=1)[0].score == pytest.approx(1.0)
+    a, b = trigrams("musci library"), trigrams("music library")
+    expected = 2 * len(a & b) / (len(a) + len(b))
+    assert index.search("musci library", limit=1)[0].score == pytest.approx(expected)
+
+
+def test_misspellings_find_the_room(index):
+    assert index.search("goverment docments", limit=1)[0].value == "govDocs"
+    assert index.search("cafe bergsen", limit=1)[0].value == "cafe"
+
+
+def test_one_candidate_per_value_best_name_first(index):
+    candidates = index.search("periodicals", limit=5)
+    assert [c.value for c in candidates].count("periodicals") == 1
+    assert candidates[0].name == "periodicals"
+
+
+def test_cutoff_and_no_overlap(index):
+    assert index.search("music", cutoff=0.99) == []
+    assert index.search("xyz") == []
+    assert all(c.score >= 0.3 for c in index.search("library", cutoff=0.3))
@@ -0,0 +1,29 @@
+# test_intent_classifier.py
+from types import SimpleNamespace
+from intent_classifier import DIRECTIONS, INFORMATION, IntentClassifier
+from text_match import compile_phrases
+
+
+def test_compile_phrases_matches_whole_words_longest_first():
+    pattern = compile_phrases(["study", "study room", "study room"])
+    assert pattern.findall("is the study room free? I study there") == ["study room", "study"]
+    assert pattern.findall("students") == []
+
+
+def classifier():
+    receptionist = SimpleNamespace(room_aliases={"forum room": "forumRoom"}, area_descriptors={"quiet area": []})
+    return IntentClassifier(receptionist)
+
+
+def test_clear_questions_are_answered_locally():
+    intents = classifier()
+    assert intents.classify("how do I get to the forum room")[0] == DIRECTIONS
+    assert intents.classify("what are the library hours today")[0] == INFORMATION
+    assert intents.resolve("where is QA76.73 .P98", fallback=lambda query: INFORMATION) == DIRECTIONS
+    assert intents.get_stats()["local_hits"] == 1
+
+
+def test_unclear_questions_fall_back():
+    intents = classifier()
+    assert intents.resolve("hello", fallback=lambda query: "FALLBACK") == "FALLBACK"
+    assert intents.get_stats()["llm_fallbacks"] == 1
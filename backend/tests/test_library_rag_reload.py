@@ -0,0 +1,72 @@
+# test_library_rag_reload.py
+import threading
+import pytest
+from library_rag import LibraryRAG
+
+
+class BlockingChain:
+    """QA chain stand-in that answers with a fixed text once released"""
+
+    def __init__(self, answer, block=False):
+        self.answer = answer
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, inputs, callbacks=None):
+        self.started.set()
+        self.release.wait(timeout=10)
+        return {"answer": self.answer, "source_documents": []}
+
+
+class Store:
+    """Vector store stand-in; reload only needs something it can watch for collection"""
+
+
+@pytest.fixture
+def rag(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_EMBED_LATENCY", "0,0")
+    rag = LibraryRAG(data_dir=str(tmp_path), persist_dir=None, cache_size=8)
+    rag.vectorstore = Store()
+    rag.qa_chain = BlockingChain("old index answer", block=True)
+
+    new_chain = BlockingChain("new index answer")
+
+    def create_vectorstore(self, batch_size=256, snapshot_dir=None, seed=None):
+        self.vectorstore = Store()
+        self.snapshot_dir = snapshot_dir
+
+    def setup_qa_chain(self):
+        self.qa_chain = new_chain
+
+    monkeypatch.setattr(LibraryRAG, "create_vectorstore", create_vectorstore)
+    monkeypatch.setattr(LibraryRAG, "setup_qa_chain", setup_qa_chain)
+    return rag
+
+
+def test_query_running_during_reload_does_not_cache_old_answer(rag, tmp_path):
+    old_chain = rag.qa_chain
+    results = []
+    query = threading.Thread(target=lambda: results.append(rag.query("When does the library open?")))
+    query.start()
+    assert old_chain.started.wait(timeout=10)
+
+    assert rag.reload(tmp_path / "2024-01-01")
+    old_chain.release.set()
+    query.join(timeout=10)
+
+    # The query finishes on the index it started with...
+    assert results == [{"answer": "old index answer", "sources": []}]
+    # ...but its answer is not served from the new index's cache
+    assert rag.answer_cache.get_stats()["entries"] == 0
+    assert rag.query("When does the library open?")["answer"] == "new index answer"
+
+
+def test_query_after_reload_is_cached(rag, tmp_path):
+    assert rag.reload(tmp_path / "2024-01-01")
+    rag.query("When does the library open?")
+
+    assert rag.answer_cache.get_stats()["entries"] == 1
+    assert rag.get_cached_answer("When does the library open?", [])["answer"] == "new index answer"
@@ -0,0 +1,50 @@
+# test_location_index.py
+import pytest
+from location_index import LocationIndex, tokenize
+from Main_Graph import ReceptionistSystem
+
+
+@pytest.fixture
+def index():
+    return LocationIndex([
+        ("study tables", ["commons", "reading"], 0.3),
+        ("glass walls", ["commons"], 0.4),
+        ("wall mounted display", ["media"], 0.4),
+        ("help desk", ["commons"], 0.2),
+        ("help desk", ["media"], 0.2),
+    ])
+
+
+def test_tokenize_drops_case_punctuation_and_plural_s():
+    assert tokenize("Wall-mounted Displays, glass!") == ["wall", "mounted", "display", "glass"]
+    assert tokenize("glass class") == ["glass", "class"]
+
+
+def test_scores_sum_each_phrase_once(index):
+    ranked = index.rank("glass walls and study tables, more study tables", limit=3)
+    assert ranked == [("commons", pytest.approx(0.7)), ("reading", pytest.approx(0.3))]
+
+
+def test_phrases_match_whole_words_only(index):
+    assert index.rank("a wall mounted displays here") == [("media", pytest.approx(0.4))]
+    assert index.rank("wall mounted") == []
+    assert index.rank("glasswalls") == []
+
+
+def test_phrase_registered_twice_counts_for_both_places(index):
+    ranked = dict(index.rank("i see a help desk"))
+    assert ranked == {"commons": pytest.approx(0.2), "media": pytest.approx(0.2)}
+
+
+def test_limit_and_empty_text(index):
+    assert len(index.rank("glass walls study tables help desk", limit=1)) == 1
+    assert index.rank("") == []
+    assert not index.scores("nothing known").any()
+
+
+def test_receptionist_finds_a_lost_user():
+    receptionist = ReceptionistSystem()
+    phrase = next(iter(receptionist.area_descriptors))
+    top, score = receptionist.location_index.rank(f"i'm lost, i can see {phrase}", limit=1)[0]
+    assert top in receptionist.area_descriptors[phrase]
+    assert score > 0
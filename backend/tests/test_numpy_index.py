@@ -0,0 +1,108 @@
+# test_numpy_index.py
+import json
+import multiprocessing
+import numpy as np
+import pytest
+from llm_backends import LatencyModel, LocalEmbeddings
+from numpy_index import CURRENT_FILE, NumpyVectorStore
+
+TEXTS = [
+    "The library opens at 8am on weekdays",
+    "Group study rooms can be booked online",
+    "Printers and scanners are on the first floor",
+    "Interlibrary loan requests take three days",
+]
+
+
+@pytest.fixture
+def embeddings():
+    return LocalEmbeddings(latency=LatencyModel.from_env("UNSET_TEST_LATENCY", "0,0"))
+
+
+def open_store(embeddings, path, dtype="float16"):
+    return NumpyVectorStore(embeddings, persist_directory=str(path), collection_name="chunks", dtype=dtype)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_persist_and_load_round_trip(embeddings, tmp_path, dtype):
+    store = open_store(embeddings, tmp_path, dtype)
+    ids = store.add_texts(TEXTS, metadatas=[{"category": str(i % 2)} for i in range(4)], ids=list("abcd"))
+    store.delete(ids=["b"])
+    store.persist()
+
+    reopened = open_store(embeddings, tmp_path, dtype)
+    assert reopened.ids == ["a", "c", "d"]
+    assert reopened.texts == [TEXTS[0], TEXTS[2], TEXTS[3]]
+    assert reopened.metadatas == [{"category": "0"}, {"category": "0"}, {"category": "1"}]
+    assert np.array_equal(np.asarray(reopened.vectors), np.asarray(store.vectors))
+    assert ids == list("abcd")
+
+    found = reopened.similarity_search("where are the printers", k=1)
+    assert found[0].page_content == TEXTS[2]
+    assert reopened.similarity_search("printers", k=2, filter={"category": "1"})[0].page_content == TEXTS[3]
+
+
+def test_changes_are_written_only_on_persist(embeddings, tmp_path):
+    store = open_store(embeddings, tmp_path)
+    store.add_texts(TEXTS[:2], ids=["a", "b"])
+    assert not (tmp_path / "chunks" / CURRENT_FILE).exists()
+    store.persist()
+    store.add_texts(TEXTS[2:], ids=["c", "d"])
+    assert open_store(embeddings, tmp_path).ids == ["a", "b"]
+    store.persist()
+    assert open_store(embeddings, tmp_path).ids == ["a", "b", "c", "d"]
+
+
+def test_saves_keep_only_the_current_and_previous_version(embeddings, tmp_path):
+    store = open_store(embeddings, tmp_path)
+    for i, text in enumerate(TEXTS):
+        store.add_texts([text], ids=[str(i)])
+        store.persist()
+    versions = [path for path in (tmp_path / "chunks").iterdir() if path.is_dir()]
+    assert len(versions) == 2
+    assert open_store(embeddings, tmp_path).ids == ["0", "1", "2", "3"]
+
+
+def test_reads_an_index_written_before_versions(embeddings, tmp_path):
+    store = open_store(embeddings, tmp_path)
+    store.add_texts(TEXTS, ids=list("abcd"))
+    store.persist()
+    collection = tmp_path / "chunks"
+    version = collection / (collection / CURRENT_FILE).read_text()
+    for file in version.iterdir():
+        file.rename(collection / file.name)
+    version.rmdir()
+    (collection / CURRENT_FILE).unlink()
+
+    legacy = open_store(embeddings, tmp_path)
+    assert legacy.ids == list("abcd")
+    legacy.add_texts(["Lockers are by the entrance"], ids=["e"])
+    legacy.persist()
+    assert not (collection / "chunks.json").exists()
+    assert open_store(embeddings, tmp_path).ids == list("abcde")
+
+
+def save_rows(path, rows, rounds):
+    store = open_store(LocalEmbeddings(latency=LatencyModel.from_env("UNSET_TEST_LATENCY", "0,0")), path)
+    for i in range(rounds):
+        store.delete(ids=store.ids)
+        store.add_embeddings([f"text {j}" for j in range(rows + i)], np.eye(rows + i, 8).tolist(),
+                             ids=[f"{j}" for j in range(rows + i)])
+        store.persist()
+
+
+def test_loads_never_see_a_half_written_save(embeddings, tmp_path):
+    save_rows(tmp_path, 4, 1)
+    writers = [multiprocessing.Process(target=save_rows, args=(tmp_path, rows, 20)) for rows in (4, 40)]
+    for writer in writers:
+        writer.start()
+    try:
+        while any(writer.is_alive() for writer in writers):
+            store = open_store(embeddings, tmp_path)
+            assert len(store.vectors) == len(store.ids)
+    finally:
+        for writer in writers:
+            writer.join()
+    assert all(writer.exitcode == 0 for writer in writers)
+    with open(tmp_path / "chunks" / (tmp_path / "chunks" / CURRENT_FILE).read_text() / "chunks.json") as f:
+        assert json.load(f)["dtype"] == "float16"
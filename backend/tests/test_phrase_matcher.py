@@ -0,0 +1,54 @@
+# test_phrase_matcher.py
+import random
+import string
+from phrase_matcher import ALIAS, PhraseMatcher
+
+
+def matcher():
+    return PhraseMatcher([
+        ("Help Desk", ALIAS, "helpDesk"),
+        ("desk", ALIAS, "serviceDesk"),
+        ("reference", ALIAS, "reference"),
+        ("reference desk", ALIAS, "referenceDesk"),
+        ("admin", ALIAS, "office"),
+        ("map room", "landmark", "maps"),
+        ("map room", ALIAS, "mapCollection"),
+    ])
+
+
+def test_finds_overlapping_phrases_by_end_position():
+    found = [(m.phrase, m.start, m.end) for m in matcher().find_all("the reference desk")]
+    assert found == [("reference", 4, 13), ("reference desk", 4, 18), ("desk", 14, 18)]
+
+
+def test_match_must_start_at_a_word_boundary():
+    assert matcher().find_all("my preference") == []
+    # It may run into a longer word
+    assert [m.phrase for m in matcher().find_all("administration")] == ["admin"]
+
+
+def test_find_keeps_leftmost_longest_matches():
+    found = matcher().find("from the help desk to the reference desk")
+    assert [m.values(ALIAS)[0] for m in found] == ["helpDesk", "referenceDesk"]
+
+
+def test_phrase_registered_twice_keeps_every_entry():
+    found = matcher().find("the map room", ALIAS)
+    assert found[0].entries == (("landmark", "maps"), (ALIAS, "mapCollection"))
+    assert found[0].values(ALIAS) == ["mapCollection"]
+    assert found[0].values("landmark") == ["maps"]
+
+
+def test_matches_every_in_scan():
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(40)]
+    phrases = sorted(set(words))
+    automaton = PhraseMatcher((phrase, ALIAS, phrase) for phrase in phrases)
+    for _ in range(200):
+        text = " ".join(rng.choice(words + list(string.ascii_lowercase[:3])) for _ in range(8))
+        expected = sorted(
+            (start, start + len(phrase)) for phrase in phrases
+            for start in range(len(text)) if text.startswith(phrase, start)
+            and (start == 0 or not text[start - 1].isalnum())
+        )
+        assert sorted((m.start, m.end) for m in automaton.find_all(text)) == expected
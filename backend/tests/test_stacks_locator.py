@@ -0,0 +1,69 @@
+# test_stacks_locator.py
+import pytest
+from stacks_locator import StacksLocator, find_call_number, normalize_call_number
+
+
+def ranges(*rows):
+    return [{"start": start, "end": end, "node": node} for start, end, node in rows]
+
+
+def test_normalize_call_number_ignores_spacing_case_and_periods():
+    key = normalize_call_number("QA76.73.P98 S63 2003")
+    assert key == normalize_call_number("qa 76.73 .p98 s63 2003") == normalize_call_number("QA 76.73 P98 S63 2003")
+    assert normalize_call_number("Room 3370") is None
+    assert normalize_call_number("QA") == "QA "
+
+
+def test_keys_sort_in_shelf_order():
+    shelf_order = ["Q", "QA9", "QA76", "QA76.73 .P98", "QA76.9", "QA76.9 .C65 2003", "QA76.95", "QA700", "QB1"]
+    keys = [normalize_call_number(call_number) for call_number in shelf_order]
+    assert keys == sorted(keys)
+
+
+def test_find_call_number_needs_a_decimal_or_cutter():
+    assert find_call_number("where is qa76.73 .p98?") == "QA76.73 .P98"
+    assert find_call_number("how do I get to Room 3370?") is None
+
+
+def test_decimal_adjacent_ranges():
+    locator = StacksLocator(ranges(("QA1", "QA76.9", "lower"), ("QA76.95", "QA999", "upper")))
+    assert locator.locate("QA76.9").node == "lower"
+    assert locator.locate("QA76.9 .C65 2003").node == "lower"
+    assert locator.locate("QA76.95").node == "upper"
+    assert locator.locate("QA76.99 .X1").node == "upper"
+
+
+def test_exact_end_lookup():
+    locator = StacksLocator(ranges(("QA1", "QA76.9", "shelf")))
+    assert locator.locate("QA76.9").node == "shelf"
+    assert locator.locate("QA1").node == "shelf"
+    assert locator.locate("QA76.95") is None
+    assert locator.locate("QA77") is None
+
+
+def test_class_end_covers_subclasses():
+    locator = StacksLocator(ranges(("J", "L", "social"), ("M", "MT", "music")))
+    assert locator.locate("LB1028.3 .S6").node == "social"
+    assert locator.locate("L7").node == "social"
+    assert locator.locate("MT6 .A2").node == "music"
+    assert locator.locate("N7432") is None
+
+
+def test_gap_between_ranges_finds_nothing():
+    locator = StacksLocator(ranges(("QA1", "QA50", "a"), ("QA60", "QA99", "b")))
+    assert locator.locate("QA55.5") is None
+    assert locator.locate("PZ7 .S6") is None
+
+
+def test_overlapping_ranges_are_rejected():
+    with pytest.raises(ValueError, match="overlap"):
+        StacksLocator(ranges(("QA1", "QA76.9", "a"), ("QA76.9 .C1", "QA999", "b")))
+    with pytest.raises(ValueError, match="overlap"):
+        StacksLocator(ranges(("Q", "QB", "a"), ("QA500", "QA999", "b")))
+
+
+def test_bad_ranges_are_rejected():
+    with pytest.raises(ValueError, match="Not an LC call number"):
+        StacksLocator(ranges(("QA1", "Room 3370", "a")))
+    with pytest.raises(ValueError, match="ends before it starts"):
+        StacksLocator(ranges(("QA99", "QA1", "a")))
@@ -0,0 +1,9 @@
+# text_match.py
+import re
+from typing import Iterable
+
+
+def compile_phrases(phrases: Iterable[str]) -> re.Pattern:
+    """Compile phrases into one word-bounded alternation, longest first"""
+    ordered = sorted(set(phrases), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(p) for p in ordered) + r")\b")
@@ -0,0 +1,130 @@
+# warmup.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BackgroundWarmup:
+    def __init__(
+        self,
+        name: str,
+        task: Callable[[], Any],
+        started: Optional[float] = None,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 300.0
+    ):
+        """
+        Runs a slow startup task in a daemon thread, retrying until it succeeds
+
+        The server can accept requests while the task runs; callers check
+        `ready` and degrade until it is set. A failing attempt (e.g. an
+        embedding API error) is logged and retried with exponential backoff
+        instead of ending the process.
+
+        Args:
+            name: Name used in logs
+            task: Callable doing the work; it must be safe to call again after raising
+            started: time.perf_counter() value that startup times are measured from
+            retry_delay: Seconds before the first retry
+            max_retry_delay: Upper bound for the doubling retry delay
+        """
+        self.name = name
+        self.task = task
+        self.started = started if started is not None else time.perf_counter()
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.logger = logging.getLogger(__name__)
+
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.attempts = 0
+        self.last_error = None
+        self.ready_seconds = None
+
+    def start(self):
+        """Start the task once; later calls do nothing"""
+        with self._lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"warmup-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        delay = self.retry_delay
+        while True:
+            with self._lock:
+                self.attempts += 1
+                attempt = self.attempts
+            try:
+                self.task()
+            except Exception as e:
+                with self._lock:
+                    self.last_error = str(e)
+                self.logger.error(f"Warming up {self.name} failed (attempt {attempt}), retrying in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            with self._lock:
+                self.ready_seconds = time.perf_counter() - self.started
+                self.last_error = None
+            self._ready.set()
+            self.logger.info(f"{self.name} ready {self.ready_seconds:.2f}s after startup ({attempt} attempts)")
+            return
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the task has succeeded or the timeout passes; returns whether it is ready"""
+        return self._ready.wait(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "attempts": self.attempts,
+                "last_error": self.last_error,
+                "ready_seconds": self.ready_seconds,
+            }
+
+
+class StartupClock:
+    def __init__(self, started: Optional[float] = None):
+        """
+        Milestones of a process's startup, in seconds since `started`
+
+        Each milestone is recorded the first time it is marked, so marking it
+        on every request costs one dictionary lookup after the first.
+        """
+        self.started = started if started is not None else time.perf_counter()
+        self.milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def mark(self, milestone: str) -> Optional[float]:
+        """Record a milestone unless it already happened; returns its time if this call recorded it"""
+        if milestone in self.milestones:
+            return None
+        with self._lock:
+            if milestone in self.milestones:
+                return None
+            seconds = time.perf_counter() - self.started
+            self.milestones[milestone] = seconds
+        self.logger.info(f"Startup: {milestone} after {seconds:.2f}s")
+        return seconds
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.milestones)
+
+    def collector(self, name: str, documentation: str) -> Callable[[], List[str]]:
+        """/metrics collector exposing each recorded milestone as a gauge labelled by milestone"""
+        def collect() -> List[str]:
+            lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+            for milestone, seconds in sorted(self.get_stats().items(), key=lambda item: item[1]):
+                lines.append(f'{name}{{milestone="{milestone}"}} {seconds!r}')
+            return lines
+        return collect
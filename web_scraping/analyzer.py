@@ -11,7 +11,7 @@ from nltk.corpus import stopwords
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import logging
-import re
+from page_classifier import DATE_PATTERN, EMAIL_PATTERN, HOURS_TERMS, PHONE_PATTERN, SERVICE_KEYWORDS, TIME_PATTERN
 
 class LibraryDataAnalyzer:
     def __init__(self, base_dir: str):
@@ -106,13 +106,11 @@ class LibraryDataAnalyzer:
     def analyze_contacts(self) -> Dict[str, Any]:
         """Analyze contact information"""
         contacts = []
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b'
         
         for doc in self.data:
             content = doc.get('content', '')
-            emails = re.findall(email_pattern, content)
-            phones = re.findall(phone_pattern, content)
+            emails = EMAIL_PATTERN.findall(content)
+            phones = PHONE_PATTERN.findall(content)
             
             if emails or phones:
                 contacts.append({
@@ -134,10 +132,9 @@ class LibraryDataAnalyzer:
         
         for doc in self.data:
             content = doc.get('content', '').lower()
-            if any(term in content for term in ['hours', 'schedule', 'open', 'closed']):
+            if any(term in content for term in HOURS_TERMS):
                 # Look for time patterns
-                time_pattern = r'\b\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)\b'
-                times = re.findall(time_pattern, content)
+                times = TIME_PATTERN.findall(content)
                 
                 if times:
                     hours_info.append({
@@ -158,8 +155,7 @@ class LibraryDataAnalyzer:
             content = doc.get('content', '')
             if 'event' in content.lower():
                 # Look for date patterns
-                date_pattern = r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b'
-                dates = re.findall(date_pattern, content)
+                dates = DATE_PATTERN.findall(content)
                 
                 if dates:
                     events.append({
@@ -176,11 +172,10 @@ class LibraryDataAnalyzer:
     def analyze_services(self) -> Dict[str, Any]:
         """Analyze service information"""
         services = []
-        service_keywords = ['service', 'help', 'assistance', 'support', 'resource']
         
         for doc in self.data:
             content = doc.get('content', '').lower()
-            if any(keyword in content for keyword in service_keywords):
+            if any(keyword in content for keyword in SERVICE_KEYWORDS):
                 services.append({
                     'url': doc['url'],
                     'title': doc.get('title', ''),
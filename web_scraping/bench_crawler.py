@@ -0,0 +1,167 @@
+# bench_crawler.py
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from library_scraper import LibraryScraper
+
+
+def build_fixture_site(root: Path, pages: int, links_per_page: int, seed: int = 0) -> set:
+    """
+    Write a static site of linked pages and return the paths reachable from /
+
+    Pages also link to assets, fragments, query strings, other hosts and a
+    missing page, which the crawler must skip or tolerate.
+    """
+    rng = random.Random(seed)
+    links = {i: rng.sample(range(pages), links_per_page) for i in range(pages)}
+    links["index"] = list(range(1, min(pages, 4)))
+
+    for page, targets in links.items():
+        anchors = [f'<a href="/page-{t}.html">Page {t}</a>' for t in targets]
+        anchors += [
+            f'<a href="/page-{targets[0]}.html#section">Fragment</a>',
+            f'<a href="page-{targets[-1]}.html?ref=nav">Query string</a>',
+            '<a href="/files/guide.pdf">PDF</a>',
+            '<a href="https://example.org/elsewhere">Other host</a>',
+            '<a href="/missing.html">Broken link</a>',
+        ]
+        paragraphs = "".join(f"<p>Fixture page {page}, paragraph {n}. Library hours and services.</p>" for n in range(5))
+        html = (f"<html><head><title>Page {page}</title><style>p {{}}</style></head>"
+                f"<body><main>{paragraphs}<nav>{' '.join(anchors)}</nav></main></body></html>")
+        name = "index.html" if page == "index" else f"page-{page}.html"
+        (root / name).write_text(html, encoding="utf-8")
+
+    reachable, frontier = set(), deque(links["index"])
+    while frontier:
+        page = frontier.popleft()
+        if page not in reachable:
+            reachable.add(page)
+            frontier.extend(links[page])
+    return {f"/page-{page}.html" for page in reachable}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Static file handler that adds a fixed response latency and records request times"""
+
+    latency = 0.0
+    request_times = []
+    request_paths = []
+
+    def do_GET(self):
+        FixtureHandler.request_times.append(time.monotonic())
+        FixtureHandler.request_paths.append(self.path)
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients cancelled mid-response (the interrupted crawl) are expected
+        pass
+
+
+def serve(root: Path, latency: float) -> ThreadingHTTPServer:
+    FixtureHandler.latency = latency
+    server = FixtureServer(("127.0.0.1", 0), partial(FixtureHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def crawl(start_url: str, output_dir: str, mode: str, timeout: float = None, **kwargs):
+    """Run one crawl; with a timeout, an async crawl is cancelled like an interrupted run"""
+    scraper = LibraryScraper(start_url=start_url, base_output_dir=output_dir, max_pages=100000, **kwargs)
+    # The fixture's broken link is expected to fail on every run
+    logging.getLogger("library_scraper").setLevel(logging.CRITICAL)
+    FixtureHandler.request_times = []
+    FixtureHandler.request_paths = []
+    start = time.perf_counter()
+    if mode == "sync":
+        scraper.scrape()
+    else:
+        try:
+            asyncio.run(asyncio.wait_for(scraper.scrape_async(), timeout))
+        except asyncio.TimeoutError:
+            pass
+    elapsed = time.perf_counter() - start
+    return scraper, elapsed
+
+
+def check_resume(start_url: str, output_dir: str, expected: set, port: int, interrupt_after: float):
+    """Interrupt a crawl, resume it, and check nothing saved before the interruption is fetched again"""
+    first, _ = crawl(start_url, output_dir, "async", timeout=interrupt_after, delay=0, concurrency=4)
+    before = {url.split(str(port), 1)[1] for url in first.visited_urls}
+    resumed, _ = crawl(start_url, output_dir, "async", delay=0, concurrency=4, resume=True)
+    refetched = before & set(FixtureHandler.request_paths)
+    visited = {url.split(str(port), 1)[1] for url in resumed.visited_urls}
+    saved = sum(1 for _ in resumed.output_dir.glob("raw/*/*.json"))
+    valid = (resumed.output_dir == first.output_dir and not refetched
+             and visited - {"/"} == expected and saved == len(visited))
+    print(f"\nInterrupted after {len(before)} pages, resumed and fetched {len(visited) - len(before)} more: "
+          f"{len(refetched)} refetched, {'ok' if valid else 'MISMATCH'}")
+
+
+def peak_rate(times, window: float = 1.0) -> float:
+    """Most requests seen in any `window` seconds, per second"""
+    times = sorted(times)
+    best, start = 0, 0
+    for end in range(len(times)):
+        while times[end] - times[start] > window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best / window
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a local fixture site in each crawl mode and compare throughput")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--links", type=int, default=6, help="Links from each page to other pages")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the server takes per response")
+    parser.add_argument("--rate", type=float, default=20.0, help="Per-host requests/sec for the throttled run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as output:
+        expected = build_fixture_site(Path(site), args.pages, args.links)
+        server = serve(Path(site), args.latency)
+        start_url = f"http://127.0.0.1:{server.server_port}/"
+        print(f"Fixture site: {args.pages} pages, {len(expected)} reachable, {args.latency * 1000:.0f} ms per response\n")
+
+        runs = [
+            ("sync, no delay", "sync", {"delay": 0}),
+            ("async, concurrency 1", "async", {"delay": 0, "concurrency": 1}),
+            ("async, concurrency 4", "async", {"delay": 0, "concurrency": 4}),
+            ("async, concurrency 16", "async", {"delay": 0, "concurrency": 16}),
+            (f"async, 16, {args.rate:g} req/s", "async", {"concurrency": 16, "requests_per_second": args.rate}),
+        ]
+        print(f"{'mode':<26}{'pages':>7}{'seconds':>9}{'pages/s':>9}{'peak req/s':>12}{'checkpoint':>12}  valid")
+        for name, mode, kwargs in runs:
+            # Separate output roots so each run starts its own snapshot and manifest
+            scraper, elapsed = crawl(start_url, tempfile.mkdtemp(dir=output), mode, **kwargs)
+            visited = {url.split(str(server.server_port), 1)[1] for url in scraper.visited_urls}
+            saved = sum(1 for _ in scraper.output_dir.glob("raw/*/*.json"))
+            # The start URL is the index page itself
+            valid = visited - {"/"} == expected and saved == len(scraper.visited_urls)
+            print(f"{name:<26}{len(visited):>7}{elapsed:>9.2f}{len(visited) / elapsed:>9.1f}"
+                  f"{peak_rate(FixtureHandler.request_times):>12.1f}"
+                  f"{scraper.checkpoint.seconds / elapsed:>11.2%}  {'ok' if valid else 'MISMATCH'}")
+            if name == "async, concurrency 4":
+                interrupt_after = elapsed / 2
+
+        check_resume(start_url, tempfile.mkdtemp(dir=output), expected, server.server_port, interrupt_after)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
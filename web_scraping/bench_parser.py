@@ -0,0 +1,144 @@
+# bench_parser.py
+import argparse
+import html
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+from page_parser import PARSERS, parse_page
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "backend" / "library_data"
+
+
+def fixture_page(url: str, title: str, content: str, site_urls: list, rng: random.Random) -> str:
+    """
+    Rebuild a page like the library site's from its scraped text
+
+    The saved text goes into <main> as paragraphs; the page around it gets a
+    header, a mega-menu of site links, a footer, inline scripts and styles.
+    """
+    sentences = re.split(r"(?<=[.!?])\s+", content)
+    paragraphs = ["".join(f"<p>{html.escape(s)}</p>" for s in sentences[i:i + 3]) for i in range(0, len(sentences), 3)]
+    menu = "".join(
+        f'<li><a href="{link}/">{html.escape(Path(urlparse(link).path).stem or "Home")}</a></li>'
+        for link in rng.sample(site_urls, min(len(site_urls), 120))
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{html.escape(title or "")}</title>
+  <link rel="stylesheet" href="/common/css/main.css">
+  <style>.nav li {{ display: inline-block; }} .hidden {{ display: none; }}</style>
+  <script>window.dataLayer = window.dataLayer || []; function gtag() {{ dataLayer.push(arguments); }}</script>
+</head>
+<body>
+  <header><div class="logo"><a href="/"><img src="/common/images/logo.png" alt="Northwestern Libraries"></a></div>
+    <form action="https://search.library.northwestern.edu/"><input name="q"><button>Search</button></form></header>
+  <nav class="nav"><ul>{menu}</ul></nav>
+  <main id="main-content">
+    <div class="breadcrumbs"><a href="/">Home</a> &gt; <a href="./">{html.escape(title or "")}</a></div>
+    <h1>{html.escape(title or "")}</h1>
+    {"".join(f'<section><div class="content">{p}</div></section>' for p in paragraphs)}
+    <script>document.querySelectorAll(".hidden").forEach(function (e) {{ e.remove(); }});</script>
+  </main>
+  <footer><p>Northwestern University Libraries<br>1970 Campus Drive, Evanston, IL 60208</p>
+    <a href="/about/contact/index.html">Contact</a> <a href="https://www.northwestern.edu/">Northwestern</a>
+    <a href="/files/annual-report.pdf">Annual report</a> <a href="#top">Back to top</a></footer>
+  <script src="/common/js/main.js"></script>
+</body>
+</html>"""
+
+
+def load_fixtures(data_dir: Path, limit: int, seed: int = 0) -> list:
+    """(url, html) pages generated from the scraped JSON under data_dir"""
+    pages = []
+    for path in sorted(data_dir.glob("**/raw/*/*.json"))[:limit]:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(json.load(f))
+    site_urls = [page["url"].rsplit("/", 1)[0] for page in pages]
+    rng = random.Random(seed)
+    return [(page["url"], fixture_page(page["url"], page.get("title"), page.get("content") or "", site_urls, rng))
+            for page in pages]
+
+
+def load_html_dir(html_dir: Path, base_url: str, limit: int) -> list:
+    """(url, html) pages from saved HTML files, e.g. a snapshot's html/ directory from save_html=True"""
+    return [(f"{base_url.rstrip('/')}/{path.stem}", path.read_text(encoding="utf-8", errors="replace"))
+            for path in sorted(html_dir.glob("*.html"))[:limit]]
+
+
+def parse_all(pages: list, domain: str, parser: str) -> list:
+    return [parse_page(url, page, domain, parser) for url, page in pages]
+
+
+def comparable(parsed: dict) -> dict:
+    """Parser output without the timestamp, which differs on every run"""
+    content = parsed["content"]
+    if content is not None:
+        content = {key: value for key, value in content.items() if key != "timestamp"}
+    return {"content": content, "links": parsed["links"]}
+
+
+def time_single(pages: list, domain: str, parser: str, repeat: int) -> tuple:
+    """Best pages/sec over `repeat` passes in this process, and the last pass's output"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = parse_all(pages, domain, parser)
+        best = max(best, len(pages) / (time.perf_counter() - start))
+    return best, results
+
+
+def time_pool(pages: list, domain: str, parser: str, workers: int) -> float:
+    """Pages/sec parsing every page in a process pool, as scrape_async() does"""
+    with ProcessPoolExecutor(workers) as pool:
+        # Start the workers and import the parser before timing
+        list(pool.map(parse_page, *zip(*pages[:workers]), [domain] * workers, [parser] * workers))
+        start = time.perf_counter()
+        list(pool.map(
+            parse_page, [url for url, _ in pages], [page for _, page in pages],
+            [domain] * len(pages), [parser] * len(pages), chunksize=max(1, len(pages) // (workers * 8))
+        ))
+        return len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on library pages")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="Scraped JSON used to generate fixture pages")
+    parser.add_argument("--html-dir", help="Benchmark saved HTML files instead of generated fixtures")
+    parser.add_argument("--base-url", default="https://www.library.northwestern.edu/", help="URL the --html-dir pages came from")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3, help="Single-process passes; the fastest is reported")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--parsers", nargs="+", default=list(PARSERS), choices=PARSERS)
+    args = parser.parse_args()
+
+    if args.html_dir:
+        pages = load_html_dir(Path(args.html_dir), args.base_url, args.pages)
+        domain = urlparse(args.base_url).netloc
+    else:
+        pages = load_fixtures(Path(args.data_dir), args.pages)
+        domain = urlparse(pages[0][0]).netloc if pages else ""
+    if not pages:
+        raise SystemExit("No pages to parse")
+    size = sum(len(page) for _, page in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size:.0f} KB average, {args.workers} pool workers\n")
+
+    _, reference = time_single(pages, domain, "html.parser", 1)
+    reference = [comparable(parsed) for parsed in reference]
+    print(f"{'parser':<14}{'pages/s':>9}{'pool pages/s':>14}{'per core':>10}{'identical':>11}")
+    for name in args.parsers:
+        single, results = time_single(pages, domain, name, args.repeat)
+        pooled = time_pool(pages, domain, name, args.workers)
+        identical = sum(comparable(parsed) == ref for parsed, ref in zip(results, reference)) / len(pages)
+        print(f"{name:<14}{single:>9.0f}{pooled:>14.0f}{pooled / args.workers:>10.0f}{identical:>11.1%}")
+    print("\nidentical is the share of pages whose content and links match html.parser exactly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# fact_extractor.py
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+from page_classifier import EMAIL_PATTERN, HOURS_TERMS, PHONE_PATTERN, TIME_PATTERN, classify_page
+from page_cleaner import split_segments
+
+FACTS_FILE = 'facts.json'
+# Title suffix the site appends to every page
+TITLE_SUFFIX = re.compile(r'\s*[:|-]\s*(?:Libraries\s*-\s*)?Northwestern University\s*$', re.IGNORECASE)
+# URL path segments that group pages rather than name a place or service
+SECTION_SEGMENTS = {
+    'libraries-collections', 'evanston-campus', 'chicago-campus', 'visit', 'about', 'research',
+    'find-borrow-request', 'faculty-staff', 'libraries', 'index', 'html', 'www'
+}
+# Page titles that only make sense under the section they belong to
+GENERIC_TITLES = {
+    'contact us', 'contact', 'about us', 'about', 'staff', 'our staff', 'plan a visit', 'hours', 'location',
+    'directions', 'services', 'alumni visitors'
+}
+# Sentences longer than this are cut after their last value (unpunctuated page chrome runs on)
+MAX_FACT_CHARS = 120
+
+
+def clip(sentence: str, matches: List[re.Match]) -> str:
+    """Sentence with plain spaces, cut after the last of its matched values if it is too long to quote"""
+    if len(sentence) > MAX_FACT_CHARS and matches:
+        sentence = sentence[:max(match.end() for match in matches)]
+    return ' '.join(sentence.split())
+
+
+def path_names(url: str) -> List[str]:
+    """Place and service names in a URL path, outermost first ("mudd-library" -> "mudd library")"""
+    names = []
+    for segment in urlparse(url).path.strip('/').split('/'):
+        name = segment.rsplit('.', 1)[0]
+        if name and name not in SECTION_SEGMENTS:
+            names.append(name.replace('-', ' '))
+    return names
+
+
+def page_entity(page: Dict[str, Any]) -> str:
+    """Name of the place or service a page is about, from its title or, for generic titles, its section"""
+    title = TITLE_SUFFIX.sub('', page.get('title') or '').split(':')[0].strip()
+    if title and title.lower() not in GENERIC_TITLES:
+        return title
+    # ".../mudd-library/contact-us" is about Mudd Library
+    sections = [name for name in path_names(page.get('url', '')) if name not in GENERIC_TITLES]
+    return sections[-1].title() if sections else title
+
+
+def page_aliases(page: Dict[str, Any]) -> List[str]:
+    """The page's entity name plus the place and service names in its URL path"""
+    return list(dict.fromkeys(alias for alias in [page_entity(page)] + path_names(page.get('url', '')) if alias))
+
+
+def extract_facts(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Contact and hours sentences of every page, with the values the analyzer's regexes find in them
+
+    A contact fact is a sentence with an email address or phone number; an
+    hours fact is a sentence with a time of day and an opening-hours term.
+    Each is keyed by the page's entity and aliases so questions can be
+    matched to it without the LLM.
+    """
+    facts = []
+    for page in pages:
+        entity, aliases = page_entity(page), page_aliases(page)
+        source = {
+            'entity': entity,
+            'aliases': aliases,
+            'url': page.get('url', ''),
+            'title': page.get('title') or '',
+            'category': classify_page(page)
+        }
+        for sentence in split_segments(page.get('content')):
+            email_matches = list(EMAIL_PATTERN.finditer(sentence))
+            # The phone pattern's only group is the country code, so take whole matches
+            phone_matches = list(PHONE_PATTERN.finditer(sentence))
+            if email_matches or phone_matches:
+                facts.append({
+                    **source,
+                    'kind': 'contact',
+                    'text': clip(sentence, email_matches + phone_matches),
+                    'emails': [match.group(0) for match in email_matches],
+                    'phones': [match.group(0) for match in phone_matches]
+                })
+            time_matches = list(TIME_PATTERN.finditer(sentence))
+            if time_matches and any(term in sentence.lower() for term in HOURS_TERMS):
+                facts.append({
+                    **source,
+                    'kind': 'hours',
+                    'text': clip(sentence, time_matches),
+                    'times': [match.group(0) for match in time_matches]
+                })
+    return facts
+
+
+def write_facts(snapshot_dir: Path) -> Dict[str, int]:
+    """
+    Extract facts from a snapshot's cleaned pages (raw pages if it has none) into facts.json
+
+    Cleaned pages keep repeated contact blocks only on the section's landing
+    page, so each fact is attributed to the place it belongs to.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    files = sorted(snapshot_dir.glob('processed/*/*.json')) or sorted(snapshot_dir.glob('raw/*/*.json'))
+    pages = []
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            pages.append(json.load(f))
+    facts = extract_facts(pages)
+
+    tmp_path = snapshot_dir / f".{FACTS_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'facts': facts}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, snapshot_dir / FACTS_FILE)
+    return Counter(fact['kind'] for fact in facts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract contact and hours facts from a scraped snapshot")
+    parser.add_argument("snapshot_dir", help="Timestamped scrape directory")
+    args = parser.parse_args()
+
+    counts = write_facts(Path(args.snapshot_dir))
+    print(f"{counts['contact']} contact facts, {counts['hours']} hours facts")
+
+
+if __name__ == "__main__":
+    main()
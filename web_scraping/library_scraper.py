@@ -1,13 +1,114 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import aiohttp
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 import time
 import json
 from pathlib import Path
 import logging
-from typing import Set, Dict, List, Optional
+from typing import Any, Deque, Iterator, Set, Dict, List, Optional, Tuple
 from datetime import datetime
+from page_classifier import classify_page
+from fact_extractor import write_facts
+from page_cleaner import clean_snapshot
+from page_parser import PARSERS, extract_content, extract_links, parse_page
+
+MANIFEST_FILE = 'manifest.json'
+CHANGES_FILE = 'changes.json'
+CHECKPOINT_FILE = 'crawl_state.jsonl'
+
+def page_filename(url: str) -> str:
+    """File name for a page that is the same in every run and process"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32] + '.json'
+
+def snapshot_relative(file: str) -> str:
+    """Path inside the snapshot of a manifest file entry ("<snapshot>/raw/<category>/<name>")"""
+    return file.split('/', 1)[1]
+
+def content_hash(content: Dict) -> str:
+    """Hash of a page's extracted title and text, ignoring when it was fetched"""
+    key = json.dumps([content.get('title'), content.get('content')], ensure_ascii=False)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Politeness limiter allowing `rate` requests per second with bursts of `capacity`
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the largest burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        # The lock makes waiters take tokens in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class CrawlCheckpoint:
+    def __init__(self, path: Path, interval: float = 5.0):
+        """
+        Append-only JSON-lines log of crawl progress
+        
+        Events are buffered and appended at most every `interval` seconds, so a
+        crash loses at most that much progress. Replaying the log rebuilds the
+        frontier, visited set and change list.
+        
+        Args:
+            path: Log file inside the snapshot directory
+            interval: Seconds between appends (0 appends every event)
+        """
+        self.path = path
+        self.interval = interval
+        self.seconds = 0.0  # Time spent checkpointing, to compare with crawl time
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        
+    def append(self, event: Dict[str, Any]):
+        start = time.perf_counter()
+        self._buffer.append(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        self.seconds += time.perf_counter() - start
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+        
+    def flush(self):
+        start = time.perf_counter()
+        if self._buffer:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._buffer) + '\n')
+            self._buffer = []
+        self._last_flush = time.monotonic()
+        self.seconds += time.perf_counter() - start
+        
+    @staticmethod
+    def replay(path: Path) -> Iterator[Dict[str, Any]]:
+        """Events in the log, skipping a last line cut short by a crash"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
 
 class LibraryScraper:
     def __init__(
@@ -17,8 +118,46 @@ class LibraryScraper:
         delay: float = 1.0,
         max_pages: int = 500,
         user_agent: str = "LibraryInfoBot",
-        email: str = "your@email.com"
+        email: str = "your@email.com",
+        concurrency: int = 8,
+        requests_per_second: Optional[float] = None,
+        burst: float = 1.0,
+        incremental: bool = False,
+        checkpoint_interval: Optional[float] = 5.0,
+        resume: bool = False,
+        parser: str = 'html.parser',
+        parse_workers: int = 0,
+        save_html: bool = False,
+        clean_pages: bool = False,
+        extract_facts: bool = False
     ):
+        """
+        Breadth-first crawler for one site
+        
+        Args:
+            start_url: First page; only links on the same host are followed
+            base_output_dir: Root directory for scraped data
+            delay: Seconds between requests in scrape()
+            max_pages: Maximum pages to visit
+            user_agent: User-Agent header sent with every request
+            email: Contact address for site operators
+            concurrency: Requests in flight at once in scrape_async()
+            requests_per_second: Per-host rate limit in scrape_async() (defaults to 1 / delay)
+            burst: Requests a host may receive back to back in scrape_async()
+            incremental: Send conditional requests for pages in the manifest and link
+                unchanged pages from the previous snapshot instead of rewriting them
+            checkpoint_interval: Seconds between crawl state appends (None disables checkpoints)
+            resume: Continue the latest unfinished crawl from its checkpoint instead of starting over
+            parser: HTML parser backend from page_parser.PARSERS ('lxml' is fastest)
+            parse_workers: Processes parsing pages in scrape_async() (0 parses in the event loop)
+            save_html: Also keep each fetched page's HTML under html/ in the snapshot
+            clean_pages: After the crawl, write pages without site-wide boilerplate and
+                near-duplicates to processed/ (see page_cleaner)
+            extract_facts: After the crawl (and cleaning), write the contact and hours
+                sentences the backend answers directly to facts.json (see fact_extractor)
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser: {parser}")
         self.start_url = start_url
         self.domain = urlparse(start_url).netloc
         self.base_output_dir = Path(base_output_dir)
@@ -26,18 +165,79 @@ class LibraryScraper:
         self.max_pages = max_pages
         self.user_agent = user_agent
         self.email = email
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second or (1.0 / delay if delay > 0 else None)
+        self.burst = burst
+        self.incremental = incremental
+        self.parser = parser
+        self.parse_workers = parse_workers
+        self.save_html = save_html
+        self.clean_pages = clean_pages
+        self.extract_facts = extract_facts
         
-        # Use lists instead of sets for better URL management
         self.visited_urls: Set[str] = set()
-        self.queue: List[str] = [start_url]  # Changed to list for FIFO behavior
+        self.queue: Deque[str] = deque([start_url])  # FIFO frontier with O(1) pops
         self.found_urls: Set[str] = set()  # Track all discovered URLs
+        self.session = requests.Session()  # Reuses connections across requests
         
         # Setup
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = self.base_output_dir / self.domain / self.timestamp
+        self.domain_dir = self.base_output_dir / self.domain
+        unfinished = self.find_unfinished_crawl() if resume else None
+        self.timestamp = unfinished or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = self.domain_dir / self.timestamp
         self.setup_directories()
         self.setup_logging()
         
+        # Per-URL fetch metadata from the previous run, and this run's entries and changes
+        self.manifest = self.load_manifest()
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.changes: Dict[str, Any] = {'added': [], 'modified': [], 'removed': [], 'unchanged': 0}
+        
+        self.checkpoint = None
+        if checkpoint_interval is not None:
+            self.checkpoint = CrawlCheckpoint(self.output_dir / CHECKPOINT_FILE, checkpoint_interval)
+        if unfinished:
+            self.restore_checkpoint()
+        elif resume:
+            self.logger.info("No unfinished crawl to resume, starting a new one")
+            
+    def find_unfinished_crawl(self) -> Optional[str]:
+        """Timestamp of the latest snapshot with a checkpoint but no change list"""
+        if not self.domain_dir.exists():
+            return None
+        snapshots = sorted(d.name for d in self.domain_dir.iterdir() if d.is_dir())
+        for timestamp in reversed(snapshots):
+            snapshot = self.domain_dir / timestamp
+            if (snapshot / CHANGES_FILE).exists():
+                return None
+            if (snapshot / CHECKPOINT_FILE).exists():
+                return timestamp
+        return None
+        
+    def restore_checkpoint(self):
+        """Rebuild crawl state from the checkpoint so saved pages are not fetched again"""
+        found_order = []
+        for event in CrawlCheckpoint.replay(self.output_dir / CHECKPOINT_FILE):
+            if 'found' in event:
+                found_order.extend(event['found'])
+            elif 'visited' in event:
+                url = event['visited']
+                self.visited_urls.add(url)
+                self.pages[url] = event['page']
+                change = event['change']
+                if change == 'unchanged':
+                    self.changes['unchanged'] += 1
+                elif change:
+                    self.changes[change].append({'url': url, 'file': snapshot_relative(event['page']['file'])})
+                    
+        self.found_urls = set(found_order)
+        # Pages that were queued or in flight at the checkpoint go back on the frontier in discovery order
+        self.queue = deque(url for url in [self.start_url] + found_order if url not in self.visited_urls)
+        self.logger.info(
+            f"Resuming crawl {self.timestamp}: {len(self.visited_urls)} pages already visited, "
+            f"{len(self.queue)} URLs in queue"
+        )
+        
     def setup_directories(self):
         """Create directory structure"""
         categories = ['contact', 'hours', 'events', 'services', 'general']
@@ -47,6 +247,8 @@ class LibraryScraper:
             (self.output_dir / 'processed' / category).mkdir(parents=True, exist_ok=True)
             
         (self.output_dir / 'logs').mkdir(parents=True, exist_ok=True)
+        if self.save_html:
+            (self.output_dir / 'html').mkdir(exist_ok=True)
         
     def setup_logging(self):
         """Configure logging"""
@@ -62,130 +264,359 @@ class LibraryScraper:
         )
         self.logger = logging.getLogger(__name__)
         
+    def load_manifest(self) -> Dict[str, Any]:
+        """Manifest written by the previous crawl of this domain, if any"""
+        manifest_path = self.domain_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            return {'snapshot': None, 'pages': {}}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+            
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Request headers, made conditional when an unchanged copy of the page can be reused"""
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml'
+        }
+        previous = self.manifest['pages'].get(url)
+        if self.incremental and previous and previous.get('file') and (self.domain_dir / previous['file']).exists():
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
+        return headers
+        
     def get_page(self, url: str) -> Optional[requests.Response]:
         """Fetch a page"""
         try:
-            headers = {
-                'User-Agent': self.user_agent,
-                'Accept': 'text/html,application/xhtml+xml'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=self.request_headers(url), timeout=10)
             response.raise_for_status()
             return response
         except Exception as e:
             self.logger.error(f"Error fetching {url}: {e}")
             return None
             
-    def extract_content(self, soup: BeautifulSoup, url: str) -> Dict:
-        """Extract page content"""
-        # Remove unwanted elements
-        for element in soup.find_all(['script', 'style']):
-            element.decompose()
-            
-        # Extract main content
-        main_content = soup.find('main') or soup.find('article') or soup.find('body')
-        if not main_content:
+    async def get_page_async(
+        self,
+        session: aiohttp.ClientSession,
+        url: str
+    ) -> Optional[Tuple[int, str, Optional[str], Optional[str]]]:
+        """Fetch a page through the shared connection pool as (status, html, ETag, Last-Modified)"""
+        try:
+            async with session.get(url, headers=self.request_headers(url)) as response:
+                response.raise_for_status()
+                html = await response.text() if response.status != 304 else ''
+                return response.status, html, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        except Exception as e:
+            self.logger.error(f"Error fetching {url}: {e}")
             return None
             
-        content = ' '.join(p.get_text().strip() for p in main_content.find_all('p'))
-        
-        return {
-            'url': url,
-            'title': soup.title.string if soup.title else '',
-            'content': content,
-            'timestamp': time.time()
-        }
+    def extract_content(self, soup: BeautifulSoup, url: str) -> Dict:
+        """Extract page content"""
+        return extract_content(soup, url)
         
     def extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract valid links more thoroughly"""
-        new_links = []
-        seen_on_page = set()  # Track unique links on this page
+        """Extract valid links not seen before"""
+        return self.filter_new_links(self.page_links(soup, base_url))
         
-        # Find all <a> tags
-        for link in soup.find_all(['a', 'area']):  # Include image map links
-            href = link.get('href')
-            if not href:
-                continue
-                
-            try:
-                url = urljoin(base_url, href)
-                parsed = urlparse(url)
-                
-                # Skip invalid URLs and non-HTTP(S) schemes
-                if not parsed.netloc or not parsed.scheme in {'http', 'https'}:
-                    continue
-                    
-                # Only process URLs from the same domain
-                if parsed.netloc != self.domain:
-                    continue
-                    
-                # Skip common non-content URLs
-                if any(pat in parsed.path.lower() for pat in ['.pdf', '.jpg', '.png', '.gif', '.css', '.js']):
-                    continue
-                    
-                # Normalize URL
-                normalized_url = url.split('#')[0].split('?')[0].rstrip('/')
-                
-                # Only add if we haven't seen this URL before
-                if (normalized_url not in seen_on_page and 
-                    normalized_url not in self.visited_urls and 
-                    normalized_url not in self.found_urls):
-                    seen_on_page.add(normalized_url)
-                    new_links.append(normalized_url)
-                    self.found_urls.add(normalized_url)
-                    
-            except Exception as e:
-                self.logger.warning(f"Error processing link {href}: {e}")
-                
+    def page_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+        """Extract every valid same-domain link on a page, normalized and in page order"""
+        return extract_links(soup, base_url, self.domain)
+        
+    def filter_new_links(self, links: List[str]) -> List[str]:
+        """Links not visited or found before, which are marked as found"""
+        new_links = []
+        for url in links:
+            # Only add if we haven't seen this URL before
+            if url not in self.visited_urls and url not in self.found_urls:
+                new_links.append(url)
+                self.found_urls.add(url)
         return new_links
         
-    def save_content(self, content: Dict):
+    def save_content(self, content: Dict, category: str = 'general'):
         """Save content to file"""
         if not content:
             return
             
-        # Save to general category for now
-        filename = f"{hash(content['url'])}.json"
-        output_path = self.output_dir / 'raw' / 'general' / filename
+        output_path = self.output_dir / 'raw' / category / page_filename(content['url'])
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(content, f, ensure_ascii=False, indent=2)
             
-    def scrape(self):
-        """Main scraping logic with exhaustive link processing"""
-        self.start_time = time.time()
+    def link_previous(self, previous: Dict[str, Any], relative_path: str) -> bool:
+        """Hard-link (or copy) a page's file from the previous snapshot to relative_path in this one"""
+        source = self.domain_dir / previous['file']
+        target = self.output_dir / relative_path
+        if not source.exists():
+            return False
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copy2(source, target)
+        return True
         
-        while self.queue and len(self.visited_urls) < self.max_pages:
-            # Get next URL from start of queue (FIFO)
-            url = self.queue.pop(0)
-            
-            if url in self.visited_urls:
-                continue
+    def record_page(self, url: str, content: Optional[Dict], links: List[str], etag: Optional[str], last_modified: Optional[str]):
+        """Add a page to this run's manifest and change list, saving it unless it is unchanged"""
+        previous = self.manifest['pages'].get(url)
+        digest = content_hash(content) if content else None
+        
+        change = None
+        relative_path = None
+        if content:
+            if not previous or not previous.get('content_hash'):
+                change = 'added'
+            elif previous['content_hash'] != digest:
+                change = 'modified'
+            else:
+                change = 'unchanged'
+                
+            category = classify_page(content)
+            relative_path = f"raw/{category}/{page_filename(url)}"
+            if not (self.incremental and change == 'unchanged' and self.link_previous(previous, relative_path)):
+                self.save_content(content, category)
                 
-            self.logger.info(f"Scraping: {url} (Queue size: {len(self.queue)}, Visited: {len(self.visited_urls)})")
+        self.mark_visited(url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': digest,
+            'file': f"{self.timestamp}/{relative_path}" if content else None,
+            'links': links
+        }, change)
+        
+    def mark_visited(self, url: str, page: Dict[str, Any], change: Optional[str]):
+        """Record a finished page in the manifest, change list and checkpoint"""
+        self.pages[url] = page
+        if change == 'unchanged':
+            self.changes['unchanged'] += 1
+        elif change:
+            self.changes[change].append({'url': url, 'file': snapshot_relative(page['file'])})
+        if self.checkpoint:
+            self.checkpoint.append({'visited': url, 'page': page, 'change': change})
+            
+    def queue_links(self, links: List[str]):
+        """Add a page's new links to the end of the frontier"""
+        new_links = self.filter_new_links(links)
+        self.queue.extend(new_links)
+        if new_links and self.checkpoint:
+            self.checkpoint.append({'found': new_links})
+        
+    def save_page_html(self, url: str, html: str):
+        """Keep the fetched HTML next to the extracted content, e.g. as parser benchmark input"""
+        with open(self.output_dir / 'html' / f"{Path(page_filename(url)).stem}.html", 'w', encoding='utf-8') as f:
+            f.write(html)
+            
+    def process_page(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        parsed: Optional[Dict[str, Any]] = None
+    ):
+        """Save a fetched page's content and queue its new links, parsing it unless `parsed` is given"""
+        self.visited_urls.add(url)
+        if self.save_html:
+            self.save_page_html(url, html)
+            
+        if parsed is None:
+            parsed = parse_page(url, html, self.domain, self.parser)
+        links = parsed['links']
+        self.record_page(url, parsed['content'], links, etag, last_modified)
+            
+        # Get new links and add them to the end of the queue
+        self.queue_links(links)
+        self.log_progress()
+        
+    def process_not_modified(self, url: str):
+        """Reuse the previous snapshot's copy of a page the server reports as unchanged"""
+        self.visited_urls.add(url)
+        
+        previous = self.manifest['pages'][url]
+        # Same content, so the same category directory as last time
+        relative_path = snapshot_relative(previous['file'])
+        self.link_previous(previous, relative_path)
+        self.mark_visited(url, {**previous, 'file': f"{self.timestamp}/{relative_path}"}, 'unchanged')
+        
+        # Links are remembered from the last full fetch
+        self.queue_links(previous['links'])
+        self.log_progress()
+        
+    def handle_response(self, url: str, status: int, html: str, etag: Optional[str], last_modified: Optional[str]):
+        if status == 304:
+            self.process_not_modified(url)
+        else:
+            self.process_page(url, html, etag, last_modified)
+            
+    def log_progress(self):
+        if len(self.visited_urls) % 10 == 0:
+            self.logger.info(f"Progress: {len(self.visited_urls)} pages visited, {len(self.queue)} URLs in queue")
+            
+    def finish_crawl(self):
+        """
+        Write the manifest and this snapshot's change list
+        
+        Pages from the previous manifest that were not visited are reported as
+        removed only if the crawl ran out of links; a crawl stopped by max_pages
+        keeps their old entries. Cleaned pages and facts are written first, so a
+        snapshot with a change list is complete when the backend picks it up.
+        """
+        if self.clean_pages:
+            report = clean_snapshot(self.output_dir)
+            self.logger.info(
+                f"Cleaned pages: {report['kept']} of {report['pages']} kept "
+                f"({report['near_duplicates']} near-duplicates, {report['empty_after_cleaning']} only boilerplate), "
+                f"text {report['reduction']:.1%} smaller"
+            )
+            
+        if self.extract_facts:
+            counts = write_facts(self.output_dir)
+            self.logger.info(f"Extracted {counts['contact']} contact and {counts['hours']} hours facts")
             
-            response = self.get_page(url)
-            if not response:
+        complete = not self.queue
+        pages = dict(self.pages)
+        for url, previous in self.manifest['pages'].items():
+            if url in pages:
                 continue
+            if complete:
+                if previous.get('file'):
+                    self.changes['removed'].append({'url': url})
+            else:
+                pages[url] = previous
                 
-            self.visited_urls.add(url)
+        changes = {
+            'snapshot': self.timestamp,
+            'previous': self.manifest.get('snapshot'),
+            'complete': complete,
+            **self.changes
+        }
+        tmp_path = self.output_dir / f".{CHANGES_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(changes, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.output_dir / CHANGES_FILE)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            content = self.extract_content(soup, url)
+        # Replace the manifest in one step so a crash never leaves it half written
+        tmp_path = self.domain_dir / f".{MANIFEST_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'snapshot': self.timestamp, 'pages': pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.domain_dir / MANIFEST_FILE)
+        
+        if self.checkpoint:
+            self.checkpoint.flush()
+            elapsed = max(time.time() - self.start_time, 1e-6)
+            self.logger.info(
+                f"Checkpointing took {self.checkpoint.seconds:.3f}s "
+                f"({self.checkpoint.seconds / elapsed:.2%} of the crawl)"
+            )
             
-            if content:
-                self.save_content(content)
+        self.logger.info(
+            f"Changes since {changes['previous']}: {len(self.changes['added'])} added, "
+            f"{len(self.changes['modified'])} modified, {len(self.changes['removed'])} removed, "
+            f"{self.changes['unchanged']} unchanged"
+        )
+        
+    def scrape(self):
+        """Main scraping logic with exhaustive link processing"""
+        self.start_time = time.time()
+        
+        try:
+            while self.queue and len(self.visited_urls) < self.max_pages:
+                # Get next URL from start of queue (FIFO)
+                url = self.queue.popleft()
                 
-            # Get new links and add them to the end of the queue
-            new_links = self.extract_links(soup, url)
-            self.queue.extend(new_links)
-            
-            # Log progress
-            if len(self.visited_urls) % 10 == 0:
-                self.logger.info(f"Progress: {len(self.visited_urls)} pages visited, {len(self.queue)} URLs in queue")
+                if url in self.visited_urls:
+                    continue
+                    
+                self.logger.info(f"Scraping: {url} (Queue size: {len(self.queue)}, Visited: {len(self.visited_urls)})")
                 
-            time.sleep(self.delay)
-            
+                response = self.get_page(url)
+                if not response:
+                    continue
+                    
+                self.handle_response(
+                    url, response.status_code, response.text,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified')
+                )
+                time.sleep(self.delay)
+        finally:
+            # Keep progress up to an interruption such as Ctrl-C
+            if self.checkpoint:
+                self.checkpoint.flush()
+                
+        self.finish_crawl()
+        self.logger.info(f"Scraping completed. Processed {len(self.visited_urls)} pages.")
+        self.logger.info(f"Total unique URLs found: {len(self.found_urls)}")
+        
+    async def scrape_async(self):
+        """
+        Crawl with up to `concurrency` requests in flight over one connection pool
+        
+        Requests to each host are spaced by a token bucket instead of sleeping
+        between pages. Pages are taken from the frontier in the same FIFO order
+        as scrape(). With parse_workers, HTML is parsed in a process pool so
+        parsing uses every core and does not hold up the event loop.
+        """
+        self.start_time = time.time()
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(self.parse_workers) if self.parse_workers > 0 else None
+        buckets: Dict[str, TokenBucket] = {}
+        claimed: Set[str] = set()
+        in_flight = 0
+        frontier_changed = asyncio.Condition()
+        
+        async def worker(session: aiohttp.ClientSession):
+            nonlocal in_flight
+            while True:
+                async with frontier_changed:
+                    while True:
+                        while self.queue and self.queue[0] in claimed:
+                            self.queue.popleft()
+                        # Like scrape(), only successfully fetched pages count towards max_pages
+                        if self.queue and len(self.visited_urls) + in_flight < self.max_pages:
+                            break
+                        if not in_flight:
+                            # No request left that could add links or free up the page budget
+                            frontier_changed.notify_all()
+                            return
+                        await frontier_changed.wait()
+                    url = self.queue.popleft()
+                    claimed.add(url)
+                    in_flight += 1
+                    
+                try:
+                    if self.requests_per_second:
+                        host = urlparse(url).netloc
+                        if host not in buckets:
+                            buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+                        await buckets[host].acquire()
+                        
+                    self.logger.info(f"Scraping: {url} (Queue size: {len(self.queue)}, Visited: {len(self.visited_urls)})")
+                    page = await self.get_page_async(session, url)
+                    if page is not None and pool and page[0] != 304:
+                        status, html, etag, last_modified = page
+                        parsed = await loop.run_in_executor(pool, parse_page, url, html, self.domain, self.parser)
+                        self.process_page(url, html, etag, last_modified, parsed)
+                    elif page is not None:
+                        self.handle_response(url, *page)
+                finally:
+                    async with frontier_changed:
+                        in_flight -= 1
+                        frontier_changed.notify_all()
+                        
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                await asyncio.gather(*(worker(session) for _ in range(self.concurrency)))
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+            # Keep progress up to an interruption such as Ctrl-C or cancellation
+            if self.checkpoint:
+                self.checkpoint.flush()
+                
+        self.finish_crawl()
         self.logger.info(f"Scraping completed. Processed {len(self.visited_urls)} pages.")
         self.logger.info(f"Total unique URLs found: {len(self.found_urls)}")
         
@@ -197,6 +628,7 @@ class LibraryScraper:
             'urls_remaining': len(self.queue),
             'start_time': getattr(self, 'start_time', time.time()),
             'end_time': time.time(),
+            'checkpoint_seconds': self.checkpoint.seconds if self.checkpoint else 0.0,
             'domain': self.domain,
             'categories': {}
         }
@@ -0,0 +1,51 @@
+# page_classifier.py
+import re
+from typing import Any, Dict
+
+# Content signals, shared with LibraryDataAnalyzer
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
+TIME_PATTERN = re.compile(r'\b\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)\b')
+DATE_PATTERN = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b')
+HOURS_TERMS = ['hours', 'schedule', 'open', 'closed']
+SERVICE_KEYWORDS = ['service', 'help', 'assistance', 'support', 'resource']
+
+# Words in a page's URL or title that name its category outright
+URL_TITLE_TERMS = {
+    'hours': ['hours'],
+    'contact': ['contact', 'staff', 'directory', 'ask-us', 'ask us'],
+    'events': ['event', 'exhibit', 'calendar', 'workshop'],
+    'services': ['services', 'borrow', 'request', 'checkout', 'printing', 'technology', 'reserve', 'course-reserves'],
+}
+URL_TITLE_WEIGHT = 3.0
+# Content signals count at most this much, so long pages do not win on volume alone
+CONTENT_CAP = 3.0
+# Lowest score for a category other than general; ties go to the earlier category
+MIN_SCORE = 2.0
+CATEGORIES = ['hours', 'contact', 'events', 'services', 'general']
+
+
+def category_scores(page: Dict[str, Any]) -> Dict[str, float]:
+    """Evidence for each specific category from the page's content, URL and title"""
+    content = page.get('content') or ''
+    lowered = content.lower()
+    url_title = f"{page.get('url', '')} {page.get('title') or ''}".lower()
+
+    signals = {
+        'hours': len(TIME_PATTERN.findall(content)) if any(term in lowered for term in HOURS_TERMS) else 0,
+        'contact': (len(EMAIL_PATTERN.findall(content)) + len(PHONE_PATTERN.findall(content))) / 2,
+        'events': len(DATE_PATTERN.findall(content)) if 'event' in lowered else 0,
+        'services': sum(keyword in lowered for keyword in SERVICE_KEYWORDS) / 2,
+    }
+    return {
+        category: min(signal, CONTENT_CAP)
+        + URL_TITLE_WEIGHT * any(term in url_title for term in URL_TITLE_TERMS[category])
+        for category, signal in signals.items()
+    }
+
+
+def classify_page(page: Dict[str, Any]) -> str:
+    """Category directory for a scraped page: hours, contact, events, services or general"""
+    scores = category_scores(page)
+    best = max(scores, key=lambda category: (scores[category], -CATEGORIES.index(category)))
+    return best if scores[best] >= MIN_SCORE else 'general'
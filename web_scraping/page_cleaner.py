@@ -0,0 +1,236 @@
+# page_cleaner.py
+import argparse
+import json
+import re
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from page_classifier import classify_page
+
+REPORT_FILE = 'cleaning_report.json'
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+WORD = re.compile(r'\w+')
+
+
+def split_segments(text: str) -> List[str]:
+    """Sentences of a page's text, the unit in which template blocks repeat"""
+    return [segment.strip() for segment in SENTENCE_END.split(text or '') if segment.strip()]
+
+
+def segment_key(segment: str) -> str:
+    """Whitespace-insensitive form of a segment (the site mixes spaces and non-breaking spaces)"""
+    return ' '.join(segment.split()).lower()
+
+
+def page_order(page: Dict[str, Any]) -> Tuple[int, str]:
+    """Shallowest URL first, so repeated text is kept on a section's landing page"""
+    url = page.get('url', '')
+    return url.count('/'), url
+
+
+def find_boilerplate(pages: List[Dict[str, Any]], min_pages: int = 5) -> Set[str]:
+    """Keys of segments that appear on at least min_pages pages"""
+    frequency = Counter()
+    for page in pages:
+        frequency.update({segment_key(segment) for segment in split_segments(page.get('content'))})
+    return {key for key, count in frequency.items() if count >= min_pages}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        MinHash signatures of word shingles
+
+        Each permutation is a multiply-shift hash of the shingle's CRC32, so a
+        page's whole signature is one vectorized min over a (num_perm, shingles)
+        matrix.
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = WORD.findall(text.lower())
+        size = min(self.shingle_size, len(words)) or 1
+        grams = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        # uint64 arithmetic wraps, which is the mod 2**64 of multiply-shift hashing
+        hashes = (self.a[:, None] * shingles[None, :] + self.b[:, None]) >> np.uint64(32)
+        return hashes.min(axis=1)
+
+
+class NearDuplicateIndex:
+    def __init__(self, hasher: MinHasher, bands: int = 16, threshold: float = 0.8):
+        """
+        Locality-sensitive hashing over MinHash signatures
+
+        Signatures are cut into bands; pages sharing any band are candidates,
+        confirmed by the share of equal signature values (estimated Jaccard
+        similarity of their shingle sets).
+
+        Args:
+            hasher: MinHasher whose num_perm is divisible by bands
+            bands: Number of bands (more bands find less similar candidates)
+            threshold: Estimated similarity at which a page is a near-duplicate
+        """
+        if hasher.num_perm % bands:
+            raise ValueError(f"num_perm ({hasher.num_perm}) must be divisible by bands ({bands})")
+        self.hasher = hasher
+        self.bands = bands
+        self.rows = hasher.num_perm // bands
+        self.threshold = threshold
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self.signatures: List[np.ndarray] = []
+
+    def band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def find(self, signature: np.ndarray) -> Optional[Tuple[int, float]]:
+        """Most similar indexed page at or above the threshold, as (position, similarity)"""
+        candidates = {i for key in self.band_keys(signature) for i in self.buckets.get(key, ())}
+        best = None
+        for i in candidates:
+            similarity = float(np.mean(self.signatures[i] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (i, similarity)
+        return best
+
+    def add(self, signature: np.ndarray) -> int:
+        position = len(self.signatures)
+        self.signatures.append(signature)
+        for key in self.band_keys(signature):
+            self.buckets[key].append(position)
+        return position
+
+
+def clean_pages(
+    pages: List[Dict[str, Any]],
+    min_pages: int = 5,
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 16
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Remove repeated template text and near-duplicate pages
+
+    A sentence found on at least min_pages pages is kept only on the first
+    of them (shallowest URL first) and removed from the rest, so contact and
+    hours blocks stay retrievable once. Pages left without text, and pages
+    whose remaining text is a near-duplicate of a kept page, are dropped.
+
+    Args:
+        pages: Scraped pages ({'url', 'title', 'content', ...})
+        min_pages: Pages a sentence must appear on to count as boilerplate
+        threshold: Estimated Jaccard similarity of word 5-gram sets for a near-duplicate
+        num_perm: MinHash permutations
+        bands: LSH bands
+
+    Returns:
+        (kept pages with cleaned content, report)
+    """
+    boilerplate = find_boilerplate(pages, min_pages)
+    index = NearDuplicateIndex(MinHasher(num_perm), bands, threshold)
+    seen: Set[str] = set()
+    kept, kept_urls, duplicates, empty = [], [], [], []
+
+    for page in sorted(pages, key=page_order):
+        segments = []
+        for segment in split_segments(page.get('content')):
+            key = segment_key(segment)
+            if key in boilerplate:
+                if key in seen:
+                    continue
+                seen.add(key)
+            segments.append(segment)
+        content = ' '.join(segments)
+
+        if not content:
+            empty.append(page.get('url', ''))
+            continue
+        signature = index.hasher.signature(content)
+        match = index.find(signature)
+        if match:
+            duplicates.append({
+                'url': page.get('url', ''),
+                'duplicate_of': kept_urls[match[0]],
+                'similarity': round(match[1], 3)
+            })
+            continue
+        index.add(signature)
+        kept_urls.append(page.get('url', ''))
+        kept.append({**page, 'content': content})
+
+    chars_before = sum(len(page.get('content') or '') for page in pages)
+    chars_after = sum(len(page['content']) for page in kept)
+    report = {
+        'pages': len(pages),
+        'kept': len(kept),
+        'near_duplicates': len(duplicates),
+        'empty_after_cleaning': len(empty),
+        'boilerplate_sentences': len(boilerplate),
+        'chars_before': chars_before,
+        'chars_after': chars_after,
+        'reduction': round(1 - chars_after / chars_before, 4) if chars_before else 0.0,
+        'duplicates': duplicates,
+        'empty': empty
+    }
+    return kept, report
+
+
+def clean_snapshot(snapshot_dir: Path, **kwargs) -> Dict[str, Any]:
+    """
+    Clean a snapshot's raw pages into processed/, keeping their file names
+
+    Boilerplate is a property of the whole site, so processed/ is rewritten
+    from every raw page each time. Pages are categorized again by their
+    cleaned text, which no longer carries every page's template contact
+    block. Keyword arguments go to clean_pages().
+    """
+    snapshot_dir = Path(snapshot_dir)
+    pages, names = [], {}
+    for file in sorted(snapshot_dir.glob('raw/*/*.json')):
+        with open(file, 'r', encoding='utf-8') as f:
+            page = json.load(f)
+        pages.append(page)
+        # Cleaned pages are new dicts, mapped back to their source file by URL
+        names[page.get('url', '')] = file.name
+
+    kept, report = clean_pages(pages, **kwargs)
+
+    processed = snapshot_dir / 'processed'
+    for old in processed.glob('*/*.json'):
+        old.unlink()
+    for page in kept:
+        category = classify_page(page)
+        (processed / category).mkdir(parents=True, exist_ok=True)
+        with open(processed / category / names[page.get('url', '')], 'w', encoding='utf-8') as f:
+            json.dump(page, f, ensure_ascii=False, indent=2)
+    with open(processed / REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove boilerplate and near-duplicate pages from a scraped snapshot")
+    parser.add_argument("snapshot_dir", help="Timestamped scrape directory containing raw/")
+    parser.add_argument("--min-pages", type=int, default=5, help="Pages a sentence must appear on to be boilerplate")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Similarity at which a page is a near-duplicate")
+    args = parser.parse_args()
+
+    report = clean_snapshot(Path(args.snapshot_dir), min_pages=args.min_pages, threshold=args.threshold)
+    print(f"{report['pages']} pages -> {report['kept']} kept "
+          f"({report['near_duplicates']} near-duplicates, {report['empty_after_cleaning']} empty after cleaning)")
+    print(f"{report['boilerplate_sentences']} boilerplate sentences; "
+          f"text {report['chars_before']:,} -> {report['chars_after']:,} chars ({report['reduction']:.1%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
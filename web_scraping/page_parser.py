@@ -0,0 +1,152 @@
+# page_parser.py
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup
+
+SKIPPED_EXTENSIONS = ['.pdf', '.jpg', '.png', '.gif', '.css', '.js']
+
+
+def normalize_link(href: str, base_url: str, domain: str) -> Optional[str]:
+    """Absolute same-domain content URL without fragment, query or trailing slash, or None"""
+    url = urljoin(base_url, href)
+    parsed = urlparse(url)
+
+    # Skip invalid URLs and non-HTTP(S) schemes
+    if not parsed.netloc or not parsed.scheme in {'http', 'https'}:
+        return None
+
+    # Only process URLs from the same domain
+    if parsed.netloc != domain:
+        return None
+
+    # Skip common non-content URLs
+    if any(pat in parsed.path.lower() for pat in SKIPPED_EXTENSIONS):
+        return None
+
+    return url.split('#')[0].split('?')[0].rstrip('/')
+
+
+def unique_links(hrefs: List[str], base_url: str, domain: str) -> List[str]:
+    """Normalized links in page order, each once"""
+    links = []
+    seen_on_page = set()  # Track unique links on this page
+    for href in hrefs:
+        if not href:
+            continue
+        try:
+            url = normalize_link(href, base_url, domain)
+        except ValueError:
+            continue
+        if url and url not in seen_on_page:
+            seen_on_page.add(url)
+            links.append(url)
+    return links
+
+
+def extract_content(soup: BeautifulSoup, url: str) -> Optional[Dict]:
+    """Extract page content"""
+    # Remove unwanted elements
+    for element in soup.find_all(['script', 'style']):
+        element.decompose()
+
+    # Extract main content
+    main_content = soup.find('main') or soup.find('article') or soup.find('body')
+    if not main_content:
+        return None
+
+    content = ' '.join(p.get_text().strip() for p in main_content.find_all('p'))
+    # A plain str: a NavigableString would pickle the whole tree along with it
+    title = soup.title.string if soup.title else ''
+
+    return {
+        'url': url,
+        'title': str(title) if title is not None else None,
+        'content': content,
+        'timestamp': time.time()
+    }
+
+
+def extract_links(soup: BeautifulSoup, base_url: str, domain: str) -> List[str]:
+    """Every valid same-domain link on a page, including image map links"""
+    return unique_links([link.get('href') for link in soup.find_all(['a', 'area'])], base_url, domain)
+
+
+def parse_with_soup(builder: str) -> Callable[[str, str, str], Dict[str, Any]]:
+    def parse(url: str, html: str, domain: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(html, builder)
+        content = extract_content(soup, url)
+        return {'content': content, 'links': extract_links(soup, url, domain)}
+    return parse
+
+
+def parse_with_lxml(url: str, html: str, domain: str) -> Dict[str, Any]:
+    """Same extraction as the BeautifulSoup backends, walking an lxml tree directly"""
+    import lxml.html
+    from lxml import etree
+
+    try:
+        try:
+            root = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Strings with an XML encoding declaration must be parsed as bytes
+            root = lxml.html.document_fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        # Empty document
+        return {'content': None, 'links': []}
+
+    for element in list(root.iter('script', 'style')):
+        # Keep the text that follows the element, as decompose() does
+        element.drop_tree()
+    links = unique_links([link.get('href') for link in root.iter('a', 'area')], url, domain)
+
+    main_content = next(root.iter('main'), None)
+    if main_content is None:
+        main_content = next(root.iter('article'), None)
+    if main_content is None:
+        main_content = next(root.iter('body'), None)
+    if main_content is None:
+        return {'content': None, 'links': links}
+
+    paragraphs = main_content.iter('p')
+    content = ' '.join(
+        etree.tostring(p, method='text', encoding='unicode', with_tail=False).strip() for p in paragraphs
+    )
+
+    # The title is parsed as raw text, so .text matches BeautifulSoup's .string (None when empty)
+    title = next(root.iter('title'), None)
+
+    return {
+        'content': {
+            'url': url,
+            'title': title.text if title is not None else '',
+            'content': content,
+            'timestamp': time.time()
+        },
+        'links': links
+    }
+
+
+PARSERS = {
+    'html.parser': parse_with_soup('html.parser'),
+    'bs4-lxml': parse_with_soup('lxml'),
+    'lxml': parse_with_lxml,
+}
+
+
+def parse_page(url: str, html: str, domain: str, parser: str = 'html.parser') -> Dict[str, Any]:
+    """
+    Extract a page's content and links
+
+    A module-level function so it can run in a process pool.
+
+    Args:
+        url: Page URL, used to resolve relative links
+        html: Page HTML
+        domain: Host whose links are kept
+        parser: Backend name from PARSERS
+
+    Returns:
+        {'content': {...} or None, 'links': [...]}
+    """
+    return PARSERS[parser](url, html, domain)
@@ -1,8 +1,15 @@
 # run_scraper.py
 from library_scraper import LibraryScraper
+import argparse
+import asyncio
 import logging
+import os
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape the library website")
+    parser.add_argument("--resume", action="store_true", help="Continue the last interrupted crawl from its checkpoint")
+    args = parser.parse_args()
+    
     # Configure scraper
     scraper = LibraryScraper(
         start_url="https://www.library.northwestern.edu/",
@@ -10,17 +17,25 @@ def main():
         delay=2.0,
         max_pages=1000,  # Start with a smaller number for testing
         user_agent="NULibraryInfoBot",
-        email="opatka.ryan@email.com"
+        email="opatka.ryan@email.com",
+        concurrency=8,
+        requests_per_second=4.0,  # Politeness limit for the library's server
+        incremental=True,  # Only re-download pages changed since the last run
+        resume=args.resume,
+        parser="lxml",  # pip install lxml
+        parse_workers=os.cpu_count() or 1,  # Parse pages on every core
+        clean_pages=True,  # Drop site-wide boilerplate and near-duplicate pages before indexing
+        extract_facts=True  # Contact and hours sentences the receptionist answers without the LLM
     )
     
     # Run scraper
     print("Starting library website scraping...")
-    scraper.scrape()
+    asyncio.run(scraper.scrape_async())
     
     # Print statistics
     stats = scraper.get_scraping_stats()
     print("\nScraping completed!")
-    print(f"Total pages scraped: {stats['total_pages']}")
+    print(f"Total pages scraped: {stats['total_pages_visited']}")
     print("\nFiles by category:")
     for category, counts in stats['categories'].items():
         print(f"{category}:")
@@ -0,0 +1,49 @@
+# test_crawl_checkpoint.py
+import json
+from library_scraper import CHECKPOINT_FILE, CrawlCheckpoint, LibraryScraper
+
+SITE = "https://lib.example.edu"
+
+
+def html(title, *links):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><head><title>{title}</title></head><body><p>{title} page text.</p>{anchors}</body></html>"
+
+
+def scraper(tmp_path, resume=False):
+    return LibraryScraper(f"{SITE}/", str(tmp_path), delay=0, checkpoint_interval=0, resume=resume)
+
+
+def test_replay_skips_a_line_cut_short(tmp_path):
+    log = CrawlCheckpoint(tmp_path / CHECKPOINT_FILE, interval=60)
+    log.append({"found": ["a"]})
+    log.append({"found": ["b"]})
+    assert not (tmp_path / CHECKPOINT_FILE).exists()
+    log.flush()
+    with open(tmp_path / CHECKPOINT_FILE, "a", encoding="utf-8") as f:
+        f.write('{"found": ["c"')
+    assert list(CrawlCheckpoint.replay(tmp_path / CHECKPOINT_FILE)) == [{"found": ["a"]}, {"found": ["b"]}]
+
+
+def test_resume_restores_visited_pages_frontier_and_changes(tmp_path):
+    crawl = scraper(tmp_path)
+    crawl.process_page(f"{SITE}/", html("Home", "/hours", "/contact", "/events"))
+    crawl.queue.popleft()
+    crawl.process_page(f"{SITE}/hours", html("Hours", "/hours/summer"))
+    crawl.checkpoint.flush()
+
+    resumed = scraper(tmp_path, resume=True)
+    assert resumed.timestamp == crawl.timestamp
+    assert resumed.visited_urls == {f"{SITE}/", f"{SITE}/hours"}
+    assert list(resumed.queue) == [f"{SITE}/contact", f"{SITE}/events", f"{SITE}/hours/summer"]
+    assert [page["url"] for page in resumed.changes["added"]] == [f"{SITE}/", f"{SITE}/hours"]
+    assert resumed.pages == crawl.pages
+
+
+def test_finished_crawl_is_not_resumed(tmp_path):
+    crawl = scraper(tmp_path)
+    crawl.process_page(f"{SITE}/", html("Home"))
+    crawl.checkpoint.flush()
+    with open(crawl.output_dir / "changes.json", "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    assert scraper(tmp_path, resume=True).find_unfinished_crawl() is None
@@ -0,0 +1,78 @@
+# test_page_cleaner.py
+import json
+from page_cleaner import MinHasher, NearDuplicateIndex, clean_pages, clean_snapshot, split_segments
+
+FOOTER = "Main Library, 1970 Campus Drive, Evanston. Call 847-491-7658 for help."
+WORDS = "archives maps music theses journals films microfilm newspapers manuscripts posters".split()
+
+
+def page(url, content):
+    return {"url": url, "title": url.rsplit("/", 1)[-1], "content": content}
+
+
+def body(seed, length=60):
+    return " ".join(WORDS[(seed * 7 + i * i) % len(WORDS)] + str(i % 13) for i in range(length)) + "."
+
+
+def test_split_segments_on_sentence_ends():
+    assert split_segments("Open today.  Closed Sunday! Why? ") == ["Open today.", "Closed Sunday!", "Why?"]
+    assert split_segments(None) == []
+
+
+def test_minhash_similarity_tracks_jaccard():
+    hasher = MinHasher(num_perm=128)
+    text = body(1, 200)
+    assert (hasher.signature(text) == hasher.signature(text)).all()
+    near = (hasher.signature(text) == hasher.signature(text + " one extra sentence here.")).mean()
+    far = (hasher.signature(text) == hasher.signature(body(2, 200))).mean()
+    assert near > 0.9
+    assert far < 0.3
+
+
+def test_near_duplicate_index_finds_similar_pages_only():
+    hasher = MinHasher()
+    index = NearDuplicateIndex(hasher, bands=16, threshold=0.8)
+    text = body(1, 200)
+    index.add(hasher.signature(text))
+    position, similarity = index.find(hasher.signature(text + " one extra sentence here."))
+    assert position == 0 and similarity >= 0.8
+    assert index.find(hasher.signature(body(2, 200))) is None
+
+
+def test_boilerplate_is_kept_on_the_shallowest_page_only():
+    pages = [page(f"https://lib.example.edu/a/b/{i}", body(i) + " " + FOOTER) for i in range(5)]
+    pages.append(page("https://lib.example.edu/contact", "Ask us anything. " + FOOTER))
+    kept, report = clean_pages(pages, min_pages=5)
+
+    with_footer = [p["url"] for p in kept if "847-491-7658" in p["content"]]
+    assert with_footer == ["https://lib.example.edu/contact"]
+    assert report["kept"] == 6
+    assert report["boilerplate_sentences"] == 2
+
+
+def test_near_duplicates_and_empty_pages_are_dropped():
+    pages = [
+        page("https://lib.example.edu/hours", body(3, 200)),
+        page("https://lib.example.edu/visit/hours", body(3, 200)),
+        page("https://lib.example.edu/empty", ""),
+    ]
+    kept, report = clean_pages(pages)
+    assert [p["url"] for p in kept] == ["https://lib.example.edu/hours"]
+    assert report["duplicates"][0]["duplicate_of"] == "https://lib.example.edu/hours"
+    assert report["empty"] == ["https://lib.example.edu/empty"]
+
+
+def test_clean_snapshot_is_deterministic(tmp_path):
+    (tmp_path / "raw" / "general").mkdir(parents=True)
+    for i in range(6):
+        with open(tmp_path / "raw" / "general" / f"{i}.json", "w", encoding="utf-8") as f:
+            json.dump(page(f"https://lib.example.edu/p/{i}", body(i) + " " + FOOTER), f)
+
+    def cleaned():
+        clean_snapshot(tmp_path)
+        return {file.name: file.read_text(encoding="utf-8") for file in (tmp_path / "processed").glob("*/*.json")}
+
+    first = cleaned()
+    assert len(first) == 6
+    # Unchanged pages give the same cleaned text, so their chunks keep their embeddings
+    assert cleaned() == first